@@ -1,16 +1,7 @@
 """CompatibilityMixin for pydantic v1/1/v2."""
 
-try:
-    from importlib.metadata import PackageNotFoundError, version
-except ImportError:
-    from importlib_metadata import PackageNotFoundError, version  # type: ignore
-
-from typing import TYPE_CHECKING
-
-try:
-    __version__ = version("pydantic-compat")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "uninstalled"
+import threading
+from typing import TYPE_CHECKING, Any
 
 __author__ = "Talley Lambert"
 __email__ = "talley.lambert@gmail.com"
@@ -19,19 +10,40 @@ __all__ = [
     "BaseModel",
     "Field",
     "PydanticCompatMixin",
+    "TypeAdapter",
     "__version__",
+    "disable_profiling",
+    "disable_schema_cache",
+    "enable_profiling",
+    "enable_schema_cache",
+    "field_serializer",
     "field_validator",
+    "model_serializer",
     "model_validator",
+    "parallel_validate",
+    "profiling_report",
+    "reset_profiling",
     "root_validator",
+    "set_defer_build",
+    "set_json_backend",
     "validator",
 ]
 
-from ._shared import PYDANTIC2
+from ._profiling import (
+    disable_profiling,
+    enable_profiling,
+    profiling_report,
+    reset_profiling,
+)
+from ._shared import PYDANTIC2, set_defer_build, set_json_backend
 
 if TYPE_CHECKING:
     from pydantic import (
         Field,
+        TypeAdapter,
+        field_serializer,
         field_validator,
+        model_serializer,
         model_validator,
         root_validator,
         validator,
@@ -42,30 +54,108 @@ if TYPE_CHECKING:
     # AND proper signatures for both versions of pydantic without a ton of potentially
     # outdated signatures
     PydanticCompatMixin = type
+
+    import pydantic
+
+    class BaseModel(PydanticCompatMixin, pydantic.BaseModel):
+        """BaseModel with pydantic_compat mixins."""
+
+    from ._parallel import parallel_validate
+    from ._schema_cache import disable_schema_cache, enable_schema_cache
+
+    __version__: str
 else:
     from ._shared import Field
 
-    if PYDANTIC2:
-        from pydantic import field_validator, model_validator
+# the version-specific submodules import a good chunk of pydantic, so names are
+# resolved lazily (on first access) in __getattr__ below.
+# {name: (module, attribute)}
+_LAZY_NAMES = {
+    "disable_schema_cache": ("._schema_cache", "disable_schema_cache"),
+    "enable_schema_cache": ("._schema_cache", "enable_schema_cache"),
+    "parallel_validate": ("._parallel", "parallel_validate"),
+}
+if PYDANTIC2:
+    _LAZY_NAMES.update(
+        {
+            "PydanticCompatMixin": ("._v2", "PydanticCompatMixin"),
+            "TypeAdapter": ("._v2", "TypeAdapter"),
+            "field_serializer": ("pydantic", "field_serializer"),
+            "field_validator": ("pydantic", "field_validator"),
+            "model_serializer": ("pydantic", "model_serializer"),
+            "model_validator": ("pydantic", "model_validator"),
+            "root_validator": ("._v2", "root_validator"),
+            "validator": ("._v2", "validator"),
+        }
+    )
+else:
+    _LAZY_NAMES.update(
+        {
+            "PydanticCompatMixin": ("._v1", "PydanticCompatMixin"),
+            "TypeAdapter": ("._v1", "TypeAdapter"),
+            "field_serializer": ("._v1", "field_serializer"),
+            "field_validator": ("._v1", "field_validator"),
+            "model_serializer": ("._v1", "model_serializer"),
+            "model_validator": ("._v1", "model_validator"),
+            "root_validator": ("._v1", "root_validator"),
+            "validator": ("pydantic", "validator"),
+        }
+    )
 
-        from ._v2 import PydanticCompatMixin, root_validator, validator
 
-    else:
-        from pydantic import validator
+def _get_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        from importlib_metadata import PackageNotFoundError, version  # type: ignore
 
-        from ._v1 import (
-            PydanticCompatMixin,
-            field_validator,
-            model_validator,
-            root_validator,
-        )
+    try:
+        return version("pydantic-compat")
+    except PackageNotFoundError:  # pragma: no cover
+        return "uninstalled"
 
 
-import pydantic
+def _make_base_model() -> type:
+    import pydantic
 
+    mixin = __getattr__("PydanticCompatMixin")
 
-class BaseModel(PydanticCompatMixin, pydantic.BaseModel):
-    """BaseModel with pydantic_compat mixins."""
+    class BaseModel(mixin, pydantic.BaseModel):  # type: ignore
+        """BaseModel with pydantic_compat mixins."""
+
+        __qualname__ = "BaseModel"
+
+    return BaseModel
+
+
+# lazy attributes are created once, even by threads looking them up together
+# (re-entrant: BaseModel looks up PydanticCompatMixin)
+_lazy_lock = threading.RLock()
+
+
+def __getattr__(name: str) -> Any:
+    with _lazy_lock:
+        # set by another thread while this one waited?
+        if name in globals():
+            return globals()[name]
+        return _create_lazy(name)
+
+
+def _create_lazy(name: str) -> Any:
+    if name in _LAZY_NAMES:
+        from importlib import import_module
+
+        module, attr = _LAZY_NAMES[name]
+        value = getattr(import_module(module, __name__), attr)
+    elif name == "__version__":
+        value = _get_version()
+    elif name == "BaseModel":
+        value = _make_base_model()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
-del pydantic
+def __dir__() -> "list[str]":
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,113 @@
+"""Validation and dumping of many objects without blocking the event loop.
+
+Objects are processed in chunks, and the event loop runs the other tasks between
+chunks, so that they wait for about one chunk rather than for all the objects.
+Unless given, the size of the chunks is adjusted as they are processed, so that
+each takes about `CHUNK_SECONDS` (the cost of an object varies a lot between
+models and pydantic versions).  With an `executor` (e.g. a ThreadPoolExecutor),
+chunks are processed in it instead, while the event loop keeps running.  pydantic
+holds the GIL while validating, so this doesn't make validation faster.
+
+This module imports asyncio, so it is only imported when first used.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
+from operator import methodcaller
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from ._parallel import aggregate_errors
+
+CHUNK_SECONDS = 0.0005
+_FIRST_CHUNK = 16
+
+
+async def validate_many(
+    cls: Any,
+    objs: Iterable[Any],
+    chunk: Optional[int],
+    errors: str,
+    executor: Optional[Executor],
+) -> Any:
+    """Async `cls.model_validate_many(objs, errors=errors)`."""
+    if errors not in ("raise", "collect"):
+        raise ValueError(f"errors must be 'raise' or 'collect', not {errors!r}")
+    validate = partial(cls.model_validate_many, errors="collect")
+    results: List[Any] = []
+    failed: List[Tuple[int, Any]] = []
+    start = 0
+    parts = _chunks(validate, objs, chunk, executor)
+    async for part, (part_results, part_errors) in parts:
+        failed.extend((start + i, e) for i, e in part_errors)
+        results.extend(part_results)
+        start += len(part)
+    if errors == "collect":
+        return results, failed
+    if failed:
+        raise aggregate_errors(cls, failed)
+    return results
+
+
+async def dump_many(
+    objs: Iterable[Any],
+    chunk: Optional[int],
+    output: str,
+    executor: Optional[Executor],
+    kwargs: dict,
+) -> List[Any]:
+    """Async `[obj.model_dump(**kwargs) for obj in objs]` (or `model_dump_json`,
+    with `output="json"`)."""
+    if output not in ("python", "json"):
+        raise ValueError(f"output must be 'python' or 'json', not {output!r}")
+    method = "model_dump_json" if output == "json" else "model_dump"
+    dump = methodcaller(method, **kwargs)
+    results: List[Any] = []
+    async for _, part_results in _chunks(partial(_map, dump), objs, chunk, executor):
+        results.extend(part_results)
+    return results
+
+
+def _map(func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    return list(map(func, items))
+
+
+async def _chunks(
+    func: Callable[[List[Any]], Any],
+    objs: Iterable[Any],
+    chunk: Optional[int],
+    executor: Optional[Executor],
+) -> AsyncIterator[Tuple[List[Any], Any]]:
+    # yield (part, func(part)) for consecutive parts of `objs`
+    if chunk is not None and chunk < 1:
+        raise ValueError(f"chunk size must be at least 1, not {chunk}")
+    it = iter(objs)
+    size = chunk or _FIRST_CHUNK
+    loop = asyncio.get_running_loop()
+    while True:
+        part = list(islice(it, size))
+        if not part:
+            return
+        if executor is None:
+            result, seconds = _timed(func, part)
+            # let the other tasks run: timers that expired during the chunk are
+            # only processed in the first iteration of the event loop, and the
+            # tasks they wake up run in the second one
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        else:
+            call = partial(_timed, func, part)
+            result, seconds = await loop.run_in_executor(executor, call)
+        if chunk is None:
+            # grow at most twofold, in case the first objects were cheap ones
+            best = int(size * CHUNK_SECONDS / max(seconds, 1e-6))
+            size = max(1, min(2 * size, best))
+        yield part, result
+
+
+def _timed(func: Callable[[List[Any]], Any], part: List[Any]) -> Tuple[Any, float]:
+    started = perf_counter()
+    result = func(part)
+    return result, perf_counter() - started
@@ -0,0 +1,311 @@
+"""Recursive construction of models from trusted data, without validation.
+
+For each model class, a plan is compiled once: which fields may hold nested
+models given as dicts (directly, or in `Optional`s, lists, tuples and dicts), and
+how to create the instance.  Models without aliases, private attributes,
+post-init hooks or (v2) `extra='allow'` are created directly, the way
+`model_construct` does it; other models are created with `model_construct`.
+
+On both versions, extra values are only kept with `extra='allow'` (v1 `construct`
+keeps them all).
+"""
+
+import collections.abc
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pydantic
+
+from ._shared import PYDANTIC2
+
+Converter = Callable[[Any], Any]
+# build(values, fields_set) -> model instance
+Build = Callable[[Dict[str, Any], Any], Any]
+
+PLAN_ATTR = "__compat_construct_plan__"
+_SEQUENCES = (list, tuple, collections.abc.Sequence)
+_MAPPINGS = (dict, collections.abc.Mapping)
+# defaults of these types are used as they are, other defaults are copied
+_IMMUTABLE = (type(None), bool, int, float, str, bytes)
+_EMPTY = (list, dict, set)
+_REQUIRED = object()
+_object_setattr = object.__setattr__
+
+
+def construct_recursive(
+    cls: Any, values: Dict[str, Any], fields_set: Optional[set] = None
+) -> Any:
+    """Construct `cls` from trusted `values` without validation, also constructing
+    the nested models given as dicts.  `values` is not modified.
+    """
+    return _plan(cls)(values, fields_set)
+
+
+def clear_plan(cls: type) -> None:
+    """Forget the construction plan of `cls` (e.g. after a rebuild)."""
+    if PLAN_ATTR in cls.__dict__:
+        delattr(cls, PLAN_ATTR)
+
+
+def _plan(cls: Any) -> Build:
+    build = cls.__dict__.get(PLAN_ATTR)
+    if build is None:
+        build = _compile(cls)
+        setattr(cls, PLAN_ATTR, build)
+    return build  # type: ignore [no-any-return]
+
+
+def _compile(cls: Any) -> Build:
+    if PYDANTIC2:
+        fields = [
+            (k, f.alias, _converter(f.annotation)) for k, f in cls.model_fields.items()
+        ]
+        build = _v2_builder(cls, {k: c for k, _, c in fields})
+    else:
+        fields = [(k, f.alias, _field_converter(f)) for k, f in cls.__fields__.items()]
+        build = _v1_builder(cls, {k: c for k, _, c in fields})
+    if build is not None:
+        return build
+
+    converters: List[Tuple[str, Converter]] = []
+    for name, alias, convert in fields:
+        if convert is not None:
+            keys = dict.fromkeys((name, alias or name))
+            converters.extend((key, convert) for key in keys)
+    # v1: the keys of the fields, or None to keep every value
+    known = None if PYDANTIC2 or _allows_extra(cls) else _field_keys(fields)
+
+    def build_native(values: Dict[str, Any], fields_set: Any) -> Any:
+        if known is None:
+            values = dict(values)
+        else:
+            values = {k: v for k, v in values.items() if k in known}
+        for key, convert in converters:
+            if key in values:
+                values[key] = convert(values[key])
+        if PYDANTIC2:
+            return cls.model_construct(fields_set, **values)
+        return cls.construct(fields_set, **values)
+
+    return build_native
+
+
+def _fields_plan(
+    fields: List[Tuple[str, bool, Any, Optional[Callable[[], Any]]]],
+    converters: Dict[str, Optional[Converter]],
+) -> List[tuple]:
+    # [(name, default or _REQUIRED, function returning a new default or None,
+    #   converter or None)]
+    plan = []
+    for name, required, default, get_default in fields:
+        if required:
+            default, get_default = _REQUIRED, None
+        elif type(default) in _IMMUTABLE:
+            get_default = None
+        elif type(default) in _EMPTY and not default:
+            default, get_default = _REQUIRED, type(default)
+        else:
+            default = _REQUIRED
+        plan.append((name, default, get_default, converters[name]))
+    return plan
+
+
+def _v2_builder(
+    cls: Any, converters: Dict[str, Optional[Converter]]
+) -> Optional[Build]:
+    # None if `model_construct` does more than this (see the module docstring)
+    if (
+        cls.__pydantic_post_init__
+        or cls.__pydantic_root_model__
+        or cls.model_config.get("extra") == "allow"
+    ):
+        return None
+    fields = []
+    for name, field in cls.model_fields.items():
+        if field.alias not in (None, name) or field.validation_alias is not None:
+            return None
+        if getattr(field, "default_factory_takes_validated_data", False):
+            return None
+        get_default = field.default_factory or partial(
+            field.get_default, call_default_factory=True
+        )
+        fields.append((name, field.is_required(), field.default, get_default))
+    plan = _fields_plan(fields, converters)
+    names = frozenset(cls.model_fields)
+    new = cls.__new__
+
+    def build(values: Dict[str, Any], fields_set: Any) -> Any:
+        fields_values = {}
+        for name, default, get_default, convert in plan:
+            if name in values:
+                value = values[name]
+                fields_values[name] = value if convert is None else convert(value)
+            elif get_default is not None:
+                fields_values[name] = get_default()
+            elif default is not _REQUIRED:
+                fields_values[name] = default
+        m = new(cls)
+        _object_setattr(m, "__dict__", fields_values)
+        if fields_set is None:
+            fields_set = values.keys() & names
+        _object_setattr(m, "__pydantic_fields_set__", fields_set)
+        _object_setattr(m, "__pydantic_extra__", None)
+        _object_setattr(m, "__pydantic_private__", None)
+        return m
+
+    return build
+
+
+def _v1_builder(
+    cls: Any, converters: Dict[str, Optional[Converter]]
+) -> Optional[Build]:
+    # None if `construct` does more than this (see the module docstring)
+    if cls.__private_attributes__:
+        return None
+    fields = []
+    for name, field in cls.__fields__.items():
+        if field.alias != name:
+            return None
+        get_default = field.default_factory or field.get_default
+        fields.append((name, field.required, field.default, get_default))
+    plan = _fields_plan(fields, converters)
+    names = frozenset(cls.__fields__)
+    allow_extra = _allows_extra(cls)
+    new = cls.__new__
+
+    def build(values: Dict[str, Any], fields_set: Any) -> Any:
+        fields_values = {}
+        for name, default, get_default, convert in plan:
+            if name in values:
+                value = values[name]
+                fields_values[name] = value if convert is None else convert(value)
+            elif get_default is not None:
+                fields_values[name] = get_default()
+            elif default is not _REQUIRED:
+                fields_values[name] = default
+        given = values.keys() & names
+        if allow_extra:
+            extra = values.keys() - names
+            for key in extra:
+                fields_values[key] = values[key]
+            given |= extra
+        m = new(cls)
+        _object_setattr(m, "__dict__", fields_values)
+        _object_setattr(
+            m, "__fields_set__", given if fields_set is None else fields_set
+        )
+        return m
+
+    return build
+
+
+def _allows_extra(cls: Any) -> bool:
+    # pydantic v1
+    return cls.__config__.extra == pydantic.Extra.allow  # type: ignore
+
+
+def _field_keys(fields: List[Tuple[str, Optional[str], Any]]) -> frozenset:
+    # the names and aliases of `fields`
+    return frozenset(key for name, alias, _ in fields for key in (name, alias or name))
+
+
+def _converter(tp: Any) -> Optional[Converter]:
+    # None if there is no model in `tp`.  Converters leave unexpected values as
+    # they are: they are trusted, so e.g. a model instance is kept
+    if isinstance(tp, type) and issubclass(tp, pydantic.BaseModel):
+        return partial(_construct_model, tp)
+    origin = getattr(tp, "__origin__", None)
+    args: Tuple[Any, ...] = getattr(tp, "__args__", None) or ()
+    if origin is Union:
+        # only unions with one model type (e.g. Optional[Model]) are unambiguous
+        return _single([_converter(a) for a in args])
+    if origin is tuple and args and args[-1] is not Ellipsis:
+        return _fixed_tuple([_converter(a) for a in args])
+    if origin in _MAPPINGS and len(args) == 2:
+        convert = _converter(args[1])
+        return None if convert is None else partial(_construct_dict, convert)
+    if origin in _SEQUENCES and args:
+        return _sequence(args[0], _converter(args[0]), origin is tuple)
+    return None
+
+
+def _field_converter(field: Any) -> Optional[Converter]:
+    # pydantic v1: from the ModelField, since forward references are resolved in
+    # its sub-fields but not in its `outer_type_`
+    if TYPE_CHECKING:  # the v2 stubs have no shapes
+        from pydantic.v1 import fields
+    else:
+        from pydantic import fields
+
+    shape = field.shape
+    sub_fields: List[Any] = field.sub_fields or []
+    if shape == fields.SHAPE_SINGLETON:
+        if not sub_fields:
+            return _converter(field.type_)
+        return _single([_field_converter(f) for f in sub_fields])  # a Union
+    if shape == fields.SHAPE_TUPLE:
+        return _fixed_tuple([_field_converter(f) for f in sub_fields])
+    convert = _field_converter(sub_fields[0]) if sub_fields else None
+    if convert is None:
+        return None
+    if shape in (fields.SHAPE_MAPPING, fields.SHAPE_DICT):
+        return partial(_construct_dict, convert)
+    if shape in (fields.SHAPE_LIST, fields.SHAPE_SEQUENCE, fields.SHAPE_TUPLE_ELLIPSIS):
+        item_type = (
+            None if sub_fields[0].shape != fields.SHAPE_SINGLETON else field.type_
+        )
+        return _sequence(item_type, convert, shape == fields.SHAPE_TUPLE_ELLIPSIS)
+    return None
+
+
+def _single(converters: List[Optional[Converter]]) -> Optional[Converter]:
+    found = [c for c in converters if c is not None]
+    return found[0] if len(found) == 1 else None
+
+
+def _sequence(
+    item_type: Any, convert: Optional[Converter], to_tuple: bool
+) -> Optional[Converter]:
+    if isinstance(item_type, type) and issubclass(item_type, pydantic.BaseModel):
+        # the most common case, without a call per item
+        return partial(_construct_model_sequence, item_type, to_tuple)
+    return None if convert is None else partial(_construct_sequence, convert, to_tuple)
+
+
+def _fixed_tuple(converters: List[Optional[Converter]]) -> Optional[Converter]:
+    return partial(_construct_fixed_tuple, converters) if any(converters) else None
+
+
+def _construct_model(cls: type, value: Any) -> Any:
+    return _plan(cls)(value, None) if isinstance(value, dict) else value
+
+
+def _construct_sequence(convert: Converter, to_tuple: bool, value: Any) -> Any:
+    if not isinstance(value, (list, tuple)):
+        return value
+    if not value:
+        return () if to_tuple else value
+    items = [convert(v) for v in value]
+    return tuple(items) if to_tuple else items
+
+
+def _construct_model_sequence(cls: type, to_tuple: bool, value: Any) -> Any:
+    if not isinstance(value, (list, tuple)):
+        return value
+    if not value:
+        return () if to_tuple else value
+    build = _plan(cls)
+    items = [build(v, None) if isinstance(v, dict) else v for v in value]
+    return tuple(items) if to_tuple else items
+
+
+def _construct_fixed_tuple(converters: List[Optional[Converter]], value: Any) -> Any:
+    if not isinstance(value, (list, tuple)):
+        return value
+    return tuple(c(v) if c else v for c, v in zip(converters, value))
+
+
+def _construct_dict(convert: Converter, value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: convert(v) for k, v in value.items()}
+    return value
@@ -0,0 +1,177 @@
+"""Validation of many objects in worker processes.
+
+Items are sent to the workers in chunks (lists of raw inputs, e.g. dicts or JSON
+strings), each chunk is validated with `model_validate_many`, and the results are
+sent back as model instances (pickled compactly, see the mixins' `__reduce_ex__`)
+or already serialized.  At most two chunks per worker are in flight, so `items`
+may be a large iterator.  The model class is pickled by reference: it must be
+importable by the workers (e.g. defined at the top level of a module).
+
+Unpickling the results, in this process, is the part that isn't parallel:
+serialized results (`output="python"` or `"json"`) are the cheapest to receive.
+Most of that time is spent in garbage collections, triggered by the many new
+containers; callers may pause the garbage collector meanwhile (`gc.disable()`).
+"""
+
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ._shared import PYDANTIC2, chunked
+
+_OUTPUTS = ("models", "python", "json")
+# (results, [(index in the chunk, error)]), where errors are ValidationErrors on
+# v1 and lists of error dicts on v2 (see _error)
+Chunk = Tuple[List[Any], List[Tuple[int, Any]]]
+
+
+def parallel_validate(
+    model: Any,
+    items: Iterable[Any],
+    *,
+    workers: int = 1,
+    chunksize: int = 1000,
+    errors: str = "raise",
+    output: str = "models",
+    executor: Optional[Executor] = None,
+) -> Any:
+    """Validate `items` into instances of `model` in `workers` processes.
+
+    Results are in the order of `items`.  With `output="python"` or `"json"`,
+    they are the `model_dump()` dicts or `model_dump_json()` strings of the
+    instances, which are cheaper to send back than the instances.
+
+    As in `model_validate_many`: with `errors="raise"`, a single ValidationError
+    is raised for the invalid items (error locations start with the item index),
+    and with `errors="collect"`, a `(results, errors)` tuple is returned instead,
+    where `errors` is a list of `(index, ValidationError)` for the invalid items.
+
+    With `workers=1` (the default), items are validated in this process: worker
+    processes only pay off when validating an item costs more than sending it
+    and its result between processes (e.g. with expensive validators, or with
+    `output="json"`).  An existing `executor` (e.g. a ProcessPoolExecutor reused
+    across calls, to avoid starting processes each time) may be given instead,
+    with `workers` its number of workers.
+    """
+    if errors not in ("raise", "collect"):
+        raise ValueError(f"errors must be 'raise' or 'collect', not {errors!r}")
+    if output not in _OUTPUTS:
+        raise ValueError(f"output must be one of {_OUTPUTS}, not {output!r}")
+
+    chunks = chunked(items, chunksize)
+    if executor is not None:
+        done = _map(executor, model, chunks, output, 2 * workers)
+        return _collect(model, done, errors)
+    if workers <= 1:
+        done = (_validate_chunk(model, chunk, output) for chunk in chunks)
+        return _collect(model, done, errors)
+    with ProcessPoolExecutor(workers) as pool:
+        done = _map(pool, model, chunks, output, 2 * workers)
+        return _collect(model, done, errors)
+
+
+def _map(
+    executor: Executor,
+    model: Any,
+    chunks: Iterator[List[Any]],
+    output: str,
+    window: int,
+) -> Iterator[Chunk]:
+    # like executor.map, but without submitting all the chunks upfront
+    pending: Deque[Any] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(_validate_chunk, model, chunk, output))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _validate_chunk(model: Any, chunk: List[Any], output: str) -> Chunk:
+    # in the workers
+    results, errors = model.model_validate_many(chunk, errors="collect")
+    if output == "python":
+        results = [m.model_dump() for m in results]
+    elif output == "json":
+        results = [m.model_dump_json() for m in results]
+    return results, [(i, _error(e)) for i, e in errors]
+
+
+def _collect(model: Any, chunks: Iterable[Chunk], errors: str) -> Any:
+    results: List[Any] = []
+    failed: List[Tuple[int, Any]] = []
+    start = 0
+    for chunk_results, chunk_errors in chunks:
+        failed.extend((start + i, e) for i, e in chunk_errors)
+        results.extend(chunk_results)
+        start += len(chunk_results) + len(chunk_errors)
+    failed = [(i, _rebuild_error(model, e)) for i, e in failed]
+    if errors == "collect":
+        return results, failed
+    if failed:
+        raise aggregate_errors(model, failed)
+    return results
+
+
+if PYDANTIC2:
+    from pydantic import ValidationError
+    from pydantic_core import PydanticCustomError
+
+    # pydantic-core can't unpickle ValidationErrors with custom error types, so
+    # errors are sent as dicts and rebuilt
+    def _error(e: Any) -> Any:
+        return e.errors(include_url=False)
+
+    def _rebuild_error(model: Any, error: Any) -> Any:
+        # `error` is the list of dicts of `_error`
+        return _from_errors(model.__name__, [(e, ()) for e in error])
+
+    def aggregate_errors(model: Any, failed: List[Tuple[int, Any]]) -> Any:
+        """The ValidationError of `model_validate_many` for `failed`, a list of
+        `(index, ValidationError)`: for all the invalid items."""
+        errors = [
+            (e, (i,)) for i, error in failed for e in error.errors(include_url=False)
+        ]
+        return _from_errors(f"List[{model.__name__}]", errors)
+
+    def _from_errors(title: str, errors: List[Tuple[Dict[str, Any], tuple]]) -> Any:
+        line_errors = []
+        for error, prefix in errors:
+            line = {"type": error["type"], "loc": prefix + error["loc"]}
+            line["input"] = error["input"]
+            if "ctx" in error:
+                line["ctx"] = error["ctx"]
+            if not _is_known_type(line):
+                # e.g. a PydanticCustomError raised by a validator: keep its message
+                message = error["msg"].replace("{", "{{").replace("}", "}}")
+                line["type"] = PydanticCustomError(error["type"], message)
+                line.pop("ctx", None)
+            line_errors.append(line)
+        return ValidationError.from_exception_data(title, line_errors)  # type: ignore
+
+    def _is_known_type(line: Dict[str, Any]) -> bool:
+        try:
+            ValidationError.from_exception_data("", [line])  # type: ignore [list-item]
+        except (KeyError, TypeError, ValueError):  # e.g. "Invalid error type"
+            return False
+        return True
+
+else:
+    from pydantic import ValidationError
+    from pydantic.error_wrappers import ErrorWrapper
+
+    def _error(e: Any) -> Any:
+        return e
+
+    def _rebuild_error(model: Any, error: Any) -> Any:
+        return error
+
+    def aggregate_errors(model: Any, failed: List[Tuple[int, Any]]) -> Any:
+        """The ValidationError of `model_validate_many` for `failed`, a list of
+        `(index, ValidationError)`: for the first invalid item."""
+        index, error = failed[0]
+        return ValidationError([ErrorWrapper(error, loc=index)], model)
@@ -0,0 +1,122 @@
+"""Opt-in profiling of the work pydantic_compat does while building models.
+
+Enabled by setting the `PYDANTIC_COMPAT_PROFILE` environment variable (to
+anything but "" or "0") or by calling `enable_profiling()`.  Call sites check
+`ENABLED` before doing anything, so when disabled nothing is measured.
+
+For each class (or module, for fields defined outside a class) and phase, the
+number of calls, the wall time and the net number of memory blocks allocated
+(`sys.getallocatedblocks`) are recorded.  Phases are:
+
+- "class": the compat metaclass `__new__` (includes "config", and pydantic's own
+  model construction)
+- "config": conversion of `Config` / `model_config` to the other version
+- "Field": `pydantic_compat.Field()` calls, including pydantic's `Field`
+- "validator": adaptation of validators to the other version
+"""
+
+import os
+import sys
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+ENABLED = os.environ.get("PYDANTIC_COMPAT_PROFILE", "") not in ("", "0")
+
+# {(owner, phase): [calls, seconds, blocks]}
+_records: Dict[Tuple[str, str], List[Any]] = {}
+# models may be created in several threads at once
+_lock = threading.Lock()
+
+Start = Tuple[float, int]
+
+
+def enable_profiling() -> None:
+    """Start recording the cost of building compat models (see `profiling_report`)."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable_profiling() -> None:
+    """Stop recording.  Data recorded so far is kept until `reset_profiling()`."""
+    global ENABLED
+    ENABLED = False
+
+
+def reset_profiling() -> None:
+    """Discard all recorded data."""
+    _records.clear()
+
+
+def start() -> Start:
+    return perf_counter(), sys.getallocatedblocks()
+
+
+def stop(started: Start, owner: str, phase: str) -> None:
+    seconds = perf_counter() - started[0]
+    blocks = sys.getallocatedblocks() - started[1]
+    with _lock:
+        record = _records.get((owner, phase))
+        if record is None:
+            _records[(owner, phase)] = [1, seconds, blocks]
+        else:
+            record[0] += 1
+            record[1] += seconds
+            record[2] += blocks
+
+
+def class_owner(namespace: Dict[str, Any]) -> str:
+    """Name of the class being built from `namespace`."""
+    return f"{namespace.get('__module__')}.{namespace.get('__qualname__')}"
+
+
+def caller_owner(depth: int = 1) -> str:
+    """Name of the class body (or module) calling the caller of this function."""
+    frame = sys._getframe(depth + 1)
+    f_locals = frame.f_locals
+    if "__qualname__" in f_locals and "__module__" in f_locals:
+        return f"{f_locals['__module__']}.{f_locals['__qualname__']}"
+    return str(frame.f_globals.get("__name__"))
+
+
+def function_owner(func: Callable) -> str:
+    """Name of the class in which `func` is defined (or its module)."""
+    func = getattr(func, "__func__", func)
+    qualname = getattr(func, "__qualname__", "")
+    owner = qualname.rpartition(".")[0]
+    module = getattr(func, "__module__", None)
+    return f"{module}.{owner}" if owner else str(module)
+
+
+def profiling_data() -> List[Dict[str, Any]]:
+    """Return the recorded data, most expensive first."""
+    with _lock:
+        data = [
+            {"owner": owner, "phase": phase, "calls": c, "seconds": s, "blocks": b}
+            for (owner, phase), (c, s, b) in _records.items()
+        ]
+    data.sort(key=lambda d: d["seconds"], reverse=True)
+    return data
+
+
+def profiling_report(fmt: str = "text") -> str:
+    """Return the recorded data as a table (`fmt="text"`) or as JSON (`"json"`).
+
+    Rows are sorted by total time, most expensive first.
+    """
+    data = profiling_data()
+    if fmt == "json":
+        import json
+
+        return json.dumps(data, indent=2)
+    if fmt != "text":
+        raise ValueError(f"fmt must be 'text' or 'json', not {fmt!r}")
+
+    width = max([len(d["owner"]) for d in data] + [5])
+    lines = [f"{'owner':<{width}}  {'phase':<9} {'calls':>7} {'ms':>10} {'blocks':>9}"]
+    lines.extend(
+        f"{d['owner']:<{width}}  {d['phase']:<9} {d['calls']:>7} "
+        f"{d['seconds'] * 1000:>10.3f} {d['blocks']:>9}"
+        for d in data
+    )
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""Opt-in cache of generated JSON schemas, in memory and on disk.
+
+Enabled with `enable_schema_cache(path)` or the `PYDANTIC_COMPAT_SCHEMA_CACHE`
+environment variable (the cache directory).  Schemas are stored as
+`<fingerprint>.json`, where the fingerprint is a hash of everything the schema is
+derived from: the pydantic and pydantic-compat versions, the arguments of the
+schema call, and for the model and every model or enum it refers to: its name,
+docstring, config, fields (annotations, defaults, constraints...), and the size
+and modification time of the file it is defined in.  Files are written
+atomically, so the directory can be shared by concurrent processes.
+"""
+
+import enum
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+import pydantic
+
+from ._shared import PYDANTIC2
+
+SCHEMA_CACHE_ATTR = "__compat_schema_cache__"
+_cache_dir: Optional[str] = os.environ.get("PYDANTIC_COMPAT_SCHEMA_CACHE") or None
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def enable_schema_cache(path: Union[str, "os.PathLike[str]", None] = None) -> None:
+    """Cache the output of `model_json_schema` (v1 `schema`) in directory `path`.
+
+    By default, `pydantic-compat/schemas` in the user cache directory
+    ($XDG_CACHE_HOME, or ~/.cache).
+    """
+    global _cache_dir
+    if path is None:
+        root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        path = os.path.join(root, "pydantic-compat", "schemas")
+    _cache_dir = os.fspath(path)
+
+
+def disable_schema_cache() -> None:
+    """Stop caching schemas (files already written are left in place)."""
+    global _cache_dir
+    _cache_dir = None
+
+
+def clear_memory_cache(cls: type) -> None:
+    """Forget the schemas of `cls` kept in memory (e.g. after a rebuild)."""
+    if SCHEMA_CACHE_ATTR in cls.__dict__:
+        delattr(cls, SCHEMA_CACHE_ATTR)
+
+
+def cached_schema(
+    cls: type, generate: Callable[[], Dict[str, Any]], kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Return the schema of `cls` for `kwargs`, calling `generate` on cache misses.
+
+    A new dict is returned on each call, so callers may modify it.
+    """
+    if _cache_dir is None:
+        return generate()
+    memory = cls.__dict__.get(SCHEMA_CACHE_ATTR)
+    if memory is None:
+        memory = {}
+        setattr(cls, SCHEMA_CACHE_ATTR, memory)
+    key = _stable_repr(sorted(kwargs.items()))
+    text = memory.get(key)
+    if text is not None:
+        return json.loads(text)  # type: ignore [no-any-return]
+
+    path = os.path.join(_cache_dir, f"{fingerprint(cls, key)}.json")
+    schema: Dict[str, Any]
+    text = _read(path)
+    if text is not None:
+        try:
+            schema = json.loads(text)
+        except ValueError:  # corrupt: regenerate it
+            text = None
+    if text is None:
+        schema = generate()
+        try:
+            text = json.dumps(schema)
+        except (TypeError, ValueError):
+            return schema
+        stored = json.loads(text)
+        if stored != schema:  # e.g. tuples: not stored faithfully
+            return schema
+        _write(path, text)
+        schema = stored
+    memory[key] = text
+    return schema
+
+
+def fingerprint(cls: type, key: str = "") -> str:
+    """Return a hash of the definition of `cls` (and the models it refers to)."""
+    from pydantic_compat import __version__
+
+    parts = [pydantic.VERSION, __version__, key]
+    _describe_model(cls, parts, set())
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _describe_model(cls: type, parts: List[str], seen: Set[type]) -> None:
+    seen.add(cls)
+    parts.append(f"{cls.__module__}.{cls.__qualname__}")
+    parts.append(cls.__doc__ or "")
+    parts.append(_source_stat(cls))
+    config = getattr(cls, "model_config", None)
+    if config is None:  # a v1 model without the mixin
+        config = {
+            k: v
+            for k, v in vars(cls.__config__).items()  # type: ignore [attr-defined]
+            if not k.startswith("_")
+        }
+    parts.append(_stable_repr(sorted(dict(config).items())))
+    if PYDANTIC2:
+        fields = [
+            (k, v, v.annotation)
+            for k, v in cls.model_fields.items()  # type: ignore [attr-defined]
+        ]
+    else:
+        fields = [
+            (k, (v, v.field_info), v.outer_type_)
+            for k, v in cls.__fields__.items()  # type: ignore [attr-defined]
+        ]
+    for name, info, annotation in fields:
+        parts.append(f"{name}: {_stable_repr(info)}")
+        _describe_types(annotation, parts, seen)
+
+
+def _describe_types(tp: Any, parts: List[str], seen: Set[type]) -> None:
+    if isinstance(tp, type) and tp not in seen:
+        if issubclass(tp, pydantic.BaseModel):
+            _describe_model(tp, parts, seen)
+        elif issubclass(tp, enum.Enum):
+            seen.add(tp)
+            members = [(m.name, m.value) for m in tp]
+            parts.append(f"{tp.__module__}.{tp.__qualname__}: {members!r}")
+    for arg in getattr(tp, "__args__", None) or ():
+        _describe_types(arg, parts, seen)
+
+
+def _source_stat(cls: type) -> str:
+    module = sys.modules.get(cls.__module__)
+    try:
+        stat = os.stat(module.__file__)  # type: ignore [union-attr, arg-type]
+    except (AttributeError, TypeError, OSError):
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _stable_repr(obj: Any) -> str:
+    # memory addresses (e.g. of functions in reprs) change between processes
+    return _ADDRESS.sub("", repr(obj))
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, ValueError):  # missing, unreadable, or not utf-8
+        return None
+
+
+def _write(path: str, text: str) -> None:
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # readers see either no file or a complete one
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
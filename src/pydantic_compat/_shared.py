@@ -1,17 +1,30 @@
-import contextlib
+import functools
+import io
+import types
 import warnings
-from inspect import signature
-from typing import Any
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-import pydantic
 import pydantic.version
 
+from . import _profiling
+
 PYDANTIC2 = pydantic.version.VERSION.startswith("2")
-FIELD_KWARGS = {
-    p.name
-    for p in signature(pydantic.Field).parameters.values()
-    if p.kind != p.VAR_KEYWORD
-}
 
 V2_REMOVED_CONFIG_KEYS = {
     "allow_mutation",
@@ -53,33 +66,324 @@ for k, v in V1_FIELDS_TO_V2_FIELDS.items():
     V2_FIELDS_TO_V1_FIELDS[v] = k
 
 FIELD_NAME_MAP = V1_FIELDS_TO_V2_FIELDS if PYDANTIC2 else V2_FIELDS_TO_V1_FIELDS
+# (old name, new name, negate) for each entry of FIELD_NAME_MAP
+FIELD_RENAMES = tuple(
+    (old, new.lstrip("-"), new.startswith("-")) for old, new in FIELD_NAME_MAP.items()
+)
+JSONL_WRITE_SIZE = 1 << 16
+# max number of types whose TypeAdapter is kept around (see TypeAdapter)
+TYPE_ADAPTER_CACHE_SIZE = 512
+JSON_BACKENDS = ("json", "orjson", "msgspec", "auto")
+_json_backend = "json"
+_defer_build = False
+
+
+class TypeKey:
+    """Cache key for type `type`.
+
+    Typing forms can compare equal and still validate differently: members of
+    `Union[int, str]` and `Union[str, int]` are tried in order, and
+    `Literal[1] == Literal[True]`.  The key keeps the order of arguments, and the
+    type of those that aren't types.
+    """
+
+    __slots__ = ("_key", "type")
+
+    def __init__(self, type_: Any) -> None:
+        self.type = type_
+        self._key = _type_key(type_)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TypeKey) and self._key == other._key
+
+
+def _type_key(type_: Any) -> Hashable:
+    # type(): on python 3.9 and 3.10, `list[int]` passes for a class
+    if issubclass(type(type_), type):
+        return cast(type, type_)
+    args = getattr(type_, "__args__", None)
+    if not isinstance(args, tuple):
+        return (type(type_), type_)
+    metadata = getattr(type_, "__metadata__", ())  # Annotated
+    return (
+        type(type_),
+        getattr(type_, "__origin__", None),
+        tuple(map(_type_key, args)),
+        tuple(map(_type_key, metadata)),
+    )
+
+
+def set_json_backend(name: str) -> None:
+    """Set the JSON library used by default on pydantic v1.
+
+    One of "json" (the standard library, default), "orjson", "msgspec", or "auto"
+    (the fastest one installed).  It can also be set per model, with the
+    `json_backend` config key.  On pydantic v2 this has no effect: pydantic-core
+    already does its own JSON parsing and serialization.
+    """
+    global _json_backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"json backend must be one of {JSON_BACKENDS}, not {name!r}")
+    _json_backend = name
+
+
+def get_json_backend() -> str:
+    """Return the name of the default JSON backend (see `set_json_backend`)."""
+    return _json_backend
+
+
+def set_defer_build(enabled: bool = True) -> None:
+    """Defer building models until they are first used.
+
+    Applies to compat models defined afterwards that don't set the `defer_build`
+    config key themselves.  On pydantic v2 this is the native `defer_build`; on
+    v1, fields and validators are only prepared on first instantiation,
+    validation, or access to `model_fields` (or any other model attribute).
+    """
+    global _defer_build
+    _defer_build = bool(enabled)
+
+
+def defers_build(namespace: Dict[str, Any]) -> bool:
+    """Whether `set_defer_build` applies to the class created from `namespace`.
+
+    It doesn't to the classes of this package: `PydanticCompatMixin` and
+    `BaseModel` are created on first use, maybe while it is enabled, and their
+    config is inherited by all models.
+    """
+    module = namespace.get("__module__") or ""
+    return _defer_build and module.partition(".")[0] != __package__
+
+
+def check_mixin_order(
+    bases: Tuple[type, ...], mixin_class: type, base_model: type
+) -> None:
+    """Warn if mixin_class appears after base_model in `bases`.
+
+    Meant to be called from the metaclass, with the bases of the new class.
+    """
+    seen_base_model = False
+    for base in bases:
+        if base is base_model:
+            seen_base_model = True
+        elif base is mixin_class:
+            if seen_base_model:
+                warnings.warn(
+                    f"{mixin_class.__name__} should appear before pydantic.BaseModel",
+                    stacklevel=3,
+                )
+            return
+
+
+def _warn_unless_deprecation(
+    message: Any, category: Any = None, stacklevel: int = 1, source: Any = None
+) -> None:
+    if category is None:
+        category = type(message) if isinstance(message, Warning) else UserWarning
+    if not issubclass(category, DeprecationWarning):
+        warnings.warn(message, category, stacklevel=stacklevel + 1, source=source)
+
+
+# stands in for the `warnings` module in the globals of `without_deprecations`
+_warnings_module = types.ModuleType("warnings")
+_warnings_module.__dict__.update(vars(warnings))
+_warnings_module.warn = _warn_unless_deprecation  # type: ignore [attr-defined]
+
+
+def without_deprecations(func: Callable) -> Callable:
+    """Return a copy of function `func` that doesn't emit DeprecationWarnings.
+
+    Unlike calling `func` in `warnings.catch_warnings()`, this doesn't change the
+    global warning filters, so it is thread-safe.  Works with functions calling
+    `warn()` or `warnings.warn()` of their module, and unwraps the deprecation
+    wrapper of `typing_extensions.deprecated`.
+    """
+    if hasattr(func, "__deprecated__") and hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+    func_globals = dict(func.__globals__)
+    if func_globals.get("warn") is warnings.warn:
+        func_globals["warn"] = _warn_unless_deprecation
+    if func_globals.get("warnings") is warnings:
+        func_globals["warnings"] = _warnings_module
+    copy = types.FunctionType(
+        func.__code__,
+        func_globals,
+        func.__name__,
+        func.__defaults__,
+        func.__closure__,
+    )
+    copy.__kwdefaults__ = func.__kwdefaults__
+    functools.update_wrapper(copy, func)
+    if func_globals.get(func.__name__) is func:  # recursive calls
+        func_globals[func.__name__] = copy
+    return copy
 
 
-def check_mixin_order(cls: type, mixin_class: type, base_model: type) -> None:
-    """Warn if mixin_class appears after base_model in cls.__bases__."""
-    bases = cls.__bases__
-    with contextlib.suppress(ValueError):
-        mixin_index = bases.index(mixin_class)
-        base_model_index = bases.index(base_model)
-        if mixin_index > base_model_index:
-            warnings.warn(
-                f"{mixin_class.__name__} should appear before pydantic.BaseModel",
-                stacklevel=3,
-            )
+def bind_aliases(cls: type, namespace: dict, aliases: Dict[str, str]) -> None:
+    """Point the `aliases` of `cls` to the methods they stand for, as resolved on
+    `cls`.
+
+    The mixins bind each alias (e.g. `dict`) to the native method (`model_dump`)
+    itself, rather than to a wrapper calling it; so when a model or one of its
+    bases (even one after the mixin in the MRO) overrides the native method, the
+    alias has to be rebound to keep calling the override.
+    """
+    mro_dicts = [vars(base) for base in cls.__mro__]
+    for alias, name in aliases.items():
+        if alias in namespace:
+            continue  # defined by the model itself
+        # the attributes themselves (e.g. classmethod objects), not bound methods
+        bound = next((d[alias] for d in mro_dicts if alias in d), None)
+        targets = [d[name] for d in mro_dicts if name in d]
+        # unless a base overrides the alias itself
+        if targets and bound is not targets[0] and any(t is bound for t in targets):
+            setattr(cls, alias, targets[0])
+
+
+def _split_paths(update: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split `{"a": 1, "b.c": 2}` into `({"a": 1}, {"b": {"c": 2}})`."""
+    direct: Dict[str, Any] = {}
+    nested: Dict[str, Dict[str, Any]] = {}
+    for key, value in update.items():
+        head, _, rest = key.partition(".")
+        if rest:
+            nested.setdefault(head, {})[rest] = value
+        else:
+            direct[key] = value
+    conflicts = direct.keys() & nested.keys()
+    if conflicts:
+        raise ValueError(f"Cannot update both {min(conflicts)!r} and a path below it")
+    return direct, nested
+
+
+def copy_on_write(
+    obj: Any, update: Dict[str, Any], copy_model: Callable[[Any, dict], Any]
+) -> Any:
+    """Copy model `obj`, sharing everything but what `update` changes.
+
+    Keys of `update` are field names, or dotted paths into nested models, lists,
+    tuples and dicts (e.g. `"a.items.0.name"`).  Only the models and containers
+    along those paths are copied, with `copy_model(model, update)` for models (a
+    shallow copy with updated fields).  Everything else is shared with `obj`.
+    """
+    return _copy_path(obj, update, copy_model, "")
+
+
+def _copy_path(
+    value: Any, update: Dict[str, Any], copy_model: Callable, path: str
+) -> Any:
+    is_model = isinstance(value, pydantic.BaseModel)
+    if not is_model and not isinstance(value, (list, tuple, dict)):
+        raise TypeError(f"Cannot update {path!r}: not a model, list, tuple or dict")
+    direct, nested = _split_paths(update)
+    if is_model:
+        for key, sub_update in nested.items():
+            sub_path = f"{path}.{key}" if path else key
+            sub_value = getattr(value, key)
+            direct[key] = _copy_path(sub_value, sub_update, copy_model, sub_path)
+        return copy_model(value, direct)
+
+    items: Any = dict(value) if isinstance(value, dict) else list(value)
+    for key, item in direct.items():
+        items[key if isinstance(value, dict) else int(key)] = item
+    for key, sub_update in nested.items():
+        index = key if isinstance(value, dict) else int(key)
+        items[index] = _copy_path(items[index], sub_update, copy_model, f"{path}.{key}")
+    return tuple(items) if isinstance(value, tuple) else items
+
+
+def validate_each(
+    validate: Callable[[Any], Any], objs: Iterable[Any], error_type: Type[Exception]
+) -> Tuple[List[Any], List[Tuple[int, Any]]]:
+    """Validate `objs` one by one, collecting `(index, error)` for the failures."""
+    results: List[Any] = []
+    errors: List[Tuple[int, Any]] = []
+    append = results.append
+    for i, obj in enumerate(objs):
+        try:
+            append(validate(obj))
+        except error_type as e:
+            errors.append((i, e))
+    return results, errors
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Iterate over lists of (at most) `size` consecutive items."""
+    if size < 1:
+        raise ValueError(f"chunk size must be at least 1, not {size}")
+    return _chunked(iter(items), size)
+
+
+def _chunked(it: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    chunk = list(islice(it, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, size))
+
+
+def iter_jsonl(source: Iterable[Union[bytes, str]]) -> Iterator[Union[bytes, str]]:
+    """Yield the non-blank lines of JSON Lines data.
+
+    `source` may be a file (binary or text) or any iterable of chunks, which need
+    not be split on line boundaries.  Only one partial line is held in memory.
+    """
+    pending: list = []
+    for chunk in source:
+        newline = b"\n" if isinstance(chunk, (bytes, bytearray)) else "\n"
+        end = chunk.find(newline)  # type: ignore [arg-type]
+        if end == -1:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(chunk)
+            chunk = chunk[:0].join(pending)
+            end = chunk.find(newline)  # type: ignore [arg-type]
+            pending = []
+        if end == len(chunk) - 1:
+            # the common case when iterating a file: exactly one line, no copy
+            if not chunk.isspace():
+                yield chunk
+            continue
+        start = 0
+        while end != -1:
+            line = chunk[start:end]
+            if line and not line.isspace():
+                yield line
+            start = end + 1
+            end = chunk.find(newline, start)  # type: ignore [arg-type]
+        if start < len(chunk):
+            pending.append(chunk[start:])
+    if pending:
+        line = pending[0][:0].join(pending)
+        if not line.isspace():
+            yield line
+
+
+def write_jsonl(fp: IO, lines: Iterable[bytes]) -> None:
+    """Write `lines` to `fp` (binary or text) as JSON Lines, in ~64KiB batches."""
+    text = isinstance(fp, io.TextIOBase)
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        buffer += b"\n"
+        if len(buffer) >= JSONL_WRITE_SIZE:
+            fp.write(buffer.decode() if text else buffer)
+            buffer.clear()
+    if buffer:
+        fp.write(buffer.decode() if text else buffer)
 
 
 def move_field_kwargs(kwargs: dict) -> dict:
     """Move Field(...) kwargs from v1 to v2 and vice versa."""
-    for old_name, new_name in FIELD_NAME_MAP.items():
-        negate = False
-        if new_name.startswith("-"):
-            new_name = new_name[1:]
-            negate = True
+    for old_name, new_name, negate in FIELD_RENAMES:
         if old_name in kwargs:
             if new_name in kwargs:
                 raise ValueError(f"Cannot specify both {old_name} and {new_name}")
-            val = not kwargs.pop(old_name) if negate else kwargs.pop(old_name)
-            kwargs[new_name] = val
+            val = kwargs.pop(old_name)
+            kwargs[new_name] = not val if negate else val
     return kwargs
 
 
@@ -94,11 +398,33 @@ def clean_field_kwargs(kwargs: dict) -> dict:
     return kwargs
 
 
+@lru_cache(maxsize=None)
+def _field_kwargs() -> FrozenSet[str]:
+    """Return the names of the (non-variadic) parameters of pydantic.Field."""
+    from inspect import signature
+
+    import pydantic
+
+    return frozenset(
+        p.name
+        for p in signature(pydantic.Field).parameters.values()
+        if p.kind != p.VAR_KEYWORD
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # FIELD_KWARGS is computed lazily: inspecting pydantic.Field is slow to import
+    if name == "FIELD_KWARGS":
+        return _field_kwargs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if PYDANTIC2:
 
     def move_extras(kwargs: dict) -> dict:
         """Move extra field arguments to json_schema_extra."""
-        extras = {k: kwargs.pop(k) for k in list(kwargs) if k not in FIELD_KWARGS}
+        field_kwargs = _field_kwargs()
+        extras = {k: kwargs.pop(k) for k in list(kwargs) if k not in field_kwargs}
         kwargs.setdefault("json_schema_extra", {}).update(extras)
         return kwargs
 
@@ -110,9 +436,44 @@ else:
         return kwargs
 
 
+FieldPlan = Tuple[bool, Tuple[Tuple[str, str, bool], ...], bool]
+
+
+@lru_cache(maxsize=None)
+def _field_plan(names: FrozenSet[str]) -> FieldPlan:
+    """Return how to translate Field(...) kwargs with these `names`.
+
+    The plan is `(has_const, renames, has_extras)`: whether `const` must be
+    checked, the FIELD_RENAMES to apply, and whether `move_extras` has anything
+    to move.  It only depends on the kwarg names, so each distinct set of names
+    is resolved once (model packages tend to reuse a handful of them).
+    """
+    renames = tuple(r for r in FIELD_RENAMES if r[0] in names)
+    for old_name, new_name, _ in renames:
+        if new_name in names:
+            raise ValueError(f"Cannot specify both {old_name} and {new_name}")
+    if PYDANTIC2:
+        moved = names.difference(r[0] for r in renames).union(r[1] for r in renames)
+        has_extras = not moved.difference(("const",)) <= _field_kwargs()
+    else:
+        has_extras = "json_schema_extra" in names
+    return "const" in names, renames, has_extras
+
+
 def Field(*args: Any, **kwargs: Any) -> Any:
     """Create a field for objects that can be configured."""
-    kwargs = clean_field_kwargs(kwargs)  # remove outdated kwargs
-    kwargs = move_field_kwargs(kwargs)  # move kwargs from v1 to v2 and vice versa
-    kwargs = move_extras(kwargs)  # move extras to/from json_schema_extra
-    return pydantic.Field(*args, **kwargs)
+    started = _profiling.start() if _profiling.ENABLED else None
+    has_const, renames, has_extras = _field_plan(frozenset(kwargs))
+    if has_const:
+        clean_field_kwargs(kwargs)  # remove outdated kwargs
+    for old_name, new_name, negate in renames:  # move kwargs from v1 to v2 and back
+        val = kwargs.pop(old_name)
+        kwargs[new_name] = not val if negate else val
+    if has_extras:
+        move_extras(kwargs)  # move extras to/from json_schema_extra
+    elif PYDANTIC2:
+        kwargs.setdefault("json_schema_extra", {})
+    field = pydantic.Field(*args, **kwargs)
+    if started is not None:
+        _profiling.stop(started, _profiling.caller_owner(), "Field")
+    return field
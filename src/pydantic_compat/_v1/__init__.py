@@ -8,3 +8,6 @@ from .decorators import field_validator as field_validator
 from .decorators import model_validator as model_validator
 from .decorators import root_validator as root_validator
 from .mixin import PydanticCompatMixin as PydanticCompatMixin
+from .serializers import field_serializer as field_serializer
+from .serializers import model_serializer as model_serializer
+from .type_adapter import TypeAdapter as TypeAdapter
@@ -5,9 +5,18 @@ from typing import TYPE_CHECKING, Any, Callable
 
 import pydantic
 
+from pydantic_compat import _profiling
+
 if TYPE_CHECKING:
     from typing import Literal
 
+    from pydantic.v1 import BaseModel  # the v1 model, for the v2 stubs
+
+
+# set on the validators registered for "wrap" and "plain" field validators, to
+# `(mode, function)`: they are applied by fields._ModeField
+MODE_ATTR = "__compat_validator_mode__"
+
 
 # V2 signature
 def field_validator(
@@ -16,7 +25,13 @@ def field_validator(
     mode: Literal["before", "after", "wrap", "plain"] = "after",
     check_fields: bool | None = None,
 ) -> Callable:
-    """Adaptor from v2.field_validator -> v1.validator."""
+    """Adaptor from v2.field_validator -> v1.validator.
+
+    As in v2, validators don't run on defaults, unless the field (with
+    `Field(validate_default=True)`) or the config (`validate_default`) asks for it.
+    "wrap" and "plain" validators are applied around the other validation of the
+    field (see `fields._ModeField`).
+    """
     # V1 signature
     # def validator(
     #     *fields: str,
@@ -28,15 +43,32 @@ def field_validator(
     #     allow_reuse: bool = False,
     # ) -> Callable[[AnyCallable], 'AnyClassMethod']:
     #     ...
-    return pydantic.validator(
+    deco = pydantic.validator(
         _field,
         *fields,
-        pre=(mode in ("before")),
-        always=True,  # should it be?
+        pre=mode == "before",
         check_fields=bool(check_fields),
         allow_reuse=True,
     )
 
+    def _inner(func: Callable) -> Any:
+        started = _profiling.start() if _profiling.ENABLED else None
+        if mode in ("before", "after"):
+            validator = deco(func)
+        else:
+            # pydantic only gets a no-op placeholder, which attaches the validator
+            # to its fields (and inherits it like the others)
+            def placeholder(cls: type, v: Any) -> Any:
+                return v
+
+            setattr(placeholder, MODE_ATTR, (mode, getattr(func, "__func__", func)))
+            validator = deco(placeholder)
+        if started:
+            _profiling.stop(started, _profiling.function_owner(func), "validator")
+        return validator
+
+    return _inner
+
 
 # V2 signature
 def model_validator(*, mode: Literal["wrap", "before", "after"]) -> Any:
@@ -56,6 +88,21 @@ def model_validator(*, mode: Literal["wrap", "before", "after"]) -> Any:
     )
 
 
+def _construct_validated(cls: type[BaseModel], values: dict[str, Any]) -> BaseModel:
+    """Create an instance of `cls` that uses `values` as its `__dict__` (no copy).
+
+    `values` have already been validated, so defaults and validation are skipped.
+    """
+    if not cls.__fields__.keys() <= values.keys():
+        # some fields failed validation: let construct fill in the defaults
+        return cls.construct(**values)
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, "__dict__", values)
+    object.__setattr__(obj, "__fields_set__", set(values))
+    obj._init_private_attributes()
+    return obj
+
+
 def root_validator(
     _func: Callable | None = None,
     *,
@@ -65,24 +112,30 @@ def root_validator(
     construct_object: bool = False,
 ) -> Any:
     def _inner(_func: Callable) -> Any:
+        started = _profiling.start() if _profiling.ENABLED else None
         func = _func
         if construct_object and not pre:
             if isinstance(_func, classmethod):
                 _func = _func.__func__
 
             @wraps(_func)
-            def func(cls: type[pydantic.BaseModel], *args: Any, **kwargs: Any) -> Any:
+            def func(cls: type[BaseModel], *args: Any, **kwargs: Any) -> Any:
                 arg0, *rest = args
-                # cast dict to model to match the v2 model_validator signature
-                # using construct because it should already be valid
-                new_args = (cls.construct(**arg0), *rest)
-                result: pydantic.BaseModel = _func(cls, *new_args, **kwargs)
+                # cast dict to model to match the v2 model_validator signature.
+                # the values are already valid, so the instance just borrows them
+                obj = _construct_validated(cls, arg0)
+                result: BaseModel = _func(cls, obj, *rest, **kwargs)
+                if result is obj:
+                    return obj.__dict__
                 # cast back to dict of field -> value
                 return {k: getattr(result, k) for k in result.__fields__}
 
         deco = pydantic.root_validator(  # type: ignore [call-overload]
             pre=pre, allow_reuse=allow_reuse, skip_on_failure=skip_on_failure
         )
-        return deco(func)
+        validator = deco(func)
+        if started:
+            _profiling.stop(started, _profiling.function_owner(_func), "validator")
+        return validator
 
     return _inner(_func) if _func else _inner
@@ -0,0 +1,335 @@
+"""ModelField subclasses, for fields that pydantic v1 can't validate as v2 would.
+
+After a model is created, `compile_fields` switches the class of such fields
+(fields have `__slots__`, and these subclasses add none):
+
+- `Field(validate_default=True)`, which v1 doesn't know
+- fields with "wrap" or "plain" field validators
+- `Field(discriminator=...)` on pydantic < 1.9, which added discriminated unions
+  (later versions handle it natively)
+
+The class of a field is kept when pydantic copies it to a subclass.
+"""
+
+from __future__ import annotations
+
+from copy import copy
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    ForwardRef,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # mypy runs with the v2 stubs, which have v1 as pydantic.v1
+    from pydantic.v1 import ValidationError
+    from pydantic.v1.class_validators import prep_validators
+    from pydantic.v1.error_wrappers import ErrorWrapper
+    from pydantic.v1.errors import ConfigError, PydanticValueError
+    from pydantic.v1.fields import SHAPE_SINGLETON, ModelField
+    from pydantic.v1.typing import all_literal_values, display_as_type, is_literal_type
+else:
+    from pydantic import ValidationError
+    from pydantic.class_validators import prep_validators
+    from pydantic.error_wrappers import ErrorWrapper
+    from pydantic.errors import ConfigError, PydanticValueError
+    from pydantic.fields import SHAPE_SINGLETON, ModelField
+    from pydantic.typing import all_literal_values, display_as_type, is_literal_type
+
+from .decorators import MODE_ATTR
+
+# pydantic >= 1.9 validates discriminated unions itself
+NATIVE_DISCRIMINATOR = hasattr(ModelField, "discriminator_key")
+
+
+def compile_fields(cls: Any) -> None:
+    """Set up the fields of model `cls` that v1 can't validate as v2 would."""
+    for field in cls.__fields__.values():
+        extra = field.field_info.extra
+        # popped, or v1 would put it in the JSON schema (kept by the field class,
+        # for the copies of the field in subclasses)
+        validate_default = bool(
+            extra.pop("validate_default", getattr(field, "validate_default", False))
+        )
+        if any(hasattr(v.func, MODE_ATTR) for v in field.class_validators.values()):
+            field_cls: type = _DefaultModeField if validate_default else _ModeField
+        elif validate_default:
+            field_cls = _DefaultField
+        else:
+            field_cls = ModelField
+        if not NATIVE_DISCRIMINATOR:  # popped as validate_default
+            discriminator = extra.pop(
+                "discriminator", getattr(field, "discriminator_key", None)
+            )
+            if discriminator is not None:
+                field_cls = _discriminated_class(field, field_cls, discriminator)
+        if type(field) is not field_cls:
+            object.__setattr__(field, "__class__", field_cls)
+        if issubclass(field_cls, _ModeField):
+            field.populate_validators()  # also for copies, with the config of cls
+        if validate_default:
+            field.validate_always = True
+
+
+class _CompatField(ModelField):
+    """Base class of the fields set up by `compile_fields`."""
+
+    __slots__ = ()
+    validate_default: ClassVar[bool] = False
+
+    def populate_validators(self) -> None:
+        super().populate_validators()
+        if self.validate_default:
+            self.validate_always = True
+
+    def _create_sub_type(self, *args: Any, **kwargs: Any) -> ModelField:
+        # pydantic creates sub fields (e.g. for list items) of the same class
+        field = super()._create_sub_type(*args, **kwargs)
+        object.__setattr__(field, "__class__", ModelField)
+        return field
+
+
+class _DefaultField(_CompatField):
+    """A field validating its default with `Field(validate_default=True)`."""
+
+    __slots__ = ()
+    validate_default = True
+
+
+class _ModeField(_CompatField):
+    """A field with "wrap" or "plain" field validators.
+
+    As in v2, all its validators are applied in one chain around the validation
+    of the type, in which the validators defined last are the outermost.
+    """
+
+    __slots__ = ()
+
+    def populate_validators(self) -> None:
+        super().populate_validators()
+        # the validation of the type (and the `each_item` validators) on a copy
+        # of the field, as the class validators aren't applied in definition order
+        inner = copy(self)
+        object.__setattr__(inner, "__class__", ModelField)
+        inner.class_validators = {
+            name: validator
+            for name, validator in self.class_validators.items()
+            if validator.each_item
+        }
+        inner.populate_validators()
+        chain: list[tuple[str, Callable]] = []
+        for validator in self.class_validators.values():
+            if validator.each_item:
+                continue
+            mode, func = getattr(validator.func, MODE_ATTR, (None, validator.func))
+            if mode is None:
+                mode = "before" if validator.pre else "after"
+                (func,) = prep_validators([func])
+            chain.append((mode, func))
+        # a validator of the field, but only called by `validate`
+        self.pre_validators = [partial(_validate_chain, inner, tuple(chain))]
+        self.post_validators = None
+
+    def validate(
+        self, v: Any, values: dict[str, Any], *, loc: Any, cls: Any = None
+    ) -> tuple[Any, Any]:
+        validate_chain = self.pre_validators[0]  # type: ignore [index]
+        try:
+            return validate_chain(cls, v, values, self, self.model_config), None
+        except (ValueError, TypeError, AssertionError) as exc:
+            return v, ErrorWrapper(exc, loc)
+
+
+class _DefaultModeField(_ModeField):
+    """A field with "wrap" or "plain" field validators, and `validate_default`."""
+
+    __slots__ = ()
+    validate_default = True
+
+
+Chain = Tuple[Tuple[str, Callable], ...]
+
+
+def _validate_chain(
+    inner: ModelField,
+    chain: Chain,
+    cls: Any,
+    v: Any,
+    values: Any,
+    field: ModelField,
+    config: Any,
+) -> Any:
+    def validate(value: Any) -> Any:
+        # errors of the type are located in the field
+        value, errors = inner.validate(value, values, loc=(), cls=cls)
+        if errors:
+            raise ValidationError(errors if isinstance(errors, list) else [errors], cls)
+        return value
+
+    for mode, func in chain:
+        if mode == "plain":
+            validate = partial(func, cls)
+        elif mode == "wrap":
+            validate = partial(_call_wrap, func, cls, validate)
+        else:
+            call = _call_before if mode == "before" else _call_after
+            validate = partial(call, func, cls, values, field, validate)
+    return validate(v)
+
+
+def _call_wrap(func: Callable, cls: Any, handler: Callable, value: Any) -> Any:
+    return func(cls, value, handler)
+
+
+# the validators of `prep_validators` take (cls, value, values, field, config)
+def _call_before(
+    func: Callable, cls: Any, values: Any, field: ModelField, handler: Callable, v: Any
+) -> Any:
+    return handler(func(cls, v, values, field, field.model_config))
+
+
+def _call_after(
+    func: Callable, cls: Any, values: Any, field: ModelField, handler: Callable, v: Any
+) -> Any:
+    return func(cls, handler(v), values, field, field.model_config)
+
+
+# the errors of pydantic >= 1.9
+class MissingDiscriminator(PydanticValueError):
+    code = "discriminated_union.missing_discriminator"
+    msg_template = "Discriminator {discriminator_key!r} is missing in value"
+
+
+class InvalidDiscriminator(PydanticValueError):
+    code = "discriminated_union.invalid_discriminator"
+    msg_template = (
+        "No match for discriminator {discriminator_key!r} and value "
+        "{discriminator_value!r} (allowed values: {allowed_values})"
+    )
+
+    def __init__(
+        self, *, discriminator_key: str, discriminator_value: Any, allowed_values: Any
+    ) -> None:
+        super().__init__(
+            discriminator_key=discriminator_key,
+            discriminator_value=discriminator_value,
+            allowed_values=", ".join(map(repr, allowed_values)),
+        )
+
+
+# (discriminator alias, {discriminator value: index of the member in sub_fields})
+Dispatch = Tuple[str, Dict[Any, int]]
+
+
+class _DiscriminatedField(_CompatField):
+    """A union field validating its value with the member selected by the value
+    of its discriminator, as pydantic >= 1.9 does (instead of trying each one).
+
+    There is a subclass per field, with its `discriminator_key`, and its dispatch
+    table once the members are known (they may be forward references).
+    """
+
+    __slots__ = ()
+    discriminator_key: str  # the same for all the instances
+    dispatch: ClassVar[Dispatch | None] = None
+
+    def _validate_singleton(
+        self, v: Any, values: dict[str, Any], loc: Any, cls: Any
+    ) -> tuple[Any, Any]:
+        if not self.sub_fields:
+            return super()._validate_singleton(v, values, loc, cls)
+        dispatch = type(self).dispatch or _set_dispatch(self)
+        if dispatch is None:
+            raise ConfigError(
+                f'field "{self.name}" not yet prepared so type is still a ForwardRef, '
+                f"you might need to call {cls.__name__}.update_forward_refs()."
+            )
+        alias, indexes = dispatch
+        key = self.discriminator_key
+        try:
+            try:
+                value = v[alias]
+            except KeyError:
+                if self.model_config.allow_population_by_field_name:
+                    value = v[key]
+                else:
+                    raise
+        except KeyError:
+            return v, ErrorWrapper(MissingDiscriminator(discriminator_key=key), loc)
+        except TypeError:
+            try:
+                value = getattr(v, key)  # a model instance
+            except (AttributeError, TypeError):
+                error: PydanticValueError = MissingDiscriminator(discriminator_key=key)
+                return v, ErrorWrapper(error, loc)
+        try:
+            sub_field = self.sub_fields[indexes[value]]
+        except (KeyError, TypeError):  # TypeError: unhashable value
+            error = InvalidDiscriminator(
+                discriminator_key=key,
+                discriminator_value=value,
+                allowed_values=list(indexes),
+            )
+            return v, ErrorWrapper(error, loc)
+        if not isinstance(loc, tuple):
+            loc = (loc,)
+        loc = (*loc, display_as_type(sub_field.type_))
+        return sub_field.validate(v, values, loc=loc, cls=cls)
+
+
+def _discriminated_class(field: ModelField, base: type, key: str) -> type:
+    """The class of the discriminated union `field`, subclassing `base`."""
+    field_cls = type(field)
+    if field_cls.__bases__ == (_DiscriminatedField, base):
+        if field_cls.discriminator_key == key:
+            return field_cls  # copied from a base model
+    is_union = getattr(field.type_, "__origin__", None) is Union
+    if field.shape != SHAPE_SINGLETON or not is_union:
+        raise TypeError(
+            "`discriminator` can only be used with `Union` type with more than one "
+            "variant"
+        )
+    namespace = {"__slots__": (), "discriminator_key": key}
+    field_cls = type("DiscriminatedField", (_DiscriminatedField, base), namespace)
+    object.__setattr__(field, "__class__", field_cls)
+    _set_dispatch(field)  # fails early for invalid members
+    return field_cls
+
+
+def _set_dispatch(field: Any) -> Dispatch | None:
+    # build the dispatch table of field, if its members are known
+    key = field.discriminator_key
+    aliases = set()
+    indexes: dict[Any, int] = {}
+    for i, sub_field in enumerate(field.sub_fields):
+        member = sub_field.type_
+        if member.__class__ is ForwardRef:
+            return None  # see update_forward_refs
+        try:
+            member_field = member.__fields__[key]
+        except AttributeError as e:
+            raise TypeError(
+                f"Type {member.__name__!r} is not a valid `BaseModel` or `dataclass`"
+            ) from e
+        except KeyError as e:
+            raise ConfigError(
+                f"Model {member.__name__!r} needs a discriminator field for key {key!r}"
+            ) from e
+        if not is_literal_type(member_field.type_):
+            raise ConfigError(
+                f"Field {key!r} of model {member.__name__!r} needs to be a `Literal`"
+            )
+        aliases.add(member_field.alias)
+        indexes.update(dict.fromkeys(all_literal_values(member_field.type_), i))
+    if len(aliases) > 1:
+        raise ConfigError(
+            f"Aliases for discriminator {key!r} must be the same "
+            f"(got {', '.join(sorted(aliases))})"
+        )
+    type(field).dispatch = dispatch = (aliases.pop(), indexes)
+    return dispatch
@@ -0,0 +1,185 @@
+"""Faster JSON libraries for model_dump_json / model_validate_json on pydantic v1.
+
+The output is the same as with the json module: values the other libraries
+encode natively, but differently (e.g. `Decimal`, `timedelta` or aware datetimes
+with msgspec), go through the pydantic encoder, and data with NaN or infinities
+(written as `null` by the other libraries) is dumped with the json module.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import enum
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple
+
+from pydantic_compat import _shared
+
+
+class JsonBackend(NamedTuple):
+    name: str
+    # (str | bytes | bytearray | memoryview) -> Any
+    loads: Callable[[Any], Any]
+    # (obj, default) -> str
+    dumps: Callable[[Any, Callable[[Any], Any]], str]
+    # errors raised by loads for invalid JSON
+    decode_errors: tuple[type[Exception], ...]
+    # errors raised by dumps for data this backend can't encode (e.g. big ints)
+    encode_errors: tuple[type[Exception], ...]
+
+
+class _Unsupported(ValueError):
+    """Data that a backend can't encode as the json module does."""
+
+
+def _converted(obj: Any, default: Callable[[Any], Any], types: tuple) -> Any:
+    """`obj`, with the instances of `types` (and dataclasses) converted by
+    `default`, as the json module would.
+
+    Raises `_Unsupported` for NaN and infinities.
+    """
+    if isinstance(obj, dict):
+        return {k: _converted(v, default, types) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_converted(v, default, types) for v in obj]
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise _Unsupported(obj)
+    elif isinstance(obj, types) or hasattr(type(obj), "__dataclass_fields__"):
+        return _converted(default(obj), default, types)
+    return obj
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_backend() -> JsonBackend:
+    return JsonBackend(
+        "json",
+        _stdlib_loads,
+        lambda obj, default: json.dumps(obj, default=default),
+        (ValueError, TypeError),
+        (),
+    )
+
+
+# 20 digits or more: maybe an integer out of the 64 bits of orjson
+_LONG_NUMBER = re.compile(r"\d{20}")
+_LONG_NUMBER_BYTES = re.compile(rb"\d{20}")
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson
+
+    def loads(data: Any) -> Any:
+        # orjson parses integers that don't fit in 64 bits as floats
+        pattern = _LONG_NUMBER if isinstance(data, str) else _LONG_NUMBER_BYTES
+        if pattern.search(data):
+            return _stdlib_loads(data)
+        return orjson.loads(data)
+
+    # datetimes and dataclasses go through `default`, as with the json module
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(obj: Any, default: Callable[[Any], Any]) -> str:
+        result: bytes = orjson.dumps(obj, default=default, option=option)
+        if b"null" in result:
+            _converted(obj, default, ())  # NaN or infinities?
+        return result.decode()
+
+    return JsonBackend(
+        "orjson",
+        loads,
+        dumps,
+        (orjson.JSONDecodeError, TypeError),
+        (orjson.JSONEncodeError, _Unsupported),
+    )
+
+
+# types msgspec encodes natively, but not as the pydantic encoder does (e.g.
+# Decimal as a string, timedelta as an ISO 8601 duration, bytes as base64)
+_MSGSPEC_CONVERTED = (
+    decimal.Decimal,
+    datetime.datetime,
+    datetime.time,
+    datetime.timedelta,
+    bytes,
+    bytearray,
+    enum.Enum,
+    set,
+    frozenset,
+)
+
+
+def _msgspec_backend() -> JsonBackend:
+    import msgspec
+
+    encode = msgspec.json.encode
+
+    def dumps(obj: Any, default: Callable[[Any], Any]) -> str:
+        obj = _converted(obj, default, _MSGSPEC_CONVERTED)
+        result: bytes = encode(obj, enc_hook=default)
+        return result.decode()
+
+    return JsonBackend(
+        "msgspec",
+        msgspec.json.decode,
+        dumps,
+        (msgspec.DecodeError, TypeError),
+        (msgspec.EncodeError, TypeError, OverflowError, _Unsupported),
+    )
+
+
+_BACKENDS = {
+    "json": _stdlib_backend,
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+}
+
+
+@lru_cache(maxsize=None)
+def load_backend(name: str) -> JsonBackend:
+    """Return the backend called `name`, falling back to the standard library."""
+    if name == "auto":
+        names: tuple[str, ...] = ("orjson", "msgspec")
+    elif name in _BACKENDS:
+        names = (name,)
+    else:
+        raise ValueError(
+            f"json backend must be one of {_shared.JSON_BACKENDS}, not {name!r}"
+        )
+    for _name in names:
+        try:
+            return _BACKENDS[_name]()
+        except ImportError:
+            continue
+    return _stdlib_backend()
+
+
+def get_backend(config: type, hook: str) -> JsonBackend | None:
+    """Return the backend to use for a model's Config, for `hook`.
+
+    `hook` is 'json_loads' or 'json_dumps'.  None means a custom `hook` is set on
+    the Config (and no `json_backend`), so pydantic's own code path should be used.
+    Models with `json_encoders` are dumped with the json module: other backends
+    encode some types (e.g. UUID, Enum) without calling the encoders.
+    """
+    if hook == "json_dumps" and config.json_encoders:  # type: ignore [attr-defined]
+        return load_backend("json")
+    name = getattr(config, "json_backend", None)
+    if name is None:
+        if getattr(config, hook) is not getattr(json, hook[5:]):
+            return None
+        name = _shared._json_backend
+    return load_backend(name)
@@ -0,0 +1,231 @@
+"""Validation of (very) large JSON files into models on pydantic v1.
+
+`parse_raw` needs the whole text as a str, then the whole tree of dicts and
+lists from `json.loads`, before the first model is created.  Here the file is
+memory-mapped and decoded a window at a time, and the values of fields holding
+models (or lists or dicts of models) are parsed object by object: each object is
+validated into a model as soon as it ends, and its dict is dropped.  At any time,
+only the models and the parsed value of one other field exist, besides the
+current window.  Other values are parsed with the json module (its scanner).
+
+Objects for models with `pre` validators (which expect the raw values) are
+parsed whole, as are unions of models.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:  # mypy runs with the v2 stubs, which have v1 as pydantic.v1
+    from pydantic.v1 import BaseModel, ValidationError
+    from pydantic.v1.error_wrappers import ErrorWrapper
+    from pydantic.v1.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_SINGLETON, ModelField
+    from pydantic.v1.utils import ROOT_KEY
+else:
+    from pydantic import BaseModel, ValidationError
+    from pydantic.error_wrappers import ErrorWrapper
+    from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_SINGLETON, ModelField
+    from pydantic.utils import ROOT_KEY
+
+# number of bytes decoded at a time (more for values that don't fit)
+WINDOW = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_STREAMED_SHAPES = (SHAPE_SINGLETON, SHAPE_LIST, SHAPE_DICT)
+
+
+def validate_file(cls: Any, path: str | os.PathLike) -> Any:
+    """Validate the JSON document in file `path` into an instance of `cls`."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            parser = _Parser(_Reader(data))
+            try:
+                obj = parser.model_values(cls)
+                parser.reader.end()
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise ValidationError([ErrorWrapper(e, loc=ROOT_KEY)], cls) from e
+        finally:
+            if size:
+                data.close()
+    return cls.parse_obj(obj)
+
+
+class _Reader:
+    """The JSON text of `data` (UTF-8 bytes), decoded a window at a time."""
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        self.text = ""  # the current window
+        self.pos = 0  # in text
+        self.offset = 0  # of text in data, in bytes
+        self.eof = not data  # whether text goes to the end of data
+
+    def _load(self, size: int) -> None:
+        # move the window to the current position, with about `size` bytes
+        text, pos = self.text, self.pos
+        self.offset += pos if text.isascii() else len(text[:pos].encode())
+        end = min(self.offset + size, len(self.data))
+        chunk = self.data[self.offset : end]
+        self.eof = end == len(self.data)
+        if not self.eof:
+            # drop the last (maybe incomplete) character, it's read again later
+            last = len(chunk) - 1
+            while last > 0 and chunk[last] & 0xC0 == 0x80:
+                last -= 1
+            chunk = chunk[:last]
+        self.text = chunk.decode()
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace, and return the next character ("" at the end)."""
+        while True:
+            pos = _WHITESPACE.match(self.text, self.pos).end()  # type: ignore [union-attr]
+            self.pos = pos
+            if pos < len(self.text):
+                return self.text[pos]
+            if self.eof:
+                return ""
+            self._load(WINDOW)
+
+    def take(self, *chars: str) -> str:
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.text, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Parse the next value."""
+        self.peek()
+        size = WINDOW
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # a number at the end of the window may go on after it
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return obj
+            size = max(2 * size, 2 * (len(self.text) - self.pos))
+            self._load(size)
+
+    def end(self) -> None:
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self.text, self.pos)
+
+
+class _Parser:
+    def __init__(self, reader: _Reader) -> None:
+        self.reader = reader
+        # {model: {key: field whose value is parsed object by object}}
+        self._fields: dict[type, dict[str, ModelField] | None] = {}
+
+    def model_values(self, cls: type) -> Any:
+        """Parse the next value, for model `cls`: the values of its fields,
+        where the models among them are already validated."""
+        fields = self._streamed_fields(cls)
+        if not fields or self.reader.peek() != "{":
+            return self.reader.value()
+        values: dict[str, Any] = {}
+        for key in self._members():
+            field = fields.get(key)
+            values[key] = self.reader.value() if field is None else self._field(field)
+        return values
+
+    def model(self, cls: Any) -> Any:
+        """Parse the next value into an instance of model `cls`, or into the values
+        to validate if they are invalid (for the parent model to report)."""
+        values = self.model_values(cls)
+        if not isinstance(values, dict):
+            return values  # e.g. None
+        try:
+            return cls.parse_obj(values)
+        except ValidationError:
+            return values
+
+    def _field(self, field: ModelField) -> Any:
+        cls = field.type_
+        if field.shape == SHAPE_SINGLETON:
+            return self.model(cls)
+        if field.shape == SHAPE_LIST:
+            if self.reader.peek() != "[":
+                return self.reader.value()
+            return [self.model(cls) for _ in self._items()]
+        # SHAPE_DICT
+        if self.reader.peek() != "{":
+            return self.reader.value()
+        return {key: self.model(cls) for key in self._members()}
+
+    def _members(self) -> Iterator[str]:
+        # consume an object, yielding its keys: the caller parses each value
+        reader = self.reader
+        reader.take("{")
+        if reader.peek() == "}":
+            reader.take("}")
+            return
+        while True:
+            if reader.peek() != '"':
+                reader.take('"')  # raises
+            key = reader.value()
+            reader.take(":")
+            yield key
+            if reader.take(",", "}") == "}":
+                return
+
+    def _items(self) -> Iterator[None]:
+        # consume an array, yielding for each item: the caller parses it
+        reader = self.reader
+        reader.take("[")
+        if reader.peek() == "]":
+            reader.take("]")
+            return
+        while True:
+            yield None
+            if reader.take(",", "]") == "]":
+                return
+
+    def _streamed_fields(self, cls: Any) -> dict[str, ModelField] | None:
+        try:
+            return self._fields[cls]
+        except KeyError:
+            pass
+        fields: dict[str, ModelField] | None = None
+        if (
+            isinstance(cls, type)
+            and issubclass(cls, BaseModel)
+            and not cls.__custom_root_type__
+            and not cls.__pre_root_validators__
+        ):
+            by_name = cls.__config__.allow_population_by_field_name
+            fields = {}
+            for field in cls.__fields__.values():
+                if _is_streamed(field):
+                    fields[field.alias] = field
+                    if by_name:
+                        fields[field.name] = field
+        self._fields[cls] = fields
+        return fields
+
+
+def _is_streamed(field: ModelField) -> bool:
+    # whether the value of `field` can be parsed object by object: the field
+    # (or its items) validates model instances as it would their dicts
+    type_ = field.type_
+    return (
+        field.shape in _STREAMED_SHAPES
+        and isinstance(type_, type)
+        and issubclass(type_, BaseModel)
+        and type(field).validate is ModelField.validate
+        and not any(f.pre_validators for f in (field, *(field.sub_fields or ())))
+    )
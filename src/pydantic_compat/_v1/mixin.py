@@ -1,14 +1,37 @@
 from __future__ import annotations
 
 import sys
-from typing import TYPE_CHECKING, Any, ClassVar, Iterator, Mapping
-
-from pydantic import main
-
-from pydantic_compat._shared import V2_RENAMED_CONFIG_KEYS, check_mixin_order
+import threading
+from abc import ABCMeta
+from types import FunctionType
+from typing import IO, TYPE_CHECKING, Any, ClassVar, Dict, Iterable, Iterator, Mapping
+
+from pydantic import BaseConfig, ValidationError, main
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import ModelPrivateAttr
+from pydantic.schema import default_ref_template
+from pydantic.utils import ROOT_KEY
+
+from pydantic_compat import _construct, _profiling, _schema_cache, _shared
+from pydantic_compat._shared import (
+    V2_RENAMED_CONFIG_KEYS,
+    bind_aliases,
+    check_mixin_order,
+    copy_on_write,
+    iter_jsonl,
+    validate_each,
+    write_jsonl,
+)
+
+from .fields import compile_fields
+from .json_backend import get_backend
+from .json_file import validate_file
+from .serializers import compile_serializers, update_json_mode
 
 if TYPE_CHECKING:
-    from typing import Dict
+    import os
+    from concurrent.futures import Executor
+    from typing import Literal
 
     from pydantic.fields import ModelField  # type: ignore
     from typing_extensions import Protocol
@@ -29,13 +52,114 @@ if TYPE_CHECKING:
         @classmethod
         def update_forward_refs(cls, *args: Any, **kwargs: Any) -> None: ...
 
+        def _iter(self, *args: Any, **kwargs: Any) -> Iterator[tuple[str, Any]]: ...
+        @classmethod
+        def parse_obj(cls, *args: Any, **kwargs: Any) -> Model: ...
+        @classmethod
+        def model_validate_json(cls, *args: Any, **kwargs: Any) -> Any: ...
+
         __fields__: ClassVar[Dict]  # noqa: UP006
+        __custom_root_type__: ClassVar[bool]
+        __json_encoder__: ClassVar[Any]
         __fields_set__: set[str]
         __config__: ClassVar[type]
+        __private_attributes__: ClassVar[Dict]  # noqa: UP006
     # fmt:on
 
 
 REVERSE_CONFIG_NAME_MAP = {v: k for k, v in V2_RENAMED_CONFIG_KEYS.items()}
+FIELD_INFO_MAP_ATTR = "__compat_field_info_map__"
+CONFIG_MAP_ATTR = "__compat_config_map__"
+# (namespace, stub keys) of a model whose build is deferred
+DEFERRED_ATTR = "__compat_deferred__"
+# {v2 name: v1 name} of the mixin methods that are the v1 method itself
+ALIASES = {
+    "model_dump": "dict",
+    "model_json_schema": "schema",
+    "model_validate": "validate",
+    "model_construct": "construct",
+}
+# BaseModel.json() arguments that are passed to BaseModel._iter()
+_ITER_KWARGS = {
+    "include",
+    "exclude",
+    "by_alias",
+    "exclude_unset",
+    "exclude_defaults",
+    "exclude_none",
+}
+# methods on BaseConfig that are not config values
+_CONFIG_METHODS = {
+    k for k, v in vars(BaseConfig).items() if isinstance(v, (classmethod, staticmethod))
+}
+
+
+class FieldInfoLike:
+    """Wrapper to convert pydantic v1 ModelField to v2 FieldInfo.
+
+    The v2 FieldInfo attributes are resolved once, when the wrapper is created.
+    Anything else is looked up on the wrapped ModelField.
+    """
+
+    __slots__ = (
+        "_model_field",
+        "_required",
+        "alias",
+        "annotation",
+        "default",
+        "default_factory",
+        "description",
+        "discriminator",
+        "exclude",
+        "frozen",
+        "json_schema_extra",
+        "repr",
+        "title",
+    )
+
+    def __init__(self, model_field: ModelField) -> None:
+        field_info = model_field.field_info
+        self._model_field = model_field
+        self._required: bool = model_field.required is True
+        self.alias: str = model_field.alias
+        self.annotation: Any = model_field.outer_type_
+        self.default: Any = model_field.default
+        self.default_factory: Any = model_field.default_factory
+        self.description: str | None = field_info.description
+        # pydantic < 1.9: see fields.py
+        self.discriminator: str | None = getattr(
+            field_info, "discriminator", None
+        ) or getattr(model_field, "discriminator_key", None)
+        self.exclude: Any = getattr(field_info, "exclude", None)
+        self.frozen: bool = not field_info.allow_mutation
+        self.json_schema_extra: dict = field_info.extra
+        self.repr: bool = getattr(field_info, "repr", True)
+        self.title: str | None = field_info.title
+
+    def is_required(self) -> bool:
+        return self._required
+
+    def __getattr__(self, key: str) -> Any:
+        return getattr(self._model_field, key)
+
+    def __repr__(self) -> str:
+        return repr(self._model_field)
+
+
+class FieldInfoMap(Dict[str, FieldInfoLike]):
+    """Adaptor between v1 __fields__ and v2 model_field.
+
+    The FieldInfoLike wrappers are created once, so lookups are plain dict lookups.
+    Instances are cached per model class (see `_get_field_info_map`).
+    """
+
+    def __init__(self, fields: dict[str, ModelField]) -> None:
+        super().__init__((k, FieldInfoLike(v)) for k, v in fields.items())
+        self._fields = fields
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._fields[key] = value
+        super().__setitem__(key, FieldInfoLike(value))
 
 
 def _convert_config(config_dict: dict) -> type:
@@ -43,21 +167,244 @@ def _convert_config(config_dict: dict) -> type:
     for k in sorted(deprecated_renamed_keys):
         config_dict[REVERSE_CONFIG_NAME_MAP[k]] = config_dict.pop(k)
 
-    return type("Config", (), config_dict)
+    return _ConfigMeta("Config", (), config_dict)
+
+
+# incremented when the Config class of a model is mutated (see model_config)
+_config_version = 0
+
+
+class _ConfigMeta(type):
+    """Metaclass of the Config classes of compat models, counting their mutations.
+
+    pydantic creates the Config class of a model (and of its subclasses) with
+    `type()`, which picks this metaclass when the Config of the namespace has it.
+    """
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        global _config_version
+        super().__setattr__(name, value)
+        _config_version += 1
+
+    def __delattr__(cls, name: str) -> None:
+        global _config_version
+        super().__delattr__(name)
+        _config_version += 1
+
+
+def _tracked_config(config: type | None) -> type:
+    # the Config class of a model namespace, with mutations counted
+    if config is None:
+        return _ConfigMeta("Config", (), {})
+    if type(config) is not type:
+        return config  # a ConfigMeta already (or a metaclass of the user's own)
+    return _ConfigMeta(config.__name__, (config,), {"__module__": config.__module__})
+
+
+class _DeferredAttribute:
+    """Placeholder for a ModelMetaclass attribute of a model that isn't built yet.
+
+    Looking it up (e.g. `__fields__` when validating) builds the model.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        for cls in owner.__mro__:
+            if cls.__dict__.get(self.name) is self:
+                # other threads wait for the build, this one may not use the model
+                with _BUILD_LOCK:
+                    if cls in _BUILDING:
+                        raise AttributeError(f"{cls.__name__!r} is being built")
+                    _build_deferred(cls)
+                break
+        return getattr(owner if obj is None else obj, self.name)
+
+
+# the attributes ModelMetaclass sets on every model
+_DEFERRED_ATTRIBUTES = {
+    name: _DeferredAttribute(name)
+    for name in (
+        "__class_vars__",
+        "__config__",
+        "__custom_root_type__",
+        "__exclude_fields__",
+        "__fields__",
+        "__include_fields__",
+        "__json_encoder__",
+        "__post_root_validators__",
+        "__pre_root_validators__",
+        "__private_attributes__",
+        "__schema_cache__",
+        "__signature__",
+        "__validators__",
+    )
+    if name in vars(main.BaseModel)
+}
+# values that are not private attributes, even with an underscore name
+_UNTOUCHED = (FunctionType, classmethod, staticmethod, property)
+_BUILDING: set[type] = set()
+_BUILD_LOCK = threading.RLock()
+
+
+def _should_defer(
+    name: str, bases: tuple[type, ...], namespace: dict, kwargs: dict
+) -> bool:
+    """Whether to defer building a model with these `bases` and `namespace`."""
+    defer = getattr(namespace.get("Config"), "defer_build", None)
+    for base in bases:
+        if defer is not None:
+            break
+        if DEFERRED_ATTR in base.__dict__:
+            defer = True
+        elif isinstance(base, main.ModelMetaclass):
+            defer = getattr(base.__config__, "defer_build", None)
+    if not (_shared.defers_build(namespace) if defer is None else defer):
+        return False
+    # only plain model classes are deferred: the deferred class is created
+    # without ModelMetaclass, so it can't have slots (for private attributes)
+    # and must not run __init_subclass__ hooks twice
+    if kwargs or "__slots__" in namespace:
+        return False
+    # forward references to the model itself are resolved in the module globals
+    # when it's built, so it must be defined at the top level of its module
+    if namespace.get("__qualname__") != name:
+        return False
+    if not any(issubclass(b, main.BaseModel) for b in bases):
+        return False
+    if any("__init_subclass__" in vars(k) for b in bases for k in b.__mro__[:-1]):
+        return False
+    for name in namespace.keys() | namespace.get("__annotations__", {}).keys():
+        if name.startswith("_") and not name.startswith("__"):
+            if not isinstance(namespace.get(name), _UNTOUCHED):
+                return False
+    return not any(isinstance(v, ModelPrivateAttr) for v in namespace.values())
+
+
+def _build_deferred(cls: type) -> None:
+    """Build the deferred model `cls` in place."""
+    with _BUILD_LOCK:
+        deferred = cls.__dict__.get(DEFERRED_ATTR)
+        if deferred is None or cls in _BUILDING:
+            return
+        namespace, stub_keys = deferred
+        _BUILDING.add(cls)
+        try:
+            # ModelMetaclass does all the work on a throwaway class, whose
+            # attributes are then moved onto `cls` (which user code refers to)
+            meta: Any = type(cls)
+            built = super(_MixinMeta, meta).__new__(
+                meta, cls.__name__, cls.__bases__, namespace
+            )
+        finally:
+            _BUILDING.discard(cls)
+        for key, value in built.__dict__.items():
+            if key == "_abc_impl" or (key in cls.__dict__ and key not in stub_keys):
+                continue  # set on cls after it was created
+            setattr(cls, key, value)
+        for key in stub_keys:
+            if isinstance(cls.__dict__.get(key), _DeferredAttribute):
+                delattr(cls, key)
+        bind_aliases(cls, namespace, ALIASES)
+        compile_serializers(cls, namespace)
+        compile_fields(cls)
+        _get_field_info_map(cls)
+        # last: until then, other threads looking up a missing attribute wait
+        delattr(cls, DEFERRED_ATTR)
+
+
+def _copy_model(model: main.BaseModel, update: dict[str, Any]) -> main.BaseModel:
+    return main.BaseModel.copy(model, update=update)
+
+
+def _unpickle(cls: Any, values: dict[str, Any], fields_set: set[str]) -> Any:
+    m = cls.__new__(cls)
+    object.__setattr__(m, "__dict__", values)
+    object.__setattr__(m, "__fields_set__", fields_set)
+    return m
 
 
 class _MixinMeta(main.ModelMetaclass):
     def __new__(cls, name, bases, namespace: dict, **kwargs):  # type: ignore
+        started = _profiling.start() if _profiling.ENABLED else None
         if "model_config" in namespace and isinstance(namespace["model_config"], dict):
+            config_started = _profiling.start() if started else None
             namespace["Config"] = _convert_config(namespace.pop("model_config"))
-
-        return super().__new__(cls, name, bases, namespace, **kwargs)
+            if config_started:
+                owner = _profiling.class_owner(namespace)
+                _profiling.stop(config_started, owner, "config")
+        namespace["Config"] = _tracked_config(namespace.get("Config"))
+        if len(bases) > 1:
+            check_mixin_order(bases, PydanticCompatMixin, main.BaseModel)
+
+        if _should_defer(name, bases, namespace, kwargs):
+            new_cls = _new_deferred(cls, name, bases, namespace)
+        else:
+            for base in bases:
+                if DEFERRED_ATTR in base.__dict__:
+                    _build_deferred(base)
+            new_cls = super().__new__(cls, name, bases, namespace, **kwargs)
+            bind_aliases(new_cls, namespace, ALIASES)
+            compile_serializers(new_cls, namespace)
+            compile_fields(new_cls)
+            # resolve the v2 FieldInfo surface once, at class creation
+            _get_field_info_map(new_cls)
+        if started:
+            _profiling.stop(started, _profiling.class_owner(namespace), "class")
+        return new_cls
+
+    def __getattr__(cls, name: str) -> Any:
+        # only called when the normal lookup fails: `name` may be defined in the
+        # namespace of a deferred model
+        if DEFERRED_ATTR in cls.__dict__:
+            with _BUILD_LOCK:  # see _DeferredAttribute
+                if cls not in _BUILDING:
+                    _build_deferred(cls)
+                    return getattr(cls, name)
+        raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
 
     if sys.version_info < (3, 9):
 
         @property
         def model_fields(cls) -> dict[str, Any]:
-            return FieldInfoMap(cls.__fields__)
+            return _get_field_info_map(cls)
+
+
+def _new_deferred(
+    meta: type, name: str, bases: tuple[type, ...], namespace: dict
+) -> type:
+    """Create the placeholder class of a deferred model (see `_build_deferred`)."""
+    stub_namespace = {
+        k: namespace[k]
+        for k in ("__module__", "__qualname__", "__doc__", "__annotations__")
+        if k in namespace
+    }
+    # methods using super() or __class__ must refer to the class user code sees
+    if "__classcell__" in namespace:
+        stub_namespace["__classcell__"] = namespace.pop("__classcell__")
+    stub_namespace["__slots__"] = ()
+    stub_namespace.update(_DEFERRED_ATTRIBUTES)
+    stub_namespace[DEFERRED_ATTR] = (namespace, frozenset(stub_namespace))
+    return ABCMeta.__new__(meta, name, bases, stub_namespace)
+
+
+def _get_field_info_map(cls: type[Model]) -> FieldInfoMap:
+    """Return the FieldInfoMap cached on `cls`, (re)building it if stale."""
+    fields = cls.__fields__
+    # subclasses get their own __fields__, so an inherited map is always stale
+    cached = getattr(cls, FIELD_INFO_MAP_ATTR, None)
+    if cached is None or cached._fields is not fields:
+        cached = FieldInfoMap(fields)
+        setattr(cls, FIELD_INFO_MAP_ATTR, cached)
+    return cached
+
+
+def _clear_field_info_map(cls: type) -> None:
+    if FIELD_INFO_MAP_ATTR in cls.__dict__:
+        delattr(cls, FIELD_INFO_MAP_ATTR)
 
 
 class PydanticCompatMixin(metaclass=_MixinMeta):
@@ -66,34 +413,98 @@ class PydanticCompatMixin(metaclass=_MixinMeta):
         sup = super()
         if hasattr(sup, "__try_update_forward_refs__"):
             sup.__try_update_forward_refs__(**localns)
+        _clear_field_info_map(cls)
+        _construct.clear_plan(cls)
+        update_json_mode(cls)
 
-    def __init_subclass__(cls, *args: Any, **kwargs: Any) -> None:
-        check_mixin_order(cls, PydanticCompatMixin, main.BaseModel)
-
-    def model_dump(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.dict(*args, **kwargs)
+    @classmethod
+    def update_forward_refs(cls, **localns: Any) -> None:
+        super().update_forward_refs(**localns)
+        _clear_field_info_map(cls)
+        _construct.clear_plan(cls)
+        update_json_mode(cls)
+        _schema_cache.clear_memory_cache(cls)
+
+    # v2 names with the same semantics are bound to the v1 methods themselves
+    # (see ALIASES)
+    model_dump = main.BaseModel.dict
+    model_validate = main.BaseModel.__dict__["validate"]
+    model_construct = main.BaseModel.__dict__["construct"]
+
+    def model_copy(
+        self: Model,
+        *,
+        update: Mapping[str, Any] | None = None,
+        deep: bool | Literal["cow"] = False,
+        include: Any = None,
+        exclude: Any = None,
+    ) -> Any:
+        """Return a copy of the model.
+
+        With `deep="cow"` (copy-on-write), nothing is copied but the models (and
+        lists, tuples, dicts) on the paths changed by `update`, whose keys may be
+        dotted paths into nested values (e.g. `{"a.b.name": "x"}`).  Everything
+        else is shared with the original.  A frozen model without `update` is
+        returned as is.  `include` and `exclude` are those of v1 `copy()`.
+        """
+        if deep != "cow":
+            return self.copy(include=include, exclude=exclude, update=update, deep=deep)
+        if include is not None or exclude is not None:
+            raise TypeError("deep='cow' does not support include or exclude")
+        if not update and getattr(self.__config__, "frozen", False):
+            return self
+        return copy_on_write(self, dict(update or {}), _copy_model)
+
+    def __reduce_ex__(self: Model, protocol: Any) -> Any:
+        # smaller and faster to pickle than BaseModel's state dict, e.g. for
+        # results sent back from worker processes (see parallel_validate)
+        if self.__private_attributes__:
+            return super().__reduce_ex__(protocol)
+        return _unpickle, (type(self), self.__dict__, self.__fields_set__)
 
     def model_dump_json(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.json(*args, **kwargs)
-
-    def model_copy(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.copy(*args, **kwargs)
+        backend = get_backend(self.__config__, "json_dumps")
+        if (
+            backend is None
+            or backend.name == "json"
+            or args
+            or not kwargs.keys() <= _ITER_KWARGS
+        ):
+            return self.json(*args, **kwargs)
+        # same as BaseModel.json(), but with the backend's dumps (and through
+        # dict(), where a model serializer is)
+        data = self.dict(**kwargs)
+        if self.__custom_root_type__:
+            data = data[ROOT_KEY]
+        try:
+            return backend.dumps(data, self.__json_encoder__)
+        except backend.encode_errors:  # e.g. integers that don't fit in 64 bits
+            return self.json(*args, **kwargs)
 
     @classmethod
-    def model_json_schema(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.schema(*args, **kwargs)
+    def schema(
+        cls, by_alias: bool = True, ref_template: str = default_ref_template
+    ) -> dict[str, Any]:
+        kwargs = {"by_alias": by_alias, "ref_template": ref_template}
+        sup = super()
+        return _schema_cache.cached_schema(
+            cls, lambda: sup.schema(**kwargs), kwargs  # type: ignore [attr-defined]
+        )
 
-    @classmethod
-    def model_validate(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.validate(*args, **kwargs)
-
-    @classmethod
-    def model_construct(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.construct(*args, **kwargs)
+    model_json_schema = schema
 
     @classmethod
     def model_validate_json(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.parse_raw(*args, **kwargs)
+        backend = get_backend(cls.__config__, "json_loads")
+        if backend is None or len(args) != 1 or kwargs:
+            return cls.parse_raw(*args, **kwargs)
+        # same as BaseModel.parse_raw(), but with the backend's loads, which
+        # accepts bytes (and memoryview) without decoding them to str first
+        try:
+            obj = backend.loads(args[0])
+        except backend.decode_errors as e:
+            raise ValidationError([ErrorWrapper(e, loc=ROOT_KEY)], cls) from e
+        return cls.parse_obj(obj)
 
     @classmethod
     def model_rebuild(cls: type[Model], force: bool = True, **kwargs: Any) -> None:
@@ -103,89 +514,161 @@ class PydanticCompatMixin(metaclass=_MixinMeta):
         # differences in the behavior of patching class properties in python<3.9
         @property
         def model_fields(cls: type[Model]) -> Mapping[str, Any]:
-            return FieldInfoMap(cls.__fields__)
+            return _get_field_info_map(cls)
 
     else:
 
         @classmethod  # type: ignore [misc]
         @property
         def model_fields(cls: type[Model]) -> Mapping[str, Any]:
-            return FieldInfoMap(cls.__fields__)
-
-    @property
-    def model_fields_set(self: Model) -> set[str]:
-        return self.__fields_set__
-
-    @classmethod  # type: ignore [misc]
-    @property
-    def model_config(cls: type[Model]) -> Mapping[str, Any]:
-        return DictLike(cls.__config__)
-
-
-class FieldInfoLike:
-    """Wrapper to convera pydantic v1 ModelField to v2 FieldInfo."""
-
-    def __init__(self, model_field: ModelField) -> None:
-        self._model_field = model_field
-
-    @property
-    def annotation(self) -> Any:
-        return self._model_field.outer_type_
+            return _get_field_info_map(cls)
 
-    @property
-    def frozen(self) -> bool:
-        return not self._model_field.field_info.allow_mutation
-
-    @property
-    def json_schema_extra(self) -> dict:
-        return self._model_field.field_info.extra  # type: ignore [no-any-return]
-
-    def __getattr__(self, key: str) -> Any:
-        return getattr(self._model_field, key)
-
-    def __repr__(self) -> str:
-        return repr(self._model_field)
+    @classmethod
+    def model_validate_many(
+        cls: type[Model],
+        objs: Iterable[Any],
+        *,
+        errors: Literal["raise", "collect"] = "raise",
+    ) -> Any:
+        """Validate many objects, returning a list of model instances.
+
+        With `errors='raise'`, a ValidationError is raised for the first invalid
+        item (error locations start with the item index).  With
+        `errors='collect'`, a `(models, errors)` tuple is returned instead, where
+        `errors` is a list of `(index, ValidationError)` for the invalid items.
+        """
+        validate = cls.validate
+        if errors == "collect":
+            return validate_each(validate, objs, ValidationError)
+        results: list[Any] = []
+        append = results.append
+        try:
+            for obj in objs:
+                append(validate(obj))
+        except ValidationError as e:
+            raise ValidationError([ErrorWrapper(e, loc=len(results))], cls) from None
+        return results
 
+    @classmethod
+    async def amodel_validate_many(
+        cls: type[Model],
+        objs: Iterable[Any],
+        *,
+        chunk: int | None = None,
+        errors: Literal["raise", "collect"] = "raise",
+        executor: Executor | None = None,
+    ) -> Any:
+        """Async `model_validate_many`, which lets the event loop run other tasks
+        between chunks of `chunk` objects (by default, chunks sized to take about
+        0.5 ms), or validates the chunks in `executor` (e.g. a ThreadPoolExecutor).
+        """
+        from pydantic_compat import _async  # imports asyncio
+
+        return await _async.validate_many(cls, objs, chunk, errors, executor)
 
-class FieldInfoMap(Mapping[str, FieldInfoLike]):
-    """Adaptor between v1 __fields__ and v2 model_field."""
+    @classmethod
+    async def amodel_dump_many(
+        cls,
+        objs: Iterable[Any],
+        *,
+        chunk: int | None = None,
+        output: Literal["python", "json"] = "python",
+        executor: Executor | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Dump `objs` with `model_dump(**kwargs)` (or `model_dump_json`, with
+        `output="json"`), as `amodel_validate_many` validates them.
+        """
+        from pydantic_compat import _async  # imports asyncio
+
+        return await _async.dump_many(objs, chunk, output, executor, kwargs)
 
-    def __init__(self, fields: dict[str, ModelField]) -> None:
-        self._fields = fields
+    @classmethod
+    def model_construct_recursive(
+        cls: type[Model], _fields_set: set[str] | None = None, **values: Any
+    ) -> Any:
+        """Create a model from trusted data without validation, like
+        `model_construct`, but also construct the nested models given as dicts
+        (in fields, `Optional`s, lists, tuples and dicts of models).
+
+        The nested models and containers to construct are found from the field
+        annotations once per class.  Unions of several model types are left as
+        they are, since telling them apart would require validation.
+        """
+        return _construct.construct_recursive(cls, values, _fields_set)
 
-    def get(self, key: str, default: Any = None) -> Any:
-        return self[key] if key in self._fields else default
+    @classmethod
+    def iter_validate_jsonl(
+        cls: type[Model], source: Iterable[bytes | str]
+    ) -> Iterator[Any]:
+        """Lazily validate each line of JSON Lines data into a model instance.
 
-    def __getitem__(self, key: str) -> FieldInfoLike:
-        return FieldInfoLike(self._fields[key])
+        `source` may be a file (binary or text) or any iterable of bytes/str chunks.
+        """
+        return map(cls.model_validate_json, iter_jsonl(source))
 
-    def __setitem__(self, key: str, value: Any) -> None:
-        self._fields[key] = value
+    @classmethod
+    def model_validate_file(cls, path: str | os.PathLike) -> Any:
+        """Validate the JSON document in file `path` into a model instance.
 
-    def __iter__(self) -> Iterator[str]:
-        yield from self._fields
+        The file is memory-mapped and parsed incrementally: nested models are
+        validated as their objects end, so the dicts of the whole document never
+        exist at once (see `json_file`).
+        """
+        return validate_file(cls, path)
 
-    def __len__(self) -> int:
-        return len(self._fields)
+    @classmethod
+    def dump_jsonl(cls, objs: Iterable[Any], fp: IO, **kwargs: Any) -> None:
+        """Write model instances to `fp` as JSON Lines.
 
+        Keyword arguments are passed to `model_dump_json`.
+        """
+        write_jsonl(fp, (obj.model_dump_json(**kwargs).encode() for obj in objs))
 
-class DictLike(Mapping[str, Any]):
-    """Provide dict-like interface to an object."""
+    @property
+    def model_fields_set(self: Model) -> set[str]:
+        return self.__fields_set__
 
-    def __init__(self, obj: Any) -> None:
-        self._obj = obj
+    @classmethod  # type: ignore [misc]
+    @property
+    def model_config(cls: type[Model]) -> Mapping[str, Any]:
+        # subclasses get their own __config__, so an inherited map is always stale
+        cached = getattr(cls, CONFIG_MAP_ATTR, None)
+        if (
+            cached is None
+            or cached._config is not cls.__config__
+            or cached._version != _config_version
+        ):
+            cached = ConfigMap(cls.__config__)
+            setattr(cls, CONFIG_MAP_ATTR, cached)
+        return cached
+
+
+class ConfigMap(Dict[str, Any]):
+    """Snapshot of a v1 Config class (including inherited values) under v2 names.
+
+    Values may also be looked up by their v1 name.  Writes go through to the
+    Config class.  The snapshot is taken again after the Config class of any
+    model is mutated (e.g. `Model.__config__.frozen = True`, or via this mapping).
+    """
+
+    def __init__(self, config: type) -> None:
+        super().__init__(
+            (V2_RENAMED_CONFIG_KEYS.get(k, k), getattr(config, k))
+            for k in dir(config)
+            if not k.startswith("_") and k not in _CONFIG_METHODS
+        )
+        self._config = config
+        self._version = _config_version
+
+    def __missing__(self, key: str) -> Any:
+        if key in V2_RENAMED_CONFIG_KEYS:
+            return self[V2_RENAMED_CONFIG_KEYS[key]]
+        raise KeyError(key)
 
     def get(self, key: str, default: Any = None) -> Any:
-        return getattr(self._obj, key, default)
-
-    def __getitem__(self, key: str) -> Any:
-        return getattr(self._obj, key)
+        return super().get(V2_RENAMED_CONFIG_KEYS.get(key, key), default)
 
     def __setitem__(self, key: str, value: Any) -> None:
-        setattr(self._obj, key, value)
-
-    def __iter__(self) -> Iterator[str]:
-        yield from self._obj.__dict__
-
-    def __len__(self) -> int:
-        return len(self._obj.__dict__)
+        setattr(self._config, REVERSE_CONFIG_NAME_MAP.get(key, key), value)
+        super().__setitem__(V2_RENAMED_CONFIG_KEYS.get(key, key), value)
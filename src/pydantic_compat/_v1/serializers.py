@@ -0,0 +1,404 @@
+"""Adaptors of the v2 `field_serializer` and `model_serializer` decorators.
+
+The decorators only mark the functions.  When a model is created, the
+serializers of the class and its bases are compiled into a `DumpPlan`, and
+`_iter` (used by `dict()` and `json()`) is replaced on that class only, so that
+each serializer is called directly for its field (unlike `json_encoders`, which
+are looked up by type for every value, and only in `json()`).  Models without
+serializers are left untouched.
+
+In `json()` and `model_dump_json()`, the serialization mode is "json" (see
+`when_used`); it is kept in a ContextVar since nested models are dumped with
+`dict()`.  Those methods are wrapped to set it only on models with serializers,
+or with fields holding such models.
+"""
+
+from __future__ import annotations
+
+import inspect
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple
+
+if TYPE_CHECKING:  # mypy runs with the v2 stubs, which have v1 as pydantic.v1
+    from typing import Literal
+
+    from pydantic.v1 import BaseModel, ConfigError
+    from pydantic.v1.utils import ROOT_KEY
+
+    WhenUsed = Literal["always", "unless-none", "json", "json-unless-none"]
+else:
+    from pydantic import BaseModel, ConfigError
+    from pydantic.utils import ROOT_KEY
+
+# set on the decorated functions: a SerializerSpec
+SERIALIZER_ATTR = "__compat_serializer__"
+# {attribute name: SerializerSpec} of a model and its bases
+SERIALIZERS_ATTR = "__compat_serializers__"
+DUMP_PLAN_ATTR = "__compat_dump_plan__"
+# whether json() and model_dump_json() of a model set the "json" mode
+JSON_MODE_ATTR = "__compat_json_mode__"
+
+_json_mode: ContextVar[bool] = ContextVar("pydantic_compat_json_mode", default=False)
+
+
+class SerializerSpec(NamedTuple):
+    fields: tuple[str, ...]  # empty for a model serializer
+    mode: str
+    when_used: str
+    check_fields: bool | None
+
+
+class SerializationInfo:
+    """The `info` argument of serializers, as in v2 (`FieldSerializationInfo`)."""
+
+    __slots__ = (
+        "by_alias",
+        "exclude_defaults",
+        "exclude_none",
+        "exclude_unset",
+        "field_name",
+        "mode",
+    )
+
+    def __init__(
+        self,
+        mode: str,
+        field_name: str | None,
+        by_alias: bool,
+        exclude_unset: bool,
+        exclude_defaults: bool,
+        exclude_none: bool,
+    ) -> None:
+        self.mode = mode
+        self.field_name = field_name
+        self.by_alias = by_alias
+        self.exclude_unset = exclude_unset
+        self.exclude_defaults = exclude_defaults
+        self.exclude_none = exclude_none
+
+    def mode_is_json(self) -> bool:
+        return self.mode == "json"
+
+
+# V2 signature
+def field_serializer(
+    field: str,
+    *fields: str,
+    mode: Literal["plain", "wrap"] = "plain",
+    return_type: Any = None,
+    when_used: WhenUsed = "always",
+    check_fields: bool | None = None,
+) -> Callable[[Any], Any]:
+    """Adaptor of v2.field_serializer, for `model_dump()` and `model_dump_json()`
+    (and v1 `dict()` and `json()`)."""
+    spec = SerializerSpec((field, *fields), mode, when_used, check_fields)
+
+    def dec(func: Any) -> Any:
+        setattr(getattr(func, "__func__", func), SERIALIZER_ATTR, spec)
+        return func
+
+    return dec
+
+
+# V2 signature
+def model_serializer(
+    f: Callable | None = None,
+    *,
+    mode: Literal["plain", "wrap"] = "plain",
+    when_used: WhenUsed = "always",
+    return_type: Any = None,
+) -> Any:
+    """Adaptor of v2.model_serializer, for `model_dump()` and `model_dump_json()`
+    (and v1 `dict()` and `json()`)."""
+    spec = SerializerSpec((), mode, when_used, None)
+
+    def dec(func: Any) -> Any:
+        setattr(getattr(func, "__func__", func), SERIALIZER_ATTR, spec)
+        return func
+
+    return dec(f) if f is not None else dec
+
+
+class DumpPlan(NamedTuple):
+    # ((field name, alias, serialize(model, field name, value, dumped value,
+    #   dump kwargs)), ...)
+    fields: tuple[tuple[str, str, Callable[..., Any]], ...]
+    # serialize(model, dump, dump kwargs) or None
+    model: Callable[..., Any] | None
+
+
+def compile_serializers(cls: Any, namespace: dict) -> None:
+    """Compile the serializers of model `cls`, created from `namespace`."""
+    serializers: dict[str, tuple[SerializerSpec, Any]] = {}
+    for base in reversed(cls.__mro__[1:]):
+        serializers.update(base.__dict__.get(SERIALIZERS_ATTR, ()))
+    for name, value in namespace.items():
+        spec = getattr(getattr(value, "__func__", value), SERIALIZER_ATTR, None)
+        if spec is not None:
+            serializers[name] = (spec, value)
+        elif name in serializers:
+            # as in v2, an override without the decorator is still a serializer
+            if callable(getattr(value, "__func__", value)):
+                serializers[name] = (serializers[name][0], value)
+            else:
+                del serializers[name]
+    if not serializers:
+        if any(DUMP_PLAN_ATTR in b.__dict__ for b in cls.__mro__[1:]):
+            # all the serializers of the bases were overridden by non-functions
+            setattr(cls, DUMP_PLAN_ATTR, None)
+            cls._iter = BaseModel._iter
+            cls.dict = cls.model_dump = BaseModel.dict
+            cls.json = BaseModel.json
+        _set_json_mode(cls, False)
+        return
+
+    setattr(cls, SERIALIZERS_ATTR, serializers)
+    fields: dict[str, Callable[..., Any]] = {}
+    model = None
+    for name, (spec, value) in serializers.items():
+        serialize = _adapt(spec, value, bool(spec.fields))
+        if not spec.fields:
+            model = serialize
+            continue
+        for field in spec.fields:
+            if field == "*":
+                fields.update(dict.fromkeys(cls.__fields__, serialize))
+            elif field in cls.__fields__:
+                fields[field] = serialize
+            elif spec.check_fields is not False:
+                raise ConfigError(
+                    f"Serializer {name!r} defined with field {field!r}, which is not "
+                    f"a field of {cls.__name__} (use check_fields=False if you're "
+                    "inheriting from the model and intended this)"
+                )
+    plan = DumpPlan(
+        tuple((f, cls.__fields__[f].alias, ser) for f, ser in fields.items()), model
+    )
+    setattr(cls, DUMP_PLAN_ATTR, plan)
+    if fields:
+        cls._iter = _make_iter(plan)
+    if model is not None:
+        # model_dump too, since it is bound to the v1 method
+        cls.dict = cls.model_dump = _make_dict(plan)
+        cls.json = _make_json()
+    _set_json_mode(cls, True)
+
+
+def _set_json_mode(cls: Any, has_serializers: bool) -> None:
+    fields = cls.__fields__.values()
+    enabled = has_serializers or _holds_json_mode_models(cls, fields)
+    setattr(cls, JSON_MODE_ATTR, enabled)
+    for name in ("json", "model_dump_json"):
+        method: Any = getattr(cls, name, None)
+        wrapped = getattr(method, JSON_MODE_ATTR, False)
+        if enabled and method is not None and not wrapped:
+            setattr(cls, name, json_mode(method))
+        elif wrapped and not enabled:
+            setattr(cls, name, method.__wrapped__)
+
+
+def _holds_json_mode_models(cls: Any, fields: Iterable[Any]) -> bool:
+    # whether some of `fields` (or their items) are models setting the json mode
+    for field in fields:
+        type_ = field.type_
+        if isinstance(type_, type) and type_ is not cls and _json_mode_of(type_):
+            return True
+        if field.sub_fields and _holds_json_mode_models(cls, field.sub_fields):
+            return True
+    return False
+
+
+def _json_mode_of(type_: type) -> bool:
+    # not getattr(), which would build a deferred model
+    enabled = type_.__dict__.get(JSON_MODE_ATTR)
+    if enabled is not None:
+        return bool(enabled)
+    # a model with the mixin that isn't built yet may have serializers
+    return any(JSON_MODE_ATTR in c.__dict__ for c in type_.__mro__)
+
+
+def update_json_mode(cls: Any) -> None:
+    """Update the json mode of model `cls` after its forward refs are resolved."""
+    _set_json_mode(cls, bool(getattr(cls, DUMP_PLAN_ATTR, None)))
+
+
+def _adapt(spec: SerializerSpec, value: Any, is_field: bool) -> Callable[..., Any]:
+    """Return `serialize(model, name, value, dumped, kwargs)` (for fields) or
+    `serialize(model, dump, kwargs)` (for models), calling the user's function
+    with the arguments its signature asks for, as v2 does."""
+    func = getattr(value, "__func__", value)
+    params = [
+        p
+        for p in inspect.signature(func).parameters.values()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        and p.default is p.empty
+    ]
+    is_method = not isinstance(value, staticmethod) and bool(params)
+    if is_method and params[0].name != "self" and is_field:
+        is_method = False  # e.g. `def ser(value, info)`, as in v2
+    n_args = len(params) - is_method
+    wrap = spec.mode == "wrap"
+    # the value (for fields), the handler (for wrap), and the info
+    with_info = n_args > int(is_field) + wrap
+    json_only = spec.when_used in ("json", "json-unless-none")
+    unless_none = spec.when_used in ("unless-none", "json-unless-none")
+    simple = not (wrap or with_info)
+
+    if is_field:
+
+        def serialize_field(
+            model: Any, name: str, value: Any, dumped: Any, kwargs: dict
+        ) -> Any:
+            if (unless_none and value is None) or (json_only and not _json_mode.get()):
+                return dumped
+            if simple:
+                return func(model, value) if is_method else func(value)
+            args: list[Any] = [model] if is_method else []
+            args.append(value)
+            if wrap:
+                args.append(_field_handler(model, value, dumped, kwargs))
+            if with_info:
+                args.append(_info(_json_mode.get(), name, kwargs))
+            return func(*args)
+
+        return serialize_field
+
+    def serialize_model(model: Any, dump: Callable[[], Any], kwargs: dict) -> Any:
+        json_mode = _json_mode.get()
+        if json_only and not json_mode:
+            return dump()
+        args: list[Any] = [model]
+        if wrap:
+            args.append(lambda m: dump() if m is model else m.dict(**kwargs))
+        if with_info:
+            args.append(_info(json_mode, None, kwargs))
+        return func(*args)
+
+    return serialize_model
+
+
+def _field_handler(model: Any, value: Any, dumped: Any, kwargs: dict) -> Callable:
+    def handler(v: Any) -> Any:
+        if v is value:
+            return dumped
+        return model._get_value(v, to_dict=True, include=None, exclude=None, **kwargs)
+
+    return handler
+
+
+def _info(json_mode: bool, name: str | None, kwargs: dict) -> SerializationInfo:
+    return SerializationInfo(
+        "json" if json_mode else "python",
+        name,
+        kwargs["by_alias"],
+        kwargs["exclude_unset"],
+        kwargs["exclude_defaults"],
+        kwargs["exclude_none"],
+    )
+
+
+def _make_iter(plan: DumpPlan) -> Callable[..., Iterable[tuple[str, Any]]]:
+    fields = plan.fields
+
+    def _iter(
+        self: Any,
+        to_dict: bool = False,
+        by_alias: bool = False,
+        include: Any = None,
+        exclude: Any = None,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> Iterable[tuple[str, Any]]:
+        items = BaseModel._iter(
+            self,
+            to_dict,
+            by_alias,
+            include,
+            exclude,
+            exclude_unset,
+            exclude_defaults,
+            exclude_none,
+        )
+        if not to_dict:  # e.g. copy()
+            return items
+        # callers make a dict of the items anyway: only the values of the fields
+        # with a serializer are replaced in it
+        data = dict(items)
+        kwargs = {
+            "by_alias": by_alias,
+            "exclude_unset": exclude_unset,
+            "exclude_defaults": exclude_defaults,
+            "exclude_none": exclude_none,
+        }
+        values = self.__dict__
+        for name, alias, serialize in fields:
+            key = alias if by_alias else name
+            if key in data:
+                data[key] = serialize(self, name, values[name], data[key], kwargs)
+        return data.items()
+
+    return _iter
+
+
+def _make_dict(plan: DumpPlan) -> Callable[..., Any]:
+    serialize = plan.model
+
+    def dict(self: Any, **kwargs: Any) -> Any:  # noqa: A001 (replaces BaseModel.dict)
+        serialize_kwargs = {
+            "by_alias": kwargs.get("by_alias", False),
+            "exclude_unset": kwargs.get("exclude_unset", False),
+            "exclude_defaults": kwargs.get("exclude_defaults", False),
+            "exclude_none": kwargs.get("exclude_none", False),
+        }
+        return serialize(  # type: ignore [misc]
+            self, lambda: BaseModel.dict(self, **kwargs), serialize_kwargs
+        )
+
+    return dict
+
+
+def _make_json() -> Callable[..., str]:
+    def json(self: Any, *, encoder: Any = None, **kwargs: Any) -> str:
+        # BaseModel.json() doesn't call dict(), where the model serializer is
+        # (the json mode is set by the json_mode wrapper)
+        dumps_kwargs = {k: kwargs.pop(k) for k in list(kwargs) if k not in _DICT_KWARGS}
+        kwargs.pop("models_as_dict", None)
+        data = self.dict(**kwargs)
+        if self.__custom_root_type__ and isinstance(data, dict) and ROOT_KEY in data:
+            # as BaseModel.json(), unless the serializer returned something else
+            data = data[ROOT_KEY]
+        encoder = encoder or self.__json_encoder__
+        result: str = self.__config__.json_dumps(data, default=encoder, **dumps_kwargs)
+        return result
+
+    return json
+
+
+_DICT_KWARGS = {
+    "include",
+    "exclude",
+    "by_alias",
+    "skip_defaults",
+    "exclude_unset",
+    "exclude_defaults",
+    "exclude_none",
+    "models_as_dict",
+}
+
+
+def json_mode(json: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap `json` (a `json()` method) to dump in the "json" serialization mode."""
+
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        token = _json_mode.set(True)
+        try:
+            return json(self, *args, **kwargs)
+        finally:
+            _json_mode.reset(token)
+
+    wrapper.__name__ = wrapper.__qualname__ = json.__name__
+    wrapper.__doc__ = json.__doc__
+    wrapper.__wrapped__ = json  # type: ignore [attr-defined]
+    setattr(wrapper, JSON_MODE_ATTR, True)
+    return wrapper
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from pydantic import ValidationError, create_model
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.main import validate_model
+from pydantic.typing import display_as_type
+from pydantic.utils import ROOT_KEY
+
+from pydantic_compat._shared import TYPE_ADAPTER_CACHE_SIZE, TypeKey
+
+from .json_backend import get_backend
+
+if TYPE_CHECKING:
+    from typing import Literal
+
+T = TypeVar("T")
+
+
+# the root models are v1 models: typed as Any for the v2 stubs used by mypy
+def _create_root_model(type_: Any) -> type[Any]:
+    return create_model(f"TypeAdapter[{display_as_type(type_)}]", __root__=(type_, ...))
+
+
+@lru_cache(maxsize=TYPE_ADAPTER_CACHE_SIZE)
+def _cached_root_model(key: TypeKey) -> type[Any]:
+    return _create_root_model(key.type)
+
+
+def _get_root_model(type_: Any) -> type[Any]:
+    try:
+        return _cached_root_model(TypeKey(type_))
+    except TypeError:  # unhashable type
+        return _create_root_model(type_)
+
+
+class TypeAdapter(Generic[T]):
+    """Adaptor providing the v2 TypeAdapter API on pydantic v1.
+
+    The `__root__` model used for validation is built once per type, and kept in a
+    process-wide LRU cache, so creating `TypeAdapter(T)` repeatedly is cheap.
+    """
+
+    __slots__ = ("_model", "_type")
+
+    def __init__(self, type_: Any) -> None:
+        self._type = type_
+        self._model = _get_root_model(type_)
+
+    def __repr__(self) -> str:
+        return f"TypeAdapter({display_as_type(self._type)})"
+
+    def validate_python(self, obj: Any) -> T:
+        values, _, error = validate_model(self._model, {ROOT_KEY: obj})
+        if error:
+            raise error
+        return values[ROOT_KEY]  # type: ignore [no-any-return]
+
+    def validate_json(self, data: str | bytes | bytearray) -> T:
+        config = self._model.__config__
+        backend = get_backend(config, "json_loads")
+        loads = backend.loads if backend else config.json_loads
+        errors = backend.decode_errors if backend else (ValueError, TypeError)
+        try:
+            obj = loads(data)
+        except errors as e:
+            raise ValidationError([ErrorWrapper(e, loc=ROOT_KEY)], self._model) from e
+        return self.validate_python(obj)
+
+    def dump_python(
+        self, instance: T, *, mode: Literal["json", "python"] = "python", **kwargs: Any
+    ) -> Any:
+        if mode == "json":
+            return self._model.__config__.json_loads(self.dump_json(instance, **kwargs))
+        return self._model.construct(__root__=instance).dict(**kwargs)[ROOT_KEY]
+
+    def dump_json(self, instance: T, **kwargs: Any) -> bytes:
+        dumped: str = self._model.construct(__root__=instance).json(**kwargs)
+        return dumped.encode()
+
+    def json_schema(self, *, by_alias: bool = True, **kwargs: Any) -> dict[str, Any]:
+        schema: dict[str, Any] = self._model.schema(by_alias=by_alias, **kwargs).copy()
+        schema.pop("title", None)
+        return schema
@@ -6,3 +6,4 @@ if int(pydantic.version.VERSION[0]) <= 1:  # pragma: no cover
 from .decorators import root_validator as root_validator
 from .decorators import validator as validator
 from .mixin import PydanticCompatMixin as PydanticCompatMixin
+from .type_adapter import TypeAdapter as TypeAdapter
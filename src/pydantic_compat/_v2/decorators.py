@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-import warnings
 from typing import Any, Callable
 
 from pydantic.deprecated import class_validators
 
+from pydantic_compat import _profiling
+from pydantic_compat._shared import without_deprecations
+
+# the deprecated v2 decorators, without their DeprecationWarning (with no global
+# state change, unlike warnings.catch_warnings(), so that it is thread-safe)
+_validator = without_deprecations(class_validators.validator)
+_root_validator = without_deprecations(class_validators.root_validator)
+
 
 # V1 signature
 # def validator(
@@ -21,9 +28,11 @@ def validator(
     _field: str, *fields: str, **kwargs: Any
 ) -> Callable[[Callable], Callable]:
     """Adaptor from v1.validator -> v2.field_validator."""
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", DeprecationWarning)
-        return class_validators.validator(_field, *fields, **kwargs)
+    started = _profiling.start() if _profiling.ENABLED else None
+    deco: Callable[[Callable], Callable] = _validator(_field, *fields, **kwargs)
+    if started:
+        _profiling.stop(started, _profiling.caller_owner(), "validator")
+    return deco
 
 
 # V1 signature
@@ -57,13 +66,14 @@ def root_validator(
             "instead. (It works for both versions)."
         )
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", DeprecationWarning)
-
-        # def model_validator( *, mode: Literal['wrap', 'before', 'after']) -> Any:
-        return class_validators.root_validator(  # type: ignore [call-overload]
-            *_args,
-            pre=pre,
-            skip_on_failure=bool(skip_on_failure),
-            allow_reuse=allow_reuse,
-        )
+    started = _profiling.start() if _profiling.ENABLED else None
+    # def model_validator( *, mode: Literal['wrap', 'before', 'after']) -> Any:
+    deco = _root_validator(
+        *_args,
+        pre=pre,
+        skip_on_failure=bool(skip_on_failure),
+        allow_reuse=allow_reuse,
+    )
+    if started:
+        _profiling.stop(started, _profiling.caller_owner(), "validator")
+    return deco
@@ -1,13 +1,43 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, cast
+import json
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    cast,
+)
+from weakref import WeakKeyDictionary
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from pydantic._internal import _model_construction
+from pydantic.deprecated import parse as deprecated_parse
+from pydantic_core import PydanticCustomError
 
-from pydantic_compat._shared import V2_RENAMED_CONFIG_KEYS, check_mixin_order
+from pydantic_compat import _construct, _profiling, _schema_cache, _shared
+from pydantic_compat._shared import (
+    V2_RENAMED_CONFIG_KEYS,
+    bind_aliases,
+    check_mixin_order,
+    copy_on_write,
+    iter_jsonl,
+    validate_each,
+    without_deprecations,
+    write_jsonl,
+)
 
 if TYPE_CHECKING:
+    import os
+    from concurrent.futures import Executor
+    from typing import Literal
+
     from pydantic import ConfigDict
     from typing_extensions import Protocol
 
@@ -30,67 +60,296 @@ if TYPE_CHECKING:
         model_fields: ClassVar[dict]
         model_fields_set: ClassVar[set[str]]
         model_config: ClassVar[ConfigDict]
+        __pydantic_complete__: ClassVar[bool]
+        __pydantic_extra__: dict[str, Any] | None
+        __pydantic_private__: dict[str, Any] | None
+        __pydantic_fields_set__: set[str]
     # fmt:on
 
 
+LIST_ADAPTER_ATTR = "__compat_list_adapter__"
+# {v1 name: v2 name} of the mixin methods that are the v2 method itself
+ALIASES = {
+    "dict": "model_dump",
+    "json": "model_dump_json",
+    "copy": "model_copy",
+    "schema": "model_json_schema",
+    "validate": "model_validate",
+    "construct": "model_construct",
+    "parse_obj": "model_validate",
+}
+
+
+# converted `class Config`s, so that a Config shared by several models is
+# only converted once (the result is copied for each model)
+_CONVERTED_CONFIGS: MutableMapping[type, dict] = WeakKeyDictionary()
+
+
 def _convert_config(config: type) -> ConfigDict:
-    config_dict = {k: getattr(config, k) for k in dir(config) if not k.startswith("__")}
+    config_dict = _CONVERTED_CONFIGS.get(config)
+    if config_dict is None:
+        # the same names dir() would find, without building a sorted list
+        names = {
+            k: None
+            for c in reversed(config.__mro__[:-1])
+            for k in vars(c)
+            if not k.startswith("__")
+        }
+        config_dict = {k: getattr(config, k) for k in names}
+
+        deprecated_renamed_keys = V2_RENAMED_CONFIG_KEYS.keys() & config_dict.keys()
+        for k in sorted(deprecated_renamed_keys):
+            config_dict[V2_RENAMED_CONFIG_KEYS[k]] = config_dict.pop(k)
+
+        # leave these here for now to warn about lost functionality
+        # deprecated_removed_keys = V2_REMOVED_CONFIG_KEYS & config_dict.keys()
+        # for k in sorted(deprecated_removed_keys):
+        #     config_dict.pop(k)
+        _CONVERTED_CONFIGS[config] = config_dict
+
+    return cast("ConfigDict", dict(config_dict))
+
+
+def _sets_defer_build(bases: tuple[type, ...], namespace: dict) -> bool:
+    """Whether the model config (or an inherited one) sets `defer_build`."""
+    if "defer_build" in namespace.get("model_config", {}):
+        return True
+    return any("defer_build" in getattr(b, "model_config", {}) for b in bases)
 
-    deprecated_renamed_keys = V2_RENAMED_CONFIG_KEYS.keys() & config_dict.keys()
-    for k in sorted(deprecated_renamed_keys):
-        config_dict[V2_RENAMED_CONFIG_KEYS[k]] = config_dict.pop(k)
 
-    # leave these here for now to warn about lost functionality
-    # deprecated_removed_keys = V2_REMOVED_CONFIG_KEYS & config_dict.keys()
-    # for k in sorted(deprecated_removed_keys):
-    #     config_dict.pop(k)
+def _copy_model(model: BaseModel, update: dict[str, Any]) -> BaseModel:
+    return BaseModel.model_copy(model, update=update)
 
-    return cast("ConfigDict", config_dict)
+
+def _unpickle(cls: Any, values: dict[str, Any], fields_set: set[str]) -> Any:
+    m = cls.__new__(cls)
+    object.__setattr__(m, "__dict__", values)
+    object.__setattr__(m, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(m, "__pydantic_extra__", None)
+    object.__setattr__(m, "__pydantic_private__", None)
+    return m
+
+
+# the loader of the deprecated v2 parse_raw (the only one supporting pickle),
+# without its warnings
+_load_str_bytes = without_deprecations(deprecated_parse.load_str_bytes)
+
+
+def _load_error(cls: type, b: Any, exc: Exception) -> ValidationError:
+    # the error of the deprecated v2 parse_raw, matching v1
+    if isinstance(exc, UnicodeDecodeError):
+        error_type = "value_error.unicodedecode"
+    elif isinstance(exc, json.JSONDecodeError):
+        error_type = "value_error.jsondecode"
+    elif isinstance(exc, ValueError):
+        error_type = "value_error"
+    else:
+        error_type = "type_error"
+    error = {
+        "type": PydanticCustomError(error_type, str(exc)),
+        "loc": ("__root__",),
+        "input": b,
+    }
+    return ValidationError.from_exception_data(cls.__name__, [error])  # type: ignore
 
 
 class _MixinMeta(_model_construction.ModelMetaclass):
     def __new__(cls, name, bases, namespace, **kwargs):  # type: ignore
+        started = _profiling.start() if _profiling.ENABLED else None
         if "Config" in namespace and isinstance(namespace["Config"], type):
+            config_started = _profiling.start() if started else None
             namespace["model_config"] = _convert_config(namespace.pop("Config"))
-        return super().__new__(cls, name, bases, namespace, **kwargs)
+            if config_started:
+                owner = _profiling.class_owner(namespace)
+                _profiling.stop(config_started, owner, "config")
+        if len(bases) > 1:
+            check_mixin_order(bases, PydanticCompatMixin, BaseModel)
+        if _shared.defers_build(namespace) and not _sets_defer_build(bases, namespace):
+            namespace["model_config"] = {
+                **namespace.get("model_config", {}),
+                "defer_build": True,
+            }
+        new_cls = super().__new__(cls, name, bases, namespace, **kwargs)
+        bind_aliases(new_cls, namespace, ALIASES)
+        if started:
+            _profiling.stop(started, _profiling.class_owner(namespace), "class")
+        return new_cls
+
+    # replaces the deprecated ModelMetaclass.__fields__, for all compat models
+    @property
+    def __fields__(cls) -> dict[str, Any]:
+        return cls.model_fields
 
 
 class PydanticCompatMixin(metaclass=_MixinMeta):
-    def __init_subclass__(cls, *args: Any, **kwargs: Any) -> None:
-        check_mixin_order(cls, PydanticCompatMixin, BaseModel)
-        # the deprecation warning is on the metaclass
-        type(cls).__fields__ = property(lambda cls: cls.model_fields)  # type: ignore
+    # v1 names with the same semantics are bound to the v2 methods themselves
+    # (see ALIASES)
+    dict = BaseModel.model_dump
+    json = BaseModel.model_dump_json
+    validate = BaseModel.__dict__["model_validate"]
+    construct = BaseModel.__dict__["model_construct"]
+    parse_obj = BaseModel.__dict__["model_validate"]
+
+    def model_copy(
+        self: Model,
+        *,
+        update: Mapping[str, Any] | None = None,
+        deep: bool | Literal["cow"] = False,
+    ) -> Any:
+        """Return a copy of the model.
+
+        With `deep="cow"` (copy-on-write), nothing is copied but the models (and
+        lists, tuples, dicts) on the paths changed by `update`, whose keys may be
+        dotted paths into nested values (e.g. `{"a.b.name": "x"}`).  Everything
+        else is shared with the original, which is like a deep copy as long as
+        shared values aren't mutated in place.  A frozen model without `update`
+        is returned as is.
+        """
+        if deep != "cow":
+            return super().model_copy(update=update, deep=deep)  # type: ignore
+        if not update and self.model_config.get("frozen"):
+            return self
+        return copy_on_write(self, dict(update or {}), _copy_model)
+
+    copy = model_copy
 
-    def dict(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.model_dump(*args, **kwargs)
+    def __reduce_ex__(self: Model, protocol: Any) -> Any:
+        # smaller and faster to pickle than BaseModel's state dict, e.g. for
+        # results sent back from worker processes (see parallel_validate)
+        if self.__pydantic_extra__ is not None or self.__pydantic_private__ is not None:
+            return super().__reduce_ex__(protocol)
+        return _unpickle, (type(self), self.__dict__, self.__pydantic_fields_set__)
 
-    def json(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.model_dump_json(*args, **kwargs)
+    @classmethod
+    def model_json_schema(
+        cls, *args: Any, **kwargs: Any
+    ) -> Dict[str, Any]:  # noqa: UP006
+        if args:
+            return super().model_json_schema(*args, **kwargs)  # type: ignore [misc, no-any-return]
+        sup = super()
+        return _schema_cache.cached_schema(
+            cls, lambda: sup.model_json_schema(**kwargs), kwargs  # type: ignore [attr-defined]
+        )
+
+    schema = model_json_schema
+
+    @classmethod
+    def parse_raw(
+        cls: type[Model],
+        b: str | bytes,
+        *,
+        content_type: str | None = None,
+        encoding: str = "utf8",
+        proto: Any = None,
+        allow_pickle: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        # kwargs: of model_validate_json (e.g. strict, context)
+        if content_type is not None or proto is not None or allow_pickle:
+            # pickle (or a content type): loaded as the deprecated v2 parse_raw
+            # does, without its warnings
+            try:
+                obj = _load_str_bytes(
+                    b,
+                    content_type=content_type,
+                    encoding=encoding,
+                    proto=proto,
+                    allow_pickle=allow_pickle,
+                )
+            except (ValueError, TypeError) as e:
+                raise _load_error(cls, b, e) from e
+            return cls.model_validate(obj, **kwargs)
+        if isinstance(b, bytes) and encoding.replace("-", "") != "utf8":
+            b = b.decode(encoding)
+        return cls.model_validate_json(b, **kwargs)
 
-    def copy(self: Model, *args: Any, **kwargs: Any) -> Any:
-        return self.model_copy(*args, **kwargs)
+    @classmethod
+    async def amodel_validate_many(
+        cls: type[Model],
+        objs: Iterable[Any],
+        *,
+        chunk: int | None = None,
+        errors: Literal["raise", "collect"] = "raise",
+        executor: Executor | None = None,
+    ) -> Any:
+        """Async `model_validate_many`, which lets the event loop run other tasks
+        between chunks of `chunk` objects (by default, chunks sized to take about
+        0.5 ms), or validates the chunks in `executor` (e.g. a ThreadPoolExecutor).
+        """
+        from pydantic_compat import _async  # imports asyncio
+
+        return await _async.validate_many(cls, objs, chunk, errors, executor)
 
     @classmethod
-    def schema(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.model_json_schema(*args, **kwargs)
+    async def amodel_dump_many(
+        cls,
+        objs: Iterable[Any],
+        *,
+        chunk: int | None = None,
+        output: Literal["python", "json"] = "python",
+        executor: Executor | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Dump `objs` with `model_dump(**kwargs)` (or `model_dump_json`, with
+        `output="json"`), as `amodel_validate_many` validates them.
+        """
+        from pydantic_compat import _async  # imports asyncio
+
+        return await _async.dump_many(objs, chunk, output, executor, kwargs)
 
     @classmethod
-    def validate(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.model_validate(*args, **kwargs)
+    def model_construct_recursive(
+        cls: type[Model], _fields_set: set[str] | None = None, **values: Any
+    ) -> Any:
+        """Create a model from trusted data without validation, like
+        `model_construct`, but also construct the nested models given as dicts
+        (in fields, `Optional`s, lists, tuples and dicts of models).
+
+        The nested models and containers to construct are found from the field
+        annotations once per class.  Unions of several model types are left as
+        they are, since telling them apart would require validation.
+        """
+        if not cls.__pydantic_complete__:  # e.g. with defer_build
+            cls.model_rebuild(raise_errors=False)
+        return _construct.construct_recursive(cls, values, _fields_set)
 
     @classmethod
-    def construct(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.model_construct(*args, **kwargs)
+    def iter_validate_jsonl(
+        cls: type[Model], source: Iterable[bytes | str]
+    ) -> Iterator[Any]:
+        """Lazily validate each line of JSON Lines data into a model instance.
+
+        `source` may be a file (binary or text) or any iterable of bytes/str chunks.
+        """
+        return map(cls.model_validate_json, iter_jsonl(source))
 
     @classmethod
-    def parse_obj(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.model_validate(*args, **kwargs)
+    def model_validate_file(
+        cls: type[Model], path: str | os.PathLike, **kwargs: Any
+    ) -> Any:
+        """Validate the JSON document in file `path` into a model instance.
+
+        pydantic-core only parses str, bytes or bytearray, so the file is read
+        into a single bytes object (and parsed without decoding it to str).
+        Keyword arguments are passed to `model_validate_json`.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        return cls.model_validate_json(data, **kwargs)
 
     @classmethod
-    def parse_raw(cls: type[Model], *args: Any, **kwargs: Any) -> Any:
-        return cls.model_validate_json(*args, **kwargs)
+    def dump_jsonl(cls, objs: Iterable[Any], fp: IO, **kwargs: Any) -> None:
+        """Write model instances to `fp` as JSON Lines.
+
+        Keyword arguments are passed to `model_dump_json`.
+        """
+        # the serializer's own default is by_alias=True
+        kwargs.setdefault("by_alias", False)
+        write_jsonl(
+            fp, (obj.__pydantic_serializer__.to_json(obj, **kwargs) for obj in objs)
+        )
 
-    # this is needed in addition to the metaclass patch in __init_subclass__
+    # this is needed in addition to the metaclass property, for instances
     @property
     def __fields__(self: Model) -> Dict[str, Any]:  # noqa: UP006
         return self.model_fields
@@ -106,14 +365,47 @@ class PydanticCompatMixin(metaclass=_MixinMeta):
         raise_errors: bool = True,
         **localns: Any,
     ) -> None:
-        cls.model_rebuild(
-            forc=force, raise_errors=raise_errors, _types_namespace=localns
-        )
+        cls.model_rebuild(force=force, raise_errors=raise_errors, **localns)
 
     @classmethod
     def model_rebuild(
         cls: type[Model], force: bool = False, raise_errors: bool = True, **kwargs: Any
     ) -> bool | None:
+        if LIST_ADAPTER_ATTR in cls.__dict__:
+            delattr(cls, LIST_ADAPTER_ATTR)
+        _schema_cache.clear_memory_cache(cls)
+        _construct.clear_plan(cls)
         return super().model_rebuild(
             force=force, raise_errors=raise_errors, _types_namespace=kwargs
         )
+
+    @classmethod
+    def model_validate_many(
+        cls: type[Model],
+        objs: Iterable[Any],
+        *,
+        errors: Literal["raise", "collect"] = "raise",
+    ) -> Any:
+        """Validate many objects, returning a list of model instances.
+
+        With `errors='raise'`, a single ValidationError is raised for all invalid
+        items (error locations start with the item index).  With
+        `errors='collect'`, a `(models, errors)` tuple is returned instead, where
+        `errors` is a list of `(index, ValidationError)` for the invalid items.
+        """
+        adapter = cls.__dict__.get(LIST_ADAPTER_ATTR)
+        if adapter is None:
+            if not cls.__pydantic_complete__:  # e.g. with defer_build
+                cls.model_rebuild(raise_errors=False)
+            # validating the whole list in one call stays inside pydantic-core
+            adapter = TypeAdapter(List[cls])  # type: ignore [valid-type]
+            if cls.__pydantic_complete__:
+                setattr(cls, LIST_ADAPTER_ATTR, adapter)
+        if not isinstance(objs, (list, tuple)):
+            objs = list(objs)
+        if errors == "raise":
+            return adapter.validate_python(objs)
+        try:
+            return adapter.validate_python(objs), []
+        except ValidationError:
+            return validate_each(cls.model_validate, objs, ValidationError)
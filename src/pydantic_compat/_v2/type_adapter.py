@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import typing
+from functools import lru_cache
+from typing import Any, ForwardRef
+
+import pydantic
+import typing_extensions
+
+from pydantic_compat._shared import TYPE_ADAPTER_CACHE_SIZE, TypeKey
+
+# typing.Literal is new in Python 3.8
+_LITERALS = (
+    typing_extensions.Literal,
+    getattr(typing, "Literal", typing_extensions.Literal),
+)
+
+
+def TypeAdapter(type: Any, **kwargs: Any) -> pydantic.TypeAdapter[Any]:
+    """pydantic.TypeAdapter, with adapters kept in a process-wide LRU cache.
+
+    Calling `TypeAdapter(T)` repeatedly returns the same adapter, with the core
+    schema built for `T`.  Adapters with other arguments (e.g. `config`), or for
+    types that may need the namespace of the caller (forward references, classes
+    defined in a function), are created each time, as pydantic does.
+    """
+    if not kwargs and not _needs_namespace(type):
+        try:
+            return _cached_adapter(TypeKey(type))
+        except TypeError:  # unhashable type
+            pass
+    # one frame up for the namespace of the caller: this one
+    kwargs["_parent_depth"] = kwargs.get("_parent_depth", 2) + 1
+    return pydantic.TypeAdapter(type, **kwargs)
+
+
+@lru_cache(maxsize=TYPE_ADAPTER_CACHE_SIZE)
+def _cached_adapter(key: TypeKey) -> pydantic.TypeAdapter[Any]:
+    return pydantic.TypeAdapter(key.type)
+
+
+def _needs_namespace(type_: Any) -> bool:
+    # whether pydantic may resolve names in `type_` with the caller's namespace
+    if isinstance(type_, (str, ForwardRef)):
+        return True
+    if "<locals>" in getattr(type_, "__qualname__", ""):
+        return True
+    args = getattr(type_, "__args__", None)
+    if getattr(type_, "__origin__", None) in _LITERALS:
+        return False
+    if isinstance(args, tuple) and not issubclass(type(type_), type):
+        return any(map(_needs_namespace, args))
+    return False
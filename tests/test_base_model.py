@@ -1,9 +1,16 @@
-from typing import ClassVar
+import asyncio
+import copy
+import io
+import json
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import pydantic
 import pytest
 
-from pydantic_compat import PYDANTIC2, PydanticCompatMixin
+from pydantic_compat import PYDANTIC2, PydanticCompatMixin, parallel_validate
 
 
 class Model(PydanticCompatMixin, pydantic.BaseModel):
@@ -18,6 +25,17 @@ def test_v1_api() -> None:
     assert m.copy() == m
 
     assert Model.parse_raw('{"x": 2}') == Model(x=2)
+    utf16 = '{"x": 2}'.encode("utf-16")
+    assert Model.parse_raw(utf16, encoding="utf-16") == Model(x=2)
+    raw = '{"x": 2}'
+    assert Model.parse_raw(raw, content_type="application/json") == Model(x=2)
+    pickled = pickle.dumps({"x": 2})
+    assert Model.parse_raw(pickled, proto="pickle", allow_pickle=True) == Model(x=2)
+    with pytest.raises(pydantic.ValidationError):
+        Model.parse_raw("{", content_type="application/json")
+    if PYDANTIC2:  # passed on to model_validate_json
+        with pytest.raises(pydantic.ValidationError):
+            Model.parse_raw('{"x": "2"}', strict=True)
     assert Model.parse_obj({"x": 2}) == Model(x=2)
     assert Model.construct(x=2) == Model(x=2)
     assert Model.validate({"x": 2}) == Model(x=2)
@@ -53,6 +71,56 @@ def test_v2_api() -> None:
     Model.model_rebuild(force=True)
 
 
+def test_aliases_bound_to_native() -> None:
+    pairs = [("dict", "model_dump"), ("validate", "model_validate")]
+    pairs += [("construct", "model_construct"), ("schema", "model_json_schema")]
+    for v1_name, v2_name in pairs:
+        # the same function, not a wrapper calling it
+        v1, v2 = getattr(Model, v1_name), getattr(Model, v2_name)
+        assert getattr(v1, "__func__", v1) is getattr(v2, "__func__", v2)
+
+    # overriding the native method overrides its alias, unless both are overridden
+    validate, validate_alias = ("model_validate", "validate")[:: 1 if PYDANTIC2 else -1]
+    namespace = {
+        "model_dump": lambda self, **kw: "v2 override",
+        "dict": lambda self, **kw: "v1 override",
+        validate: classmethod(lambda cls, obj, **kw: "validate override"),
+    }
+    Custom = type(Model)("Custom", (Model,), namespace)
+
+    class Sub(Custom):  # type: ignore
+        pass
+
+    for cls in (Custom, Sub):
+        assert cls().model_dump() == "v2 override"
+        assert cls().dict() == "v1 override"
+        assert getattr(cls, validate)({}) == "validate override"
+        assert getattr(cls, validate_alias)({}) == "validate override"
+    if PYDANTIC2:
+        assert Custom.parse_obj({}) == "validate override"
+
+
+class Redact(pydantic.BaseModel):
+    secret: str = "s"
+
+    # the native dump method of either version
+
+    def model_dump(self, **kwargs: Any) -> Any:
+        return {**super().model_dump(**kwargs), "secret": "***"}
+
+    def dict(self, **kwargs: Any) -> Any:
+        return {**super().dict(**kwargs), "secret": "***"}
+
+
+def test_aliases_override_in_base() -> None:
+    # an override in a base after the mixin in the MRO
+    class Redacted(PydanticCompatMixin, Redact):
+        pass
+
+    assert Redacted().model_dump() == {"secret": "***"}
+    assert Redacted().dict() == {"secret": "***"}
+
+
 def test_v1_attributes() -> None:
     m = Model()
     assert "x" in m.__fields__
@@ -89,6 +157,20 @@ def test_mixin_order() -> None:
     class Model2(PydanticCompatMixin, pydantic.BaseModel):
         x: int = 1
 
+    class Other:
+        pass
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        class Model3(Other, PydanticCompatMixin, pydantic.BaseModel):
+            x: int = 1
+
+        class Model4(Model2):
+            y: int = 1
+
+        assert Model4.__fields__.keys() == {"x", "y"}
+
 
 V2Config = {"populate_by_name": True, "extra": "forbid", "frozen": True}
 
@@ -125,3 +207,399 @@ def test_config(config: object) -> None:
     # test extra
     with pytest.raises((ValueError, TypeError)):  # (v1, v2)
         Model(extra=1)
+
+
+def test_shared_config() -> None:
+    class StrictConfig(V1Config):
+        allow_population_by_field_name = False
+
+    class Model1(PydanticCompatMixin, pydantic.BaseModel):
+        name: str = pydantic.Field(alias="full_name")
+        Config = StrictConfig
+
+    class Model2(PydanticCompatMixin, pydantic.BaseModel):
+        name: str = pydantic.Field(alias="full_name")
+        Config = StrictConfig
+
+    for model in (Model1, Model2):
+        assert model.model_config["frozen"] is True
+        assert model.model_config["populate_by_name"] is False
+        with pytest.raises((ValueError, TypeError)):  # (v1, v2)
+            model(name="John")
+
+
+def test_model_fields_cached() -> None:
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+        y: "Optional[Sub]" = None
+
+    class Sub(PydanticCompatMixin, pydantic.BaseModel):
+        z: int = 1
+
+    assert Model.model_fields is Model.model_fields
+    assert Model.model_fields["x"] is Model.model_fields["x"]
+    Model.model_rebuild(Optional=Optional, Sub=Sub)
+    assert Model.model_fields is Model.model_fields
+    assert "y" in Model.model_fields
+    assert Model(y={"z": 2}).y == Sub(z=2)
+
+
+def test_model_fields_field_info() -> None:
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int
+        y: str = pydantic.Field("y", description="the y", title="Y")
+
+    x, y = Model.model_fields["x"], Model.model_fields["y"]
+    assert x.annotation is int
+    assert x.is_required()
+    assert not y.is_required()
+    assert y.default == "y"
+    assert y.description == "the y"
+    assert y.title == "Y"
+    assert not y.frozen
+
+
+def test_model_config_mapping() -> None:
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+
+        class Config:
+            allow_population_by_field_name = True
+            frozen = True
+
+    assert Model.model_config["populate_by_name"] is True
+    assert Model.model_config["frozen"] is True
+    assert Model.model_config.get("populate_by_name") is True
+
+    if not PYDANTIC2:
+        # v1 names and inherited values are still available
+        assert Model.model_config is Model.model_config
+        assert Model.model_config["allow_population_by_field_name"] is True
+        assert Model.model_config["validate_assignment"] is False
+        assert "validate_assignment" in dict(Model.model_config)
+        assert "allow_population_by_field_name" not in dict(Model.model_config)
+
+        Model.model_config["validate_assignment"] = True
+        assert Model.__config__.validate_assignment is True
+        assert Model.model_config["validate_assignment"] is True
+
+        # direct mutations of the Config class (of the model or of a base)
+        class Sub(Model):
+            pass
+
+        assert Sub.model_config["extra"] == "ignore"
+        Model.__config__.extra = pydantic.Extra.forbid
+        assert Model.model_config["extra"] == "forbid"
+        assert Sub.model_config["extra"] == "forbid"
+        Sub.__config__.title = "Sub"
+        assert Sub.model_config["title"] == "Sub"
+        assert Model.model_config["title"] is None
+
+
+def test_model_validate_many() -> None:
+    data = [{"x": 1}, {"x": "2"}, {"x": 3}]
+    assert Model.model_validate_many(data) == [Model(x=1), Model(x=2), Model(x=3)]
+    assert Model.model_validate_many(iter(data)) == [Model(x=1), Model(x=2), Model(x=3)]
+
+    bad = [{"x": 1}, {"x": "nope"}, {"x": 3}]
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        Model.model_validate_many(bad)
+    assert exc_info.value.errors()[0]["loc"] == (1, "x")
+
+    models, errors = Model.model_validate_many(bad, errors="collect")
+    assert models == [Model(x=1), Model(x=3)]
+    assert [i for i, _ in errors] == [1]
+    assert isinstance(errors[0][1], pydantic.ValidationError)
+
+
+def test_jsonl() -> None:
+    models = [Model(x=i) for i in range(5)]
+    buf = io.BytesIO()
+    Model.dump_jsonl(models, buf)
+    data = buf.getvalue()
+    assert data.count(b"\n") == 5
+
+    buf.seek(0)
+    assert list(Model.iter_validate_jsonl(buf)) == models
+    assert list(Model.iter_validate_jsonl(io.StringIO(data.decode()))) == models
+    # chunks that are not aligned with lines, and blank lines
+    chunks = [data[i : i + 3] for i in range(0, len(data), 3)] + [b"\n\n"]
+    assert list(Model.iter_validate_jsonl(chunks)) == models
+    assert list(Model.iter_validate_jsonl([data.rstrip()])) == models
+
+    text = io.StringIO()
+    Model.dump_jsonl(models, text)
+    assert text.getvalue() == data.decode()
+
+    # as model_dump_json: field names unless by_alias=True
+    class Aliased(PydanticCompatMixin, pydantic.BaseModel):
+        my_field: int = pydantic.Field(1, alias="myField")
+
+    buf = io.BytesIO()
+    Aliased.dump_jsonl([Aliased()], buf)
+    assert json.loads(buf.getvalue()) == {"my_field": 1}
+    buf = io.BytesIO()
+    Aliased.dump_jsonl([Aliased()], buf, by_alias=True)
+    assert json.loads(buf.getvalue()) == {"myField": 1}
+
+
+class Leaf(PydanticCompatMixin, pydantic.BaseModel):
+    name: str
+    tags: List[str] = []
+
+
+class FrozenLeaf(PydanticCompatMixin, pydantic.BaseModel):
+    name: str
+
+    class Config:
+        frozen = True
+
+
+class Tree(PydanticCompatMixin, pydantic.BaseModel):
+    leaf: Leaf
+    children: List["Tree"] = []
+    pair: Tuple[Leaf, Leaf] = (Leaf(name="a"), Leaf(name="b"))
+    by_key: Dict[str, Leaf] = {}
+    frozen: FrozenLeaf = FrozenLeaf(name="f")
+
+
+Tree.model_rebuild()
+
+
+@pytest.mark.parametrize("window", [None, 5])
+def test_model_validate_file(tmp_path: Any, monkeypatch: Any, window: Any) -> None:
+    if window is not None:
+        if PYDANTIC2:
+            pytest.skip("the file is parsed in windows on pydantic v1 only")
+        from pydantic_compat._v1 import json_file
+
+        monkeypatch.setattr(json_file, "WINDOW", window)
+
+    tree = Tree(
+        leaf=Leaf(name="ünïcode €", tags=["𝄞"]),
+        children=[
+            Tree(leaf=Leaf(name=str(i)), by_key={"k": Leaf(name="v")}) for i in range(5)
+        ],
+    )
+    path = tmp_path / "tree.json"
+    path.write_text(tree.model_dump_json(), encoding="utf-8")
+    assert Tree.model_validate_file(path) == tree
+    assert Tree.model_validate_file(str(path)) == tree
+
+    # errors are located in the document
+    data = tree.model_dump()
+    data["children"][3]["by_key"]["k"] = {"name": []}
+    path.write_text(json.dumps(data, indent=2))
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        Tree.model_validate_file(path)
+    assert exc_info.value.errors()[0]["loc"] == ("children", 3, "by_key", "k", "name")
+
+    for text in ["", '{"leaf": {"name": "x"}', '{"leaf": {"name": "x"}} []']:
+        path.write_text(text)
+        with pytest.raises(pydantic.ValidationError):
+            Tree.model_validate_file(path)
+
+
+def test_model_copy_cow() -> None:
+    tree = Tree(
+        leaf={"name": "root"},
+        children=[{"leaf": {"name": "a"}}, {"leaf": {"name": "b"}}],
+        by_key={"k": {"name": "k"}},
+    )
+    update = {
+        "children.1.leaf.name": "B",
+        "pair.0": Leaf(name="A"),
+        "by_key.k.tags": ["t"],
+    }
+    copy = tree.model_copy(update=update, deep="cow")
+    assert copy.children[1].leaf.name == "B"
+    assert copy.pair[0].name == "A" and isinstance(copy.pair, tuple)
+    assert copy.by_key["k"].tags == ["t"]
+    # the original is unchanged
+    assert tree.children[1].leaf.name == "b"
+    assert tree.pair[0].name == "a"
+    assert tree.by_key["k"].tags == []
+    # only the models on the updated paths are copied
+    assert copy.leaf is tree.leaf
+    assert copy.children[0] is tree.children[0]
+    assert copy.children[1] is not tree.children[1]
+    assert copy.children[1].children is tree.children[1].children
+    assert copy.pair[1] is tree.pair[1]
+    assert copy.frozen is tree.frozen
+    # same result as a deep copy
+    deep = tree.model_copy(deep=True)
+    deep.children[1].leaf.name = "B"
+    deep.pair = (Leaf(name="A"), deep.pair[1])
+    deep.by_key["k"].tags = ["t"]
+    assert copy == deep
+
+    assert tree.model_copy(deep="cow") == tree
+    assert tree.model_copy(deep="cow") is not tree
+    assert tree.frozen.model_copy(deep="cow") is tree.frozen
+    assert tree.frozen.model_copy(update={"name": "g"}, deep="cow").name == "g"
+
+    with pytest.raises(ValueError, match="Cannot update both 'leaf'"):
+        tree.model_copy(update={"leaf": Leaf(name="x"), "leaf.name": "y"}, deep="cow")
+    with pytest.raises(TypeError, match="'leaf.name'"):
+        tree.model_copy(update={"leaf.name.x": 1}, deep="cow")
+
+
+def test_model_construct_recursive() -> None:
+    class Sub(PydanticCompatMixin, pydantic.BaseModel):
+        name: str
+        n: int = 0
+
+    class Top(PydanticCompatMixin, pydantic.BaseModel):
+        sub: Sub
+        maybe: Optional[Sub] = None
+        subs: List[Sub] = []
+        pair: Tuple[Sub, int] = (Sub(name="p"), 0)
+        by_key: Dict[str, Sub] = {}
+        plain: Dict[str, int] = {}
+
+    data: dict = {
+        "sub": {"name": "a"},
+        "maybe": None,
+        "subs": [{"name": "b", "n": 1}, Sub(name="c")],
+        "pair": [{"name": "d"}, 1],
+        "by_key": {"k": {"name": "e"}},
+        "plain": {"x": 1},
+    }
+    top = Top.model_construct_recursive(**data)
+    assert top == Top.model_validate(data)
+    assert top.model_fields_set == set(data)
+    assert top.sub.model_fields_set == {"name"}
+    assert data["sub"] == {"name": "a"}  # not modified
+
+    top = Top.model_construct_recursive({"sub"}, sub={"name": "a"}, maybe={"name": "m"})
+    assert top.maybe == Sub(name="m")
+    assert top.model_fields_set == {"sub"}
+    # no validation
+    assert Top.model_construct_recursive(sub={"name": 1}).sub.name == 1
+
+    # models that model_construct handles specially (here, aliases)
+    class Aliased(PydanticCompatMixin, pydantic.BaseModel):
+        sub: Sub = pydantic.Field(alias="Sub")
+        subs: List[Sub] = []
+
+    aliased = Aliased.model_construct_recursive(sub={"name": "a"}, subs=[{"name": "b"}])
+    expected = Aliased.model_validate({"Sub": {"name": "a"}, "subs": [{"name": "b"}]})
+    assert aliased == expected
+    assert aliased.model_fields_set == {"sub", "subs"}
+
+
+@pytest.mark.parametrize("aliased", [False, True])
+def test_model_construct_recursive_extra(aliased: bool) -> None:
+    # extra values are kept with extra="allow" only, whatever the defaults
+    alias = "Name" if aliased else None
+
+    class Ignored(PydanticCompatMixin, pydantic.BaseModel):
+        name: str = pydantic.Field(alias=alias)
+        n: int = 0
+
+    class Allowed(Ignored):
+        model_config = {"extra": "allow"}
+
+    data = {"name": "a", "Name": "a", "other": 1}
+    ignored = Ignored.model_construct_recursive(**data)
+    assert ignored.name == "a"
+    assert ignored.n == 0
+    assert "other" not in ignored.model_dump()
+    assert not {"n", "other"} & ignored.model_fields_set
+
+    allowed = Allowed.model_construct_recursive(**data)
+    assert allowed.model_dump()["other"] == 1
+    assert allowed.n == 0
+    assert "n" not in allowed.model_fields_set
+
+
+class WithPrivate(PydanticCompatMixin, pydantic.BaseModel):
+    x: int
+    _secret: int = pydantic.PrivateAttr(2)
+
+
+def test_pickle() -> None:
+    tree = Tree(leaf={"name": "a"}, children=[{"leaf": {"name": "b", "tags": ["t"]}}])
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(tree, protocol))
+        assert loaded == tree
+        assert loaded.model_fields_set == tree.model_fields_set
+        assert loaded.children[0].leaf.model_fields_set == {"name", "tags"}
+    deep = copy.deepcopy(tree)
+    assert deep == tree
+    assert deep.children[0].leaf.tags is not tree.children[0].leaf.tags
+
+    # private attributes: pydantic's own pickling
+    loaded = pickle.loads(pickle.dumps(WithPrivate(x=1)))
+    assert loaded == WithPrivate(x=1)
+    assert loaded._secret == 2
+
+
+def test_parallel_validate() -> None:
+    data = [{"name": str(i), "tags": [str(i)]} for i in range(25)]
+    expected = [Leaf(name=str(i), tags=[str(i)]) for i in range(25)]
+    assert parallel_validate(Leaf, data, workers=2, chunksize=4) == expected
+    assert parallel_validate(Leaf, iter(data), chunksize=4) == expected  # in process
+    dumped = parallel_validate(Leaf, data, workers=2, chunksize=7, output="python")
+    assert dumped == [m.model_dump() for m in expected]
+    dumped = parallel_validate(Leaf, data, workers=2, output="json")
+    assert dumped == [m.model_dump_json() for m in expected]
+
+    bad = [*data[:10], {"tags": []}, *data[10:20], {"name": []}, *data[20:]]
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        parallel_validate(Leaf, bad, workers=2, chunksize=4)
+    assert exc_info.value.errors()[0]["loc"] == (10, "name")
+    if PYDANTIC2:  # all the invalid items, as in model_validate_many
+        locs = [e["loc"] for e in exc_info.value.errors()]
+        assert locs == [(10, "name"), (21, "name")]
+
+    models, errors = parallel_validate(
+        Leaf, bad, workers=2, chunksize=4, errors="collect"
+    )
+    assert models == expected
+    assert [i for i, _ in errors] == [10, 21]
+    assert isinstance(errors[0][1], pydantic.ValidationError)
+    assert errors[0][1].errors()[0]["loc"] == ("name",)
+
+    with ProcessPoolExecutor(2) as pool:
+        assert parallel_validate(Leaf, data, executor=pool, workers=2) == expected
+
+
+def test_amodel_validate_many() -> None:
+    data = [{"name": str(i)} for i in range(25)]
+    expected = [Leaf(name=str(i)) for i in range(25)]
+    bad = [*data[:10], {"tags": []}, *data[10:20], {"name": []}, *data[20:]]
+    ticks = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        assert await Leaf.amodel_validate_many(data, chunk=4) == expected
+        # the other task ran between chunks
+        assert len(ticks) >= 7
+        ticker.cancel()
+
+        with pytest.raises(pydantic.ValidationError) as exc_info:
+            await Leaf.amodel_validate_many(bad, chunk=4)
+        assert exc_info.value.errors()[0]["loc"] == (10, "name")
+        models, errors = await Leaf.amodel_validate_many(bad, chunk=4, errors="collect")
+        assert models == expected
+        assert [i for i, _ in errors] == [10, 21]
+
+        with ThreadPoolExecutor(2) as pool:
+            models = await Leaf.amodel_validate_many(iter(data), executor=pool)
+            assert models == expected
+            dumped = await Leaf.amodel_dump_many(expected, chunk=3, executor=pool)
+            assert dumped == [m.model_dump() for m in expected]
+        dumped = await Leaf.amodel_dump_many(expected, output="json", exclude={"tags"})
+        assert dumped == [m.model_dump_json(exclude={"tags"}) for m in expected]
+
+        with pytest.raises(ValueError, match="chunk size"):
+            await Leaf.amodel_validate_many(data, chunk=0)
+
+    asyncio.run(main())
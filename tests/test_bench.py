@@ -0,0 +1,797 @@
+"""Overhead of the compat layer, compared with plain pydantic.
+
+Run with `pytest tests/test_bench.py --benchmark-json=bench.json` to get
+machine-readable results (each benchmark records the pydantic version in
+`extra_info`).
+"""
+
+import asyncio
+import io
+import json
+import pickle
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, ClassVar, Dict, List, Union
+
+import pydantic
+import pytest
+from typing_extensions import Literal
+
+import pydantic_compat
+from pydantic_compat import (
+    PYDANTIC2,
+    PydanticCompatMixin,
+    TypeAdapter,
+    field_serializer,
+    field_validator,
+    model_validator,
+    root_validator,
+    set_defer_build,
+    set_json_backend,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+Benchmark = Callable[..., Any]
+
+# native names of the installed pydantic, used for the plain BaseModel
+NATIVE = {
+    "validate": "model_validate" if PYDANTIC2 else "parse_obj",
+    "dump": "model_dump" if PYDANTIC2 else "dict",
+    "dump_json": "model_dump_json" if PYDANTIC2 else "json",
+    "copy": "model_copy" if PYDANTIC2 else "copy",
+    "fields": "model_fields" if PYDANTIC2 else "__fields__",
+}
+# (v2 name, v1 names...) of the compat aliases
+COMPAT = {
+    "validate": ("model_validate", "validate", "parse_obj"),
+    "dump": ("model_dump", "dict"),
+    "dump_json": ("model_dump_json", "json"),
+    "copy": ("model_copy", "copy"),
+}
+DATA = {"a": 1, "b": "b", "c": 1.0, "items": [1, 2, 3], "sub": {"x": 1, "y": "y"}}
+
+
+class PlainSub(pydantic.BaseModel):
+    x: int = 1
+    y: str = "y"
+
+
+class Plain(pydantic.BaseModel):
+    a: int = 1
+    b: str = "b"
+    c: float = 1.0
+    items: List[int] = []
+    sub: PlainSub = PlainSub()
+
+
+class CompatSub(PydanticCompatMixin, pydantic.BaseModel):
+    x: int = 1
+    y: str = "y"
+
+
+class Compat(PydanticCompatMixin, pydantic.BaseModel):
+    a: int = 1
+    b: str = "b"
+    c: float = 1.0
+    items: List[int] = []
+    sub: CompatSub = CompatSub()
+
+
+def _cases(op: str) -> List[Any]:
+    cases = [pytest.param(Plain, NATIVE[op], id=f"plain-{NATIVE[op]}")]
+    cases += [pytest.param(Compat, name, id=f"compat-{name}") for name in COMPAT[op]]
+    return cases
+
+
+@pytest.fixture(autouse=True)
+def _record_versions(benchmark: Any) -> None:
+    benchmark.extra_info["pydantic"] = pydantic.VERSION
+    benchmark.extra_info["pydantic_compat"] = pydantic_compat.__version__
+
+
+class SharedConfig:
+    allow_population_by_field_name = True
+
+
+@pytest.mark.benchmark(group="class_creation")
+@pytest.mark.parametrize(
+    "base, shared",
+    [((), False), ((PydanticCompatMixin,), False), ((PydanticCompatMixin,), True)],
+    ids=["plain", "compat", "compat-shared_config"],
+)
+def test_class_creation(benchmark: Benchmark, base: tuple, shared: bool) -> None:
+    def create() -> type:
+        class Model(*base, pydantic.BaseModel):  # type: ignore
+            a: int = 1
+            b: str = "b"
+            c: float = 1.0
+            items: List[int] = []
+
+            if shared:
+                Config = SharedConfig
+            elif base or not PYDANTIC2:
+
+                class Config:
+                    allow_population_by_field_name = True
+
+            else:
+                model_config = {"populate_by_name": True}
+
+        return Model
+
+    benchmark(create)
+
+
+def _create_validated_model() -> type:
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        a: int = 1
+        b: str = "b"
+
+        @pydantic_compat.validator("a", allow_reuse=True)
+        def _a(cls, v: int) -> int:
+            return v
+
+        @root_validator(pre=True, allow_reuse=True)
+        def _root(cls, values: Any) -> Any:
+            return values
+
+    return Model
+
+
+@pytest.mark.benchmark(group="concurrent_class_creation")
+@pytest.mark.parametrize("threads", [1, 4])
+def test_concurrent_class_creation(benchmark: Benchmark, threads: int) -> None:
+    # 200 models with adapted validators, created by `threads` threads at once
+    per_thread = 200 // threads
+
+    def create_many(_: int) -> None:
+        for _ in range(per_thread):
+            _create_validated_model()
+
+    with ThreadPoolExecutor(threads) as pool:
+        benchmark(lambda: list(pool.map(create_many, range(threads))))
+
+
+@pytest.mark.benchmark(group="Field")
+@pytest.mark.parametrize(
+    "field", [pydantic.Field, pydantic_compat.Field], ids=["plain", "compat"]
+)
+def test_field(benchmark: Benchmark, field: Callable) -> None:
+    benchmark(field, 1, description="a field", title="Field")
+
+
+# a generated module defining many fields, using a few distinct kwarg shapes
+FIELD_KWARGS = [
+    "default=0",
+    "default=0, description='a field'",
+    "default_factory=list, min_items=1, title='items'",
+    "None, alias='f', max_length=10",
+]
+FIELDS_MODULE = "\n".join(
+    f"f{i} = Field({FIELD_KWARGS[i % len(FIELD_KWARGS)]})" for i in range(10_000)
+)
+
+
+@pytest.mark.benchmark(group="Field_import")
+@pytest.mark.parametrize(
+    "field", [pydantic.Field, pydantic_compat.Field], ids=["plain", "compat"]
+)
+def test_field_module_import(benchmark: Benchmark, field: Callable) -> None:
+    code = compile(FIELDS_MODULE, "fields_module", "exec")
+    if field is pydantic.Field:
+        # min_items is only understood by the compat Field on v2
+        code = compile(FIELDS_MODULE.replace("min_items", "min_length"), "m", "exec")
+    benchmark.pedantic(exec, (code, {"Field": field}), rounds=5)
+
+
+@pytest.mark.benchmark(group="validate")
+@pytest.mark.parametrize("model, method", _cases("validate"))
+def test_validate(benchmark: Benchmark, model: Any, method: str) -> None:
+    benchmark(getattr(model, method), DATA)
+
+
+@pytest.mark.benchmark(group="dump")
+@pytest.mark.parametrize("model, method", _cases("dump"))
+def test_dump(benchmark: Benchmark, model: Any, method: str) -> None:
+    benchmark(getattr(model(**DATA), method))
+
+
+@pytest.mark.benchmark(group="dump_json")
+@pytest.mark.parametrize("model, method", _cases("dump_json"))
+def test_dump_json(benchmark: Benchmark, model: Any, method: str) -> None:
+    benchmark(getattr(model(**DATA), method))
+
+
+@pytest.mark.benchmark(group="alias_overhead")
+@pytest.mark.parametrize("op", ["validate", "dump"])
+def test_alias_overhead(benchmark: Benchmark, op: str) -> None:
+    """Calling a compat alias costs (almost) the same as the native name."""
+    v2_name, *v1_names = COMPAT[op]
+    native_name = v2_name if PYDANTIC2 else v1_names[0]
+    alias_name = v1_names[0] if PYDANTIC2 else v2_name
+    obj = Compat(**DATA)
+    args = (DATA,) if op == "validate" else ()
+    target = Compat if op == "validate" else obj
+    native, alias = getattr(target, native_name), getattr(target, alias_name)
+
+    def best(func: Callable) -> float:
+        return min(timeit.repeat(lambda: func(*args), number=200, repeat=7))
+
+    best(native), best(alias)  # warm up
+    # interleaved, best of 3, to be robust to noise (about 1.0: reported, not
+    # asserted, as timings on shared machines are too noisy)
+    ratio = min(best(alias) / best(native) for _ in range(3))
+    benchmark.extra_info["alias_native_ratio"] = round(ratio, 3)
+    benchmark(alias, *args)
+
+
+@pytest.mark.benchmark(group="copy")
+@pytest.mark.parametrize("model, method", _cases("copy"))
+def test_copy(benchmark: Benchmark, model: Any, method: str) -> None:
+    benchmark(getattr(model(**DATA), method))
+
+
+class TreeNode(PydanticCompatMixin, pydantic.BaseModel):
+    name: str
+    values: List[int] = []
+    children: List["TreeNode"] = []
+
+
+TreeNode.model_rebuild()
+
+
+def _tree(depth: int, fanout: int = 4) -> TreeNode:
+    children = [_tree(depth - 1, fanout) for _ in range(fanout)] if depth else []
+    return TreeNode(name=str(depth), values=list(range(10)), children=children)
+
+
+TREE = _tree(6)  # 5461 nodes
+# rename one leaf
+COW_UPDATE = {".".join(["children.3"] * 6 + ["name"]): "x"}
+
+
+def _deep_copy_update(tree: TreeNode) -> TreeNode:
+    copy = tree.model_copy(deep=True)
+    node = copy
+    for _ in range(6):
+        node = node.children[3]
+    node.name = "x"
+    return copy
+
+
+@pytest.mark.benchmark(group="copy_deep_tree")
+@pytest.mark.parametrize("mode", ["deep", "cow"])
+def test_copy_deep_tree(benchmark: Benchmark, mode: str) -> None:
+    if mode == "cow":
+        func = lambda: TREE.model_copy(update=COW_UPDATE, deep="cow")  # noqa: E731
+    else:
+        func = lambda: _deep_copy_update(TREE)  # noqa: E731
+    assert func() == _deep_copy_update(TREE)
+
+    tracemalloc.start()
+    try:
+        copy = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del copy
+    benchmark.extra_info["peak_bytes"] = peak
+    if mode == "cow":
+        assert peak < 50_000  # only the 7 nodes on the path are copied
+    benchmark(func)
+
+
+@pytest.mark.benchmark(group="model_fields")
+@pytest.mark.parametrize(
+    "model, attr",
+    [
+        pytest.param(Plain, NATIVE["fields"], id=f"plain-{NATIVE['fields']}"),
+        pytest.param(Compat, "model_fields", id="compat-model_fields"),
+        pytest.param(Compat, "__fields__", id="compat-__fields__"),
+    ],
+)
+def test_model_fields(benchmark: Benchmark, model: Any, attr: str) -> None:
+    def lookup() -> None:
+        fields = getattr(model, attr)
+        for name in ("a", "b", "c"):
+            fields[name]
+
+    benchmark(lookup)
+
+
+@pytest.mark.benchmark(group="model_fields")
+def test_model_fields_annotation(benchmark: Benchmark) -> None:
+    def lookup() -> None:
+        fields = Compat.model_fields
+        for name in ("a", "b", "c"):
+            fields[name].annotation  # noqa: B018
+
+    benchmark(lookup)
+
+
+@pytest.mark.benchmark(group="model_fields")
+def test_plain_dict_lookup(benchmark: Benchmark) -> None:
+    fields = dict(Compat.model_fields)
+
+    def lookup() -> None:
+        for name in ("a", "b", "c"):
+            fields[name].annotation  # noqa: B018
+
+    benchmark(lookup)
+
+
+@pytest.mark.benchmark(group="model_config")
+def test_model_config_lookup(benchmark: Benchmark) -> None:
+    def lookup() -> None:
+        config = Compat.model_config
+        config.get("frozen")
+        config.get("extra")
+
+    benchmark(lookup)
+
+
+if PYDANTIC2:
+
+    class PlainAfter(pydantic.BaseModel):
+        a: int = 1
+        b: str = "b"
+
+        @pydantic.model_validator(mode="after")
+        def _after(self) -> Any:
+            return self
+
+    class PlainRoot(pydantic.BaseModel):
+        a: int = 1
+        b: str = "b"
+
+        @pydantic.model_validator(mode="before")
+        @classmethod
+        def _root(cls, v: Any) -> Any:
+            return v
+
+else:
+
+    class PlainAfter(pydantic.BaseModel):  # type: ignore [no-redef]
+        a: int = 1
+        b: str = "b"
+
+        @pydantic.root_validator(skip_on_failure=True)
+        def _after(cls, v: Dict[str, Any]) -> Any:
+            return v
+
+    class PlainRoot(pydantic.BaseModel):  # type: ignore [no-redef]
+        a: int = 1
+        b: str = "b"
+
+        @pydantic.root_validator(pre=True)
+        def _root(cls, v: Dict[str, Any]) -> Any:
+            return v
+
+
+class CompatAfter(PydanticCompatMixin, pydantic.BaseModel):
+    a: int = 1
+    b: str = "b"
+
+    @model_validator(mode="after")
+    def _after(cls, v: Any) -> Any:
+        return v
+
+
+class CompatRoot(PydanticCompatMixin, pydantic.BaseModel):
+    a: int = 1
+    b: str = "b"
+
+    @root_validator(pre=True)
+    def _root(cls, v: Dict[str, Any]) -> Any:
+        return v
+
+
+@pytest.mark.benchmark(group="model_validator")
+@pytest.mark.parametrize(
+    "model",
+    [PlainAfter, CompatAfter, PlainRoot, CompatRoot],
+    ids=["plain-after", "compat-model_validator", "plain-root", "compat-root"],
+)
+def test_model_validator(benchmark: Benchmark, model: Any) -> None:
+    benchmark(model, a=2, b="x")
+
+
+def _defaulted_model(validate_default: bool) -> Any:
+    # a model with many defaulted fields, each with a field_validator
+    namespace: Dict[str, Any] = {
+        "__annotations__": {f"f{i}": str for i in range(20)},
+        "model_config": {"validate_default": validate_default},
+    }
+    for i in range(20):
+        namespace[f"f{i}"] = "value"
+        namespace[f"_check_f{i}"] = field_validator(f"f{i}")(lambda cls, v: v.strip())
+    return type(f"Defaulted{validate_default}", (pydantic_compat.BaseModel,), namespace)
+
+
+@pytest.mark.benchmark(group="field_validator_defaults")
+@pytest.mark.parametrize("validate_default", [False, True])
+def test_field_validator_defaults(benchmark: Benchmark, validate_default: bool) -> None:
+    # validate_default=True is what v1 used to do for every field_validator
+    model = _defaulted_model(validate_default)
+    benchmark(model, f0="x")
+
+
+MANY = [DATA] * 1000
+
+
+@pytest.mark.benchmark(group="validate_many")
+def test_validate_loop(benchmark: Benchmark) -> None:
+    benchmark(lambda: [Compat.model_validate(d) for d in MANY])
+
+
+@pytest.mark.benchmark(group="validate_many")
+def test_validate_many(benchmark: Benchmark) -> None:
+    benchmark(Compat.model_validate_many, MANY)
+
+
+ROWS = [
+    {"name": "n", "values": [1, 2], "children": [{"name": "c", "children": []}] * 5}
+] * 1000
+
+
+@pytest.mark.benchmark(group="bulk_load")
+@pytest.mark.parametrize("method", ["model_validate", "model_construct_recursive"])
+def test_bulk_load(benchmark: Benchmark, method: str) -> None:
+    if method == "model_validate":
+        func = lambda: [TreeNode.model_validate(row) for row in ROWS]  # noqa: E731
+    else:
+        construct = TreeNode.model_construct_recursive
+        func = lambda: [construct(**row) for row in ROWS]  # noqa: E731
+    assert func()[0] == TreeNode.model_validate(ROWS[0])
+    benchmark(func)
+
+
+@pytest.mark.benchmark(group="pickle")
+@pytest.mark.parametrize("model", [Plain, Compat], ids=["plain", "compat"])
+def test_pickle_models(benchmark: Benchmark, model: Any) -> None:
+    models = [model(**DATA) for _ in range(1000)]
+    benchmark.extra_info["size"] = len(pickle.dumps(models))
+    benchmark(lambda: pickle.loads(pickle.dumps(models)))
+
+
+BODY = [DATA] * 10_000
+THREADS = ThreadPoolExecutor(1)
+
+
+async def _loop_lags(validate: Callable[[], Any]) -> List[float]:
+    # how late a task sleeping 1 ms at a time (e.g. serving small requests) wakes
+    # up, while a large body is validated
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+
+    async def tick() -> None:
+        while True:
+            start = loop.time()
+            try:
+                await asyncio.sleep(0.001)
+            finally:  # also when cancelled, e.g. never woken up
+                lags.append(max(0.0, loop.time() - start - 0.001))
+
+    ticker = asyncio.ensure_future(tick())
+    await asyncio.sleep(0)
+    await validate()
+    ticker.cancel()
+    return lags
+
+
+@pytest.mark.benchmark(group="event_loop")
+@pytest.mark.parametrize("mode", ["blocking", "chunked", "thread"])
+def test_event_loop_latency(benchmark: Benchmark, mode: str) -> None:
+    async def blocking() -> Any:
+        return Compat.model_validate_many(BODY)
+
+    if mode == "blocking":
+        validate = blocking
+    elif mode == "chunked":
+        validate = partial(Compat.amodel_validate_many, BODY)
+    else:
+        validate = partial(Compat.amodel_validate_many, BODY, executor=THREADS)
+    lags: List[float] = []
+    benchmark(lambda: lags.extend(asyncio.run(_loop_lags(validate))))
+    lags.sort()
+    benchmark.extra_info["lag_p50_ms"] = lags[len(lags) // 2] * 1000 if lags else None
+    benchmark.extra_info["lag_max_ms"] = lags[-1] * 1000 if lags else None
+    if mode != "blocking":
+        assert len(lags) > 1
+
+
+@pytest.fixture(scope="module")
+def pool() -> Any:
+    with ProcessPoolExecutor(4) as pool:
+        yield pool
+
+
+@pytest.mark.benchmark(group="parallel_validate")
+@pytest.mark.parametrize("output", ["models", "json"])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_validate(
+    benchmark: Benchmark, pool: Any, workers: int, output: str
+) -> None:
+    rows = ROWS * 10
+    executor = pool if workers > 1 else None
+    func = lambda: pydantic_compat.parallel_validate(  # noqa: E731
+        TreeNode, rows, workers=workers, executor=executor, output=output
+    )
+    assert len(func()) == len(rows)
+    benchmark(func)
+
+
+WHEN = datetime(2020, 1, 1)
+
+
+class EncodersDates(PydanticCompatMixin, pydantic.BaseModel):
+    a: datetime = WHEN
+    b: datetime = WHEN
+    c: datetime = WHEN
+    n: int = 1
+    s: str = "s"
+
+    if not PYDANTIC2:  # deprecated in v2
+
+        class Config:
+            json_encoders: ClassVar[dict] = {datetime: lambda v: v.strftime("%Y-%m-%d")}
+
+
+class SerializerDates(PydanticCompatMixin, pydantic.BaseModel):
+    a: datetime = WHEN
+    b: datetime = WHEN
+    c: datetime = WHEN
+    n: int = 1
+    s: str = "s"
+
+    @field_serializer("a", "b", "c", when_used="json")
+    def _date(self, v: datetime) -> str:
+        return v.strftime("%Y-%m-%d")
+
+
+@pytest.mark.benchmark(group="serializers")
+@pytest.mark.parametrize(
+    "model",
+    [
+        pytest.param(
+            EncodersDates,
+            id="json_encoders",
+            marks=pytest.mark.skipif(PYDANTIC2, reason="deprecated in v2"),
+        ),
+        pytest.param(SerializerDates, id="field_serializer"),
+    ],
+)
+def test_field_serializer(benchmark: Benchmark, model: Any) -> None:
+    obj = model()
+    assert '"2020-01-01"' in obj.model_dump_json()
+    benchmark(obj.model_dump_json)
+
+
+@pytest.mark.benchmark(group="jsonl")
+def test_iter_validate_jsonl(benchmark: Benchmark) -> None:
+    buf = io.BytesIO()
+    Compat.dump_jsonl(Compat.model_validate_many(MANY), buf)
+    lines = buf.getvalue().splitlines(keepends=True)
+    benchmark(lambda: list(Compat.iter_validate_jsonl(lines)))
+
+
+@pytest.mark.benchmark(group="jsonl")
+def test_dump_jsonl(benchmark: Benchmark) -> None:
+    models = Compat.model_validate_many(MANY)
+    benchmark(lambda: Compat.dump_jsonl(models, io.BytesIO()))
+
+
+@pytest.mark.benchmark(group="TypeAdapter")
+def test_type_adapter(benchmark: Benchmark) -> None:
+    benchmark(lambda: TypeAdapter(List[int]).validate_python([1, 2, 3]))
+
+
+@pytest.mark.benchmark(group="json_backend")
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+def test_json_backend(benchmark: Benchmark, backend: str) -> None:
+    if PYDANTIC2:
+        pytest.skip("json backends only apply to pydantic v1")
+    pytest.importorskip(backend)
+    set_json_backend(backend)
+    try:
+        obj = Compat(**DATA)
+        benchmark(lambda: Compat.model_validate_json(obj.model_dump_json()))
+    finally:
+        set_json_backend("json")
+
+
+# a generated library of models, imported with and without defer_build
+MODELS_MODULE = (
+    "from typing import List, Optional\nfrom pydantic_compat import BaseModel\n"
+)
+MODELS_MODULE += "".join(
+    f"""
+class Model{i}(BaseModel):
+    a: int = 1
+    b: str = "b"
+    c: float = 1.0
+    d: Optional[int] = None
+    items: List[int] = []
+    sub: Optional[{f"Model{i - 1}" if i % 10 else "int"}] = None
+"""
+    for i in range(200)
+)
+
+
+@pytest.mark.benchmark(group="defer_build")
+@pytest.mark.parametrize("defer", [False, True], ids=["eager", "deferred"])
+def test_import_models(benchmark: Benchmark, defer: bool) -> None:
+    code = compile(MODELS_MODULE, "bench_models", "exec")
+
+    def setup() -> Any:
+        module = types.ModuleType("bench_models")
+        sys.modules["bench_models"] = module
+        return (code, module.__dict__), {}
+
+    set_defer_build(defer)
+    try:
+        benchmark.pedantic(exec, setup=setup, rounds=5)
+    finally:
+        set_defer_build(False)
+        sys.modules.pop("bench_models", None)
+
+
+def _event_model(size: int, discriminated: bool) -> Any:
+    # a model with a union of `size` event types, tagged by their `kind`
+    variants = [
+        type(
+            f"Event{i}",
+            (pydantic_compat.BaseModel,),
+            {"__annotations__": {"kind": Literal[f"event{i}"], "value": int}},
+        )
+        for i in range(size)
+    ]
+    field = pydantic_compat.Field(..., discriminator="kind") if discriminated else ...
+    namespace = {"__annotations__": {"event": Union[tuple(variants)]}, "event": field}
+    return type("Events", (pydantic_compat.BaseModel,), namespace)
+
+
+@pytest.mark.benchmark(group="discriminated_union")
+@pytest.mark.parametrize("discriminated", [False, True], ids=["union", "discriminated"])
+@pytest.mark.parametrize("size", [2, 10, 40])
+def test_discriminated_union(
+    benchmark: Benchmark, size: int, discriminated: bool
+) -> None:
+    # the last variant: every other one is tried first without a discriminator
+    model = _event_model(size, discriminated)
+    data = {"event": {"kind": f"event{size - 1}", "value": 1}}
+    assert model.model_validate(data).event.kind == f"event{size - 1}"
+    benchmark(model.model_validate, data)
+
+
+# an OME-like metadata document: images, with their channels and planes
+DOCUMENT_MODELS = """
+from typing import Dict, List, Optional
+
+from pydantic_compat import BaseModel
+
+
+class Plane(BaseModel):
+    the_z: int
+    the_c: int
+    the_t: int
+    delta_t: Optional[float] = None
+    position: List[float] = []
+
+
+class Channel(BaseModel):
+    id: str
+    name: str = ""
+    samples_per_pixel: int = 1
+
+
+class Image(BaseModel):
+    id: str
+    name: str
+    channels: List[Channel]
+    planes: List[Plane]
+    annotations: Dict[str, str] = {}
+
+
+class Document(BaseModel):
+    creator: str
+    images: List[Image]
+"""
+# run in a new process, to measure the peak RSS of loading the document alone
+LOAD_DOCUMENT = (
+    DOCUMENT_MODELS
+    + """
+import resource
+import sys
+
+method, path = sys.argv[1:]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if method == "model_validate_file":
+    doc = Document.model_validate_file(path)
+else:
+    with open(path, "rb") as f:
+        doc = Document.model_validate_json(f.read())
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# kilobytes, but bytes on macOS
+print((after - before) * (1 if sys.platform == "darwin" else 1024))
+"""
+)
+
+
+@pytest.fixture(scope="module")
+def document_file(tmp_path_factory: Any) -> Any:
+    image = {
+        "name": "image",
+        "channels": [{"id": f"Channel:{c}", "name": "DAPI"} for c in range(3)],
+        "planes": [
+            {"the_z": z, "the_c": c, "the_t": 0, "delta_t": 0.5, "position": [1.5] * 3}
+            for z in range(50)
+            for c in range(3)
+        ],
+        "annotations": {"key": "value"},
+    }
+    doc = {
+        "creator": "bench",
+        "images": [dict(image, id=f"Image:{i}") for i in range(400)],
+    }
+    path = tmp_path_factory.mktemp("documents") / "document.json"
+    path.write_text(json.dumps(doc))
+    return path
+
+
+@pytest.mark.benchmark(group="validate_file")
+@pytest.mark.parametrize("method", ["model_validate_json", "model_validate_file"])
+def test_validate_file_peak_rss(
+    benchmark: Benchmark, document_file: Any, method: str
+) -> None:
+    pytest.importorskip("resource")
+    peaks: List[int] = []
+
+    def load() -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", LOAD_DOCUMENT, method, str(document_file)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        peaks.append(int(result.stdout))
+
+    benchmark.pedantic(load, rounds=3)
+    size = document_file.stat().st_size
+    benchmark.extra_info["file_bytes"] = size
+    benchmark.extra_info["peak_rss_bytes"] = min(peaks)
+    benchmark.extra_info["peak_rss_per_file_byte"] = min(peaks) / size
+
+
+# pydantic itself is imported first (see test_imports.py)
+IMPORT_SCRIPT = "import pydantic\nimport pydantic_compat\n"
+
+
+@pytest.mark.benchmark(group="import")
+def test_import_time(benchmark: Benchmark) -> None:
+    # a fresh interpreter each round; the import time of pydantic_compat on top
+    # of pydantic (from -X importtime) is recorded in extra_info
+    def run() -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    result = benchmark.pedantic(run, rounds=5)
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == "pydantic_compat":
+            benchmark.extra_info["import_time_us"] = int(cumulative)
+            break
+    else:
+        raise AssertionError("pydantic_compat not found in -X importtime output")
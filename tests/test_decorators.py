@@ -1,3 +1,6 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
 from unittest.mock import Mock
 
 import pydantic
@@ -5,8 +8,11 @@ import pytest
 
 from pydantic_compat import (
     PYDANTIC2,
+    Field,
     PydanticCompatMixin,
+    field_serializer,
     field_validator,
+    model_serializer,
     model_validator,
     root_validator,
     validator,
@@ -59,6 +65,101 @@ def test_v2_field_validator():
     assert m.x == 2
 
 
+def test_field_validator_defaults():
+    mock = Mock(side_effect=lambda v: v * 10)
+
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+        y: int = Field(2, validate_default=True)
+
+        @field_validator("x", "y")
+        def _validate(cls, v):
+            return mock(v)
+
+    # as in v2, defaults are only validated if the field asks for it
+    assert Model().model_dump() == {"x": 1, "y": 20}
+    mock.assert_called_once_with(2)
+    assert Model(x=3).x == 30
+    properties = Model.model_json_schema()["properties"]
+    assert properties["y"] == {"title": "Y", "default": 2, "type": "integer"}
+
+    class Sub(Model):
+        z: int = 3
+
+    assert Sub().y == 20
+
+    class Validated(PydanticCompatMixin, pydantic.BaseModel):
+        model_config = {"validate_default": True}
+        x: int = 1
+
+        @field_validator("x")
+        def _validate(cls, v):
+            return v + 1
+
+    assert Validated().x == 2
+
+
+def test_field_validator_wrap_and_plain():
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        items: List[int] = []
+        raw: List[int] = []
+
+        @field_validator("items", mode="wrap")
+        def _wrap(cls, v, handler):
+            try:
+                return [*handler(v), 0]
+            except pydantic.ValidationError:
+                return []
+
+        @field_validator("raw", mode="plain")
+        def _plain(cls, v):
+            if v == "bad":
+                raise ValueError("bad raw")
+            return v
+
+    m = Model(items=["1", 2], raw="abc")
+    assert m.items == [1, 2, 0]
+    assert m.raw == "abc"  # no further validation
+    assert Model(items=[1, "x"]).items == []
+    with pytest.raises(pydantic.ValidationError) as exc:
+        Model(raw="bad")
+    assert [e["loc"] for e in exc.value.errors()] == [("raw",)]
+
+    class Strict(Model):
+        @field_validator("items", mode="wrap")
+        def _wrap(cls, v, handler):
+            return handler(v)
+
+    # errors of the handler keep their location
+    with pytest.raises(pydantic.ValidationError) as exc:
+        Strict(items=[1, "x"])
+    assert [e["loc"] for e in exc.value.errors()] == [("items", 1)]
+
+
+def test_field_validator_modes_in_definition_order():
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 0
+
+        @field_validator("x", mode="wrap")
+        def _times_ten(cls, v, handler):
+            return handler(v) * 10
+
+        @field_validator("x", mode="after")
+        def _plus_one(cls, v):
+            return v + 1
+
+    # as in v2, the validators defined last are the outermost
+    assert Model(x=3).x == 31
+
+    class Doubled(Model):
+        @field_validator("x", mode="before")
+        def _double(cls, v):
+            return v * 2
+
+    assert Doubled(x=3).x == 61
+    assert Doubled(x="3").x == 331
+
+
 def test_v1_root_validator():
     mock_before = Mock()
     mock_after = Mock()
@@ -136,3 +237,148 @@ def test_v2_model_validator():
     mock_after.assert_called_once_with(m)
     mock_after_cm.assert_called_once_with(m)
     assert m.x == 2
+
+
+def test_model_validator_after_changes():
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+        y: int = 0
+
+        @model_validator(mode="after")
+        def _set_y(cls, v):
+            v.y = v.x * 2
+            return v
+
+    m = Model(x="2")
+    assert m.y == 4
+
+    if PYDANTIC2:
+        return  # v2 warns when an after validator returns a different instance
+
+    class Model2(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+
+        @model_validator(mode="after")
+        def _replace(cls, v):
+            return Model2.model_construct(x=v.x + 1)
+
+    assert Model2(x=1).x == 2
+
+
+def test_field_serializer():
+    class Sub(PydanticCompatMixin, pydantic.BaseModel):
+        when: datetime
+        note: Optional[str] = None
+
+        @field_serializer("when", when_used="json")
+        def _when(self, v):
+            return v.strftime("%Y")
+
+        @field_serializer("note", when_used="unless-none")
+        def _note(self, v, info):
+            return f"{v}:{info.mode}"
+
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        subs: List[Sub]
+        n: int = pydantic.Field(1, alias="N")
+
+        @field_serializer("n", mode="wrap")
+        def _n(self, v, nxt):
+            return nxt(v) * 10
+
+    when = datetime(2020, 1, 1)
+    m = Model(subs=[{"when": when, "note": "x"}, {"when": when}])
+    assert m.model_dump() == {
+        "subs": [{"when": when, "note": "x:python"}, {"when": when, "note": None}],
+        "n": 10,
+    }
+    assert m.model_dump(by_alias=True)["N"] == 10
+    expected = {
+        "subs": [{"when": "2020", "note": "x:json"}, {"when": "2020", "note": None}],
+        "n": 10,
+    }
+    assert json.loads(m.model_dump_json()) == expected
+    if not PYDANTIC2:
+        assert json.loads(m.json()) == expected
+    # serializers don't apply to copies
+    assert m.model_copy().subs[0].when == when
+
+    class Overridden(Model):
+        def _n(self, v, nxt):  # still a serializer, as in v2
+            return 0
+
+    assert Overridden(subs=[]).model_dump() == {"subs": [], "n": 0}
+
+    with pytest.raises(Exception, match="missing"):
+
+        class Bad(PydanticCompatMixin, pydantic.BaseModel):
+            x: int = 1
+
+            @field_serializer("missing")
+            def _missing(self, v):
+                return v
+
+
+def test_serializers_json_mode():
+    class Sub(PydanticCompatMixin, pydantic.BaseModel):
+        when: datetime
+
+        @field_serializer("when", when_used="json")
+        def _when(self, v):
+            return v.year
+
+    # no serializers, but holds models with some
+    class Holder(PydanticCompatMixin, pydantic.BaseModel):
+        subs: Dict[str, Optional[Sub]]
+
+    class Plain(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+
+    h = Holder(subs={"a": {"when": datetime(2020, 1, 1)}, "b": None})
+    expected = {"subs": {"a": {"when": 2020}, "b": None}}
+    assert json.loads(h.model_dump_json()) == expected
+    if PYDANTIC2:
+        return
+    assert json.loads(h.json()) == expected
+    assert Plain.json is pydantic.BaseModel.json
+
+    class Root(PydanticCompatMixin, pydantic.BaseModel):
+        __root__: List[Sub]
+
+        @model_serializer(mode="wrap")
+        def _ser(self, handler):
+            return handler(self)
+
+    root = Root.parse_obj([{"when": datetime(2020, 1, 1)}])
+    assert json.loads(root.json()) == [{"when": 2020}]
+    assert json.loads(root.model_dump_json()) == [{"when": 2020}]
+
+
+def test_model_serializer():
+    class Model(PydanticCompatMixin, pydantic.BaseModel):
+        a: int = 1
+
+        @model_serializer(mode="wrap")
+        def _ser(self, handler, info):
+            data = handler(self)
+            data["mode"] = info.mode
+            return data
+
+    class Plain(PydanticCompatMixin, pydantic.BaseModel):
+        a: int = 1
+
+        @model_serializer
+        def _ser(self):
+            return {"A": self.a}
+
+    class Parent(PydanticCompatMixin, pydantic.BaseModel):
+        m: Model = Model()
+        p: Plain = Plain()
+
+    assert Model().model_dump() == {"a": 1, "mode": "python"}
+    assert json.loads(Model().model_dump_json()) == {"a": 1, "mode": "json"}
+    assert Parent().model_dump() == {"m": {"a": 1, "mode": "python"}, "p": {"A": 1}}
+    assert json.loads(Parent().model_dump_json()) == {
+        "m": {"a": 1, "mode": "json"},
+        "p": {"A": 1},
+    }
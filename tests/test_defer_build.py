@@ -0,0 +1,150 @@
+import sys
+import types
+from typing import Any, Iterator
+
+import pydantic
+import pytest
+
+import pydantic_compat
+from pydantic_compat import PYDANTIC2
+
+MODELS = '''
+from typing import List, Optional
+from pydantic_compat import BaseModel, Field, field_validator
+
+class Sub(BaseModel):
+    z: int = 1
+
+class Node(BaseModel):
+    """A node."""
+
+    name: str = Field("n", description="the name", regex="^.+$")
+    children: List["Node"] = []
+    sub: Optional[Sub] = None
+
+    @field_validator("name")
+    def _upper(cls, v: str) -> str:
+        return v.upper()
+
+    @classmethod
+    def make(cls) -> "Node":
+        return cls(name="made")
+
+    def describe(self) -> str:
+        return f"{type(self).__name__} {super().__repr__()}"
+'''
+
+
+def _define(source: str, name: str) -> types.ModuleType:
+    """Define the models in `source` at the top level of a new module."""
+    module = types.ModuleType(name)
+    sys.modules[name] = module
+    exec(source, module.__dict__)
+    return module
+
+
+def _is_built(cls: Any) -> bool:
+    if PYDANTIC2:
+        return bool(cls.__pydantic_complete__)
+    from pydantic_compat._v1.mixin import DEFERRED_ATTR
+
+    return DEFERRED_ATTR not in cls.__dict__
+
+
+@pytest.fixture
+def defer_build() -> Iterator[None]:
+    pydantic_compat.set_defer_build(True)
+    try:
+        yield
+    finally:
+        pydantic_compat.set_defer_build(False)
+
+
+def test_defer_build(defer_build: None) -> None:
+    m = _define(MODELS, "deferred_models")
+    assert not _is_built(m.Node)
+    assert not _is_built(m.Sub)
+
+    node = m.Node(name="a", children=[{"name": "b"}], sub={"z": 3})
+    assert _is_built(m.Node)
+    assert node.name == "A"
+    assert type(node.children[0]) is m.Node
+    assert type(node.sub) is m.Sub
+    assert node.describe().startswith("Node ")
+    assert m.Node.__doc__ == "A node."
+    with pytest.raises(pydantic.ValidationError):
+        m.Node(name="")
+
+    # once built, deferred models behave like eagerly built ones
+    pydantic_compat.set_defer_build(False)
+    eager = _define(MODELS, "eager_models")
+    eager.Node.model_rebuild()  # needed for the self-reference on pydantic 1.8
+    assert _is_built(eager.Node)
+    data = node.model_dump()
+    assert eager.Node.model_validate(data).model_dump() == data
+    assert m.Node.model_fields.keys() == eager.Node.model_fields.keys()
+    schema = m.Node.model_json_schema()
+    assert schema == eager.Node.model_json_schema()
+
+
+@pytest.mark.parametrize("trigger", ["model_fields", "model_validate", "classmethod"])
+def test_defer_build_triggers(defer_build: None, trigger: str) -> None:
+    m = _define(MODELS, f"deferred_{trigger}")
+    assert not _is_built(m.Node)
+    if trigger == "model_fields":
+        assert "name" in m.Node.model_fields
+    elif trigger == "model_validate":
+        assert m.Node.model_validate({"name": "x"}).name == "X"
+    else:
+        assert m.Node.make().name == "MADE"
+    if trigger != "model_fields" or not PYDANTIC2:  # v2 collects fields eagerly
+        assert _is_built(m.Node)
+
+
+def test_defer_build_config() -> None:
+    m = _define(
+        """
+from pydantic_compat import BaseModel
+
+class Deferred(BaseModel):
+    x: int = 1
+    model_config = {"defer_build": True}
+
+class Inherited(Deferred):
+    y: int = 1
+
+class Eager(BaseModel):
+    x: int = 1
+""",
+        "defer_build_config",
+    )
+    assert not _is_built(m.Deferred)
+    assert not _is_built(m.Inherited)
+    assert _is_built(m.Eager)
+    assert m.Inherited(y=2).model_dump() == {"x": 1, "y": 2}
+    assert _is_built(m.Inherited)
+
+
+def test_defer_build_base_model(
+    defer_build: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # BaseModel created on first use while enabled: models defined afterwards
+    # aren't all deferred
+    monkeypatch.delattr(pydantic_compat, "BaseModel")
+    assert not _is_built(_define(MODELS, "defer_build_base").Node)
+    pydantic_compat.set_defer_build(False)
+    assert _is_built(_define(MODELS, "defer_build_base_after").Node)
+
+
+def test_defer_build_opt_out(defer_build: None) -> None:
+    m = _define(
+        """
+from pydantic_compat import BaseModel
+
+class Model(BaseModel):
+    x: int = 1
+    model_config = {"defer_build": False}
+""",
+        "defer_build_opt_out",
+    )
+    assert _is_built(m.Model)
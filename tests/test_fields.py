@@ -1,9 +1,11 @@
-from typing import ClassVar, List, Tuple
+from typing import Any, ClassVar, List, Optional, Tuple, Union
 
+import pydantic
 import pytest
-from typing_extensions import Literal
+from pydantic import ValidationError
+from typing_extensions import Annotated, Literal
 
-from pydantic_compat import BaseModel, Field
+from pydantic_compat import BaseModel, Field, model_validator
 
 
 def test_field_const() -> None:
@@ -94,3 +96,100 @@ def test_field_extras() -> None:
         bar: int = Field(..., metadata={"foo": "bar"})  # type: ignore
 
     assert Foo.model_fields["bar"].json_schema_extra["metadata"] == {"foo": "bar"}
+
+
+def test_field_plan_reused() -> None:
+    from pydantic_compat import _shared
+
+    _shared._field_plan.cache_clear()
+    fields = [
+        Field(i, description="d", min_items=1, metadata=i)  # type: ignore
+        for i in range(3)
+    ]
+    assert _shared._field_plan.cache_info().misses == 1
+    assert _shared._field_plan.cache_info().hits == 2
+
+    class Foo(BaseModel):
+        a: List[int] = fields[0]
+        b: List[int] = fields[2]
+
+    for name, extra in [("a", 0), ("b", 2)]:
+        info = Foo.model_fields[name]
+        assert info.description == "d"
+        assert info.json_schema_extra["metadata"] == extra
+    with pytest.raises((TypeError, ValueError)):  # (v1, v2)
+        Foo(a=[])
+
+
+def test_field_discriminator() -> None:
+    validated: List[str] = []
+
+    class Cat(BaseModel):
+        kind: Literal["cat"]
+        lives: int = 9
+
+        @model_validator(mode="before")
+        def _track(cls, values: Any) -> Any:
+            validated.append("cat")
+            return values
+
+    class Dog(BaseModel):
+        kind: Literal["dog", "hound"]
+        barks: bool = True
+
+    class Owner(BaseModel):
+        pet: Union[Cat, Dog] = Field(..., discriminator="kind")
+        other: Optional[Union[Cat, Dog]] = Field(None, discriminator="kind")
+
+    owner = Owner(pet={"kind": "hound"}, other={"kind": "cat"})
+    assert isinstance(owner.pet, Dog)
+    assert isinstance(owner.other, Cat)
+    # the members that don't match the tag are not tried
+    assert validated == ["cat"]
+
+    with pytest.raises(ValidationError) as exc_info:
+        Owner(pet={"kind": "cat", "lives": "many"})
+    loc = exc_info.value.errors()[0]["loc"]
+    assert loc[0] == "pet" and loc[-1] == "lives"  # (v1: "Cat", v2: "cat")
+    for pet in [{"kind": "cow"}, {"lives": 1}]:
+        with pytest.raises(ValidationError) as exc_info:
+            Owner(pet=pet)
+        assert exc_info.value.errors()[0]["loc"] == ("pet",)
+
+    assert Owner.model_fields["pet"].discriminator == "kind"
+    # not the raw "kind" string, in the property, on pydantic 1.8
+    pet_schema = Owner.model_json_schema()["properties"]["pet"]
+    assert not isinstance(pet_schema.get("discriminator"), str)
+
+    with pytest.raises(TypeError):
+
+        class Pets(BaseModel):
+            pets: List[int] = Field(..., discriminator="kind")
+
+
+@pytest.mark.skipif(
+    pydantic.VERSION.startswith("1.8"), reason="nested unions need pydantic 1.9+"
+)
+def test_field_discriminator_nested() -> None:
+    # left to pydantic where it supports discriminated unions
+    class BlackCat(BaseModel):
+        pet_type: Literal["cat"]
+        color: Literal["black"]
+
+    class WhiteCat(BaseModel):
+        pet_type: Literal["cat"]
+        color: Literal["white"]
+
+    class Dog(BaseModel):
+        pet_type: Literal["dog"]
+
+    Cat = Annotated[Union[BlackCat, WhiteCat], Field(discriminator="color")]
+
+    class Owner(BaseModel):
+        pet: Union[Cat, Dog] = Field(..., discriminator="pet_type")
+
+    owner = Owner(pet={"pet_type": "cat", "color": "white"})
+    assert isinstance(owner.pet, WhiteCat)
+    assert isinstance(Owner(pet={"pet_type": "dog"}).pet, Dog)
+    with pytest.raises(ValidationError):
+        Owner(pet={"pet_type": "cat", "color": "red"})
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pydantic_compat
+
+# pydantic itself is imported first, so this lists only what pydantic_compat
+# adds on top of it (its own modules, plus anything it imports eagerly).
+# The import time is in test_bench.py.
+IMPORT_SCRIPT = """
+import sys
+import pydantic
+import pydantic_compat
+print(sorted(m for m in sys.modules if m.startswith("pydantic_compat")))
+print("__version__" in vars(pydantic_compat))
+"""
+
+
+def _run_import() -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_lazy_import() -> None:
+    result = _run_import()
+    modules, version_loaded = result.stdout.splitlines()
+    assert modules == (
+        "['pydantic_compat', 'pydantic_compat._profiling', 'pydantic_compat._shared']"
+    )
+    assert version_loaded == "False"
+
+
+def test_lazy_attributes() -> None:
+    assert isinstance(pydantic_compat.__version__, str)
+    assert pydantic_compat.BaseModel is pydantic_compat.BaseModel
+    assert issubclass(pydantic_compat.BaseModel, pydantic_compat.PydanticCompatMixin)
+    for name in pydantic_compat.__all__:
+        assert getattr(pydantic_compat, name) is not None
+    assert set(pydantic_compat.__all__) <= set(dir(pydantic_compat))
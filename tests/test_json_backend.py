@@ -0,0 +1,104 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import ClassVar, Dict, List
+
+import pydantic
+import pytest
+
+from pydantic_compat import PYDANTIC2, PydanticCompatMixin, set_json_backend
+
+
+class Sub(PydanticCompatMixin, pydantic.BaseModel):
+    when: datetime = datetime(2020, 1, 2, 3, 4, 5)
+
+
+class Model(PydanticCompatMixin, pydantic.BaseModel):
+    x: int = 1
+    items: List[float] = [1.5]
+    mapping: Dict[int, str] = {1: "a"}
+    sub: Sub = Sub()
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec", "auto"])
+def backend(request: pytest.FixtureRequest) -> str:
+    if request.param in ("orjson", "msgspec"):
+        pytest.importorskip(request.param)
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend("json")
+
+
+def test_global_backend(backend: str) -> None:
+    m = Model(x=2)
+    data = m.model_dump_json()
+    assert json.loads(data) == json.loads(m.model_dump_json(by_alias=True))
+    assert json.loads(data)["sub"]["when"] == "2020-01-02T03:04:05"
+    assert Model.model_validate_json(data) == m
+    assert Model.model_validate_json(data.encode()) == m
+    if not PYDANTIC2:  # pydantic-core only accepts str, bytes and bytearray
+        assert Model.model_validate_json(memoryview(data.encode())) == m
+    assert json.loads(m.model_dump_json(exclude={"sub"})) == {
+        "x": 2,
+        "items": [1.5],
+        "mapping": {"1": "a"},
+    }
+    with pytest.raises(pydantic.ValidationError):
+        Model.model_validate_json(b'{"x": ')
+    with pytest.raises(pydantic.ValidationError):
+        Model.model_validate_json(b'{"x": "nope"}')
+
+
+def test_model_backend() -> None:
+    class Model2(PydanticCompatMixin, pydantic.BaseModel):
+        x: int = 1
+        model_config = {"json_backend": "auto"}
+
+    assert Model2.model_validate_json(b'{"x": 2}') == Model2(x=2)
+    assert json.loads(Model2(x=2).model_dump_json()) == {"x": 2}
+
+
+def test_invalid_backend() -> None:
+    with pytest.raises(ValueError, match="must be one of"):
+        set_json_backend("nope")
+
+
+@pytest.mark.skipif(PYDANTIC2, reason="v1 only")
+def test_big_int_fallback(backend: str) -> None:
+    m = Model(x=2**70 + 1)
+    assert Model.model_validate_json(m.model_dump_json()) == m
+
+
+@pytest.mark.skipif(PYDANTIC2, reason="v1 only")
+def test_json_encoders(backend: str) -> None:
+    class Encoded(PydanticCompatMixin, pydantic.BaseModel):
+        when: datetime = datetime(2020, 1, 2)
+        sub: Sub = Sub()
+
+        class Config:
+            json_encoders: ClassVar[dict] = {datetime: lambda v: v.year}
+
+    data = json.loads(Encoded().model_dump_json())
+    assert data == {"when": 2020, "sub": {"when": 2020}}
+
+
+@pytest.mark.skipif(PYDANTIC2, reason="v1 only")
+@pytest.mark.parametrize("ratio", [0.5, math.nan, math.inf])
+def test_same_output(backend: str, ratio: float) -> None:
+    class Typed(PydanticCompatMixin, pydantic.BaseModel):
+        amount: Decimal = Decimal("1.5")
+        count: Decimal = Decimal("2")
+        delay: timedelta = timedelta(seconds=3)
+        when: datetime = datetime(2020, 1, 2, tzinfo=timezone.utc)
+        data: bytes = b"ab"
+        ratios: List[float] = [ratio]
+
+    m = Typed()
+    set_json_backend("json")
+    expected = m.model_dump_json()
+    set_json_backend(backend)
+    assert json.loads(m.model_dump_json()) == json.loads(expected)
+    if not math.isfinite(ratio):
+        assert m.model_dump_json() == expected
+    assert json.loads(expected)["amount"] == 1.5
@@ -0,0 +1,77 @@
+import json
+from typing import Any, Iterator
+
+import pytest
+
+import pydantic_compat
+from pydantic_compat import (
+    BaseModel,
+    Field,
+    _profiling,
+    field_validator,
+    root_validator,
+    validator,
+)
+
+
+@pytest.fixture
+def profiling() -> Iterator[None]:
+    pydantic_compat.reset_profiling()
+    pydantic_compat.enable_profiling()
+    try:
+        yield
+    finally:
+        pydantic_compat.disable_profiling()
+        pydantic_compat.reset_profiling()
+
+
+def test_profiling(profiling: None) -> None:
+    class Model(BaseModel):
+        x: int = Field(1, description="x")
+        y: str = Field("y", regex="^y$")  # type: ignore
+
+        class Config:
+            allow_population_by_field_name = True
+
+        @root_validator(pre=True)
+        def _check(cls, v: Any) -> Any:
+            return v
+
+        # one of them is adapted to the other version, on each version
+        @validator("x")
+        def _check_x(cls, v: Any) -> Any:
+            return v
+
+        @field_validator("y")
+        def _check_y(cls, v: Any) -> Any:
+            return v
+
+    owner = f"{__name__}.test_profiling.<locals>.Model"
+    data = json.loads(pydantic_compat.profiling_report("json"))
+    rows = {(d["owner"], d["phase"]): d for d in data}
+    assert rows[(owner, "Field")]["calls"] == 2
+    assert rows[(owner, "validator")]["calls"] == 2
+    assert rows[(owner, "class")]["calls"] == 1
+    if not pydantic_compat.PYDANTIC2:
+        assert (owner, "config") not in rows  # nothing to convert on v1
+    else:
+        assert rows[(owner, "config")]["calls"] == 1
+    assert all(d["seconds"] >= 0 for d in data)
+    assert [d["seconds"] for d in data] == sorted(
+        (d["seconds"] for d in data), reverse=True
+    )
+
+    report = pydantic_compat.profiling_report()
+    assert report.splitlines()[0].split() == ["owner", "phase", "calls", "ms", "blocks"]
+    assert owner in report
+    with pytest.raises(ValueError, match="fmt must be"):
+        pydantic_compat.profiling_report("csv")
+
+
+def test_profiling_disabled() -> None:
+    assert not _profiling.ENABLED
+
+    class Model(BaseModel):
+        x: int = Field(1)
+
+    assert pydantic_compat.profiling_report("json") == "[]"
@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pydantic
+import pytest
+
+import pydantic_compat
+from pydantic_compat import BaseModel, Field, PydanticCompatMixin, _schema_cache
+
+
+class Sub(BaseModel):
+    z: int = 1
+
+
+class Model(BaseModel):
+    """A model."""
+
+    x: int = Field(1, description="the x")
+    subs: List[Sub] = Field([])
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Iterator[Path]:
+    pydantic_compat.enable_schema_cache(tmp_path)
+    try:
+        yield tmp_path
+    finally:
+        pydantic_compat.disable_schema_cache()
+        for cls in (Model, Sub):
+            _schema_cache.clear_memory_cache(cls)
+
+
+def _no_generate(*args: Any, **kwargs: Any) -> Any:
+    raise AssertionError("schema should have been cached")
+
+
+def test_schema_cache(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    native = "model_json_schema" if pydantic_compat.PYDANTIC2 else "schema"
+    expected = getattr(pydantic.BaseModel, native).__func__(Model)
+
+    schema = Model.model_json_schema()
+    assert schema == expected
+    files = os.listdir(cache_dir)
+    assert len(files) == 1 and files[0].endswith(".json")
+
+    # returned schemas are copies: mutating one doesn't affect the cache
+    schema["title"] = "changed"
+    assert Model.model_json_schema() == Model.schema() == expected
+
+    # in a new process, the schema comes from disk
+    _schema_cache.clear_memory_cache(Model)
+    monkeypatch.setattr(pydantic.BaseModel, native, classmethod(_no_generate))
+    assert Model.model_json_schema() == expected
+    # ...unless the arguments differ
+    with pytest.raises(AssertionError, match="should have been cached"):
+        Model.model_json_schema(by_alias=False)
+
+
+def test_schema_cache_invalidation(cache_dir: Path) -> None:
+    def make(description: str) -> Any:
+        class Model(PydanticCompatMixin, pydantic.BaseModel):
+            x: int = Field(1, description=description)
+
+        return Model
+
+    a, b = make("a"), make("b")
+    assert _schema_cache.fingerprint(a) != _schema_cache.fingerprint(b)
+    assert _schema_cache.fingerprint(a) == _schema_cache.fingerprint(make("a"))
+    assert a.model_json_schema()["properties"]["x"]["description"] == "a"
+    assert b.model_json_schema()["properties"]["x"]["description"] == "b"
+
+    # nested models are part of the fingerprint
+    before = _schema_cache.fingerprint(Model)
+    Sub.__doc__ = "changed"
+    try:
+        assert _schema_cache.fingerprint(Model) != before
+    finally:
+        Sub.__doc__ = None
+
+
+def test_schema_cache_corrupt_file(cache_dir: Path) -> None:
+    schema = Model.model_json_schema()
+    (path,) = cache_dir.iterdir()
+    path.write_text("{not json")
+    _schema_cache.clear_memory_cache(Model)
+    assert Model.model_json_schema() == schema
+    assert path.read_text().startswith("{")
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_schema_cache_disabled(tmp_path: Path) -> None:
+    assert _schema_cache._cache_dir is None
+    Model.model_json_schema()
+    assert _schema_cache.SCHEMA_CACHE_ATTR not in Model.__dict__
+
+
+def test_schema_cache_plain_nested_model(cache_dir: Path) -> None:
+    class Plain(pydantic.BaseModel):
+        y: int = 1
+
+    class Outer(PydanticCompatMixin, pydantic.BaseModel):
+        plain: Plain = Plain()
+
+    schema = Outer.model_json_schema()
+    assert "Plain" in str(schema)
+    assert _schema_cache.fingerprint(Outer) == _schema_cache.fingerprint(Outer)
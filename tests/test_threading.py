@@ -0,0 +1,146 @@
+"""Creating (and building) compat models in many threads at once."""
+
+import sys
+import threading
+import types
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+import pytest
+
+import pydantic_compat
+from pydantic_compat import (
+    PYDANTIC2,
+    BaseModel,
+    Field,
+    field_validator,
+    model_validator,
+    root_validator,
+    validator,
+)
+
+THREADS = 8
+MODELS_PER_THREAD = 250
+
+
+def _run_in_threads(func: Callable[[int], Any]) -> List[Any]:
+    # all the threads start together, to make races likely
+    barrier = threading.Barrier(THREADS)
+
+    def run(i: int) -> Any:
+        barrier.wait()
+        return func(i)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return list(pool.map(run, range(THREADS)))
+
+
+def _make_model(i: int) -> Any:
+    class Sub(BaseModel):
+        z: int = i
+
+    class Model(BaseModel):
+        x: int = Field(0, ge=0)
+        name: str = "n"
+        sub: Optional[Sub] = None
+
+        class Config:
+            allow_population_by_field_name = True
+
+        @validator("x", allow_reuse=True)
+        def _x(cls, v: int) -> int:
+            return v + 1
+
+        @root_validator(pre=True, allow_reuse=True)
+        def _root(cls, values: Any) -> Any:
+            return values
+
+        @field_validator("name")
+        def _name(cls, v: str) -> str:
+            return v.upper()
+
+        @model_validator(mode="before")
+        def _before(cls, values: Any) -> Any:
+            return values
+
+    return Model
+
+
+def test_create_models_in_threads() -> None:
+    filters = list(warnings.filters)
+
+    def create(t: int) -> List[Any]:
+        models = []
+        for i in range(MODELS_PER_THREAD):
+            model = _make_model(i)
+            assert model(x=i, name="a", sub={}).model_dump() == {
+                "x": i + 1,
+                "name": "A",
+                "sub": {"z": i},
+            }
+            models.append(model)
+        return models
+
+    results = _run_in_threads(create)
+    assert sum(len(models) for models in results) == THREADS * MODELS_PER_THREAD
+    # the validator adaptors don't touch the (global) warning filters
+    assert warnings.filters == filters
+
+
+@pytest.fixture
+def defer_build() -> Any:
+    pydantic_compat.set_defer_build(True)
+    try:
+        yield
+    finally:
+        pydantic_compat.set_defer_build(False)
+
+
+DEFERRED = """
+from typing import List
+from pydantic_compat import BaseModel, field_validator
+
+class Node(BaseModel):
+    name: str = "n"
+    children: List["Node"] = []
+
+    @field_validator("name")
+    def _upper(cls, v: str) -> str:
+        return v.upper()
+"""
+
+
+def _make_node(node_cls: Any, i: int) -> Any:
+    return node_cls(name=str(i), children=[{}])
+
+
+def test_build_deferred_in_threads(defer_build: None) -> None:
+    for attempt in range(20):
+        # a model defined at the top level of a module, to be deferred
+        module = types.ModuleType(f"threaded_deferred_{attempt}")
+        sys.modules[module.__name__] = module
+        exec(DEFERRED, module.__dict__)
+        node_cls = module.Node
+        if not PYDANTIC2:
+            from pydantic_compat._v1.mixin import DEFERRED_ATTR
+
+            assert DEFERRED_ATTR in node_cls.__dict__
+        # the first use builds the model: the other threads must wait for it
+        nodes = _run_in_threads(partial(_make_node, node_cls))
+        assert [n.name for n in nodes] == [str(i) for i in range(THREADS)]
+        assert all(type(n.children[0]) is node_cls for n in nodes)
+
+
+def test_lazy_base_model_in_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the first lookups create a single class (see pydantic_compat.__getattr__)
+    monkeypatch.delitem(vars(pydantic_compat), "BaseModel")
+    # switch threads often: the class is created in well under the default 5 ms
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        classes = _run_in_threads(lambda i: pydantic_compat.BaseModel)
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(cls is classes[0] for cls in classes)
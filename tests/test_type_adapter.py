@@ -0,0 +1,66 @@
+import json
+from typing import Dict, List, Union
+
+import pydantic
+import pytest
+
+from pydantic_compat import PYDANTIC2, PydanticCompatMixin, TypeAdapter
+
+
+class Model(PydanticCompatMixin, pydantic.BaseModel):
+    x: int = 1
+
+
+def test_validate() -> None:
+    ta = TypeAdapter(List[int])
+    assert ta.validate_python(["1", 2]) == [1, 2]
+    assert ta.validate_json("[1, 2]") == [1, 2]
+    assert ta.validate_json(b"[1, 2]") == [1, 2]
+    with pytest.raises(pydantic.ValidationError):
+        ta.validate_python(["a"])
+    with pytest.raises(pydantic.ValidationError):
+        ta.validate_json("[1, ")
+
+    assert TypeAdapter(Union[int, str]).validate_python("a") == "a"
+    models = TypeAdapter(Dict[str, Model]).validate_python({"a": {"x": 2}})
+    assert models == {"a": Model(x=2)}
+
+
+def test_dump() -> None:
+    ta = TypeAdapter(Dict[str, Model])
+    value = {"a": Model(x=2)}
+    assert ta.dump_python(value) == {"a": {"x": 2}}
+    assert ta.dump_python(value, mode="json") == {"a": {"x": 2}}
+    assert json.loads(ta.dump_json(value)) == {"a": {"x": 2}}
+
+
+def test_json_schema() -> None:
+    assert TypeAdapter(List[int]).json_schema() == {
+        "type": "array",
+        "items": {"type": "integer"},
+    }
+
+
+def test_cached() -> None:
+    if PYDANTIC2:
+        assert isinstance(TypeAdapter(List[int]), pydantic.TypeAdapter)
+        assert TypeAdapter(List[int]) is TypeAdapter(List[int])
+    else:
+        ta = TypeAdapter(List[int])
+        assert ta._model is TypeAdapter(List[int])._model
+    assert repr(TypeAdapter(List[int])).startswith("TypeAdapter(")
+
+
+def test_cached_union_order() -> None:
+    # equal types, but the members are tried in order
+    assert Union[int, bool] == Union[bool, int]
+    assert type(TypeAdapter(Union[int, bool]).validate_python("1")) is int
+    assert TypeAdapter(Union[bool, int]).validate_python("1") is True
+
+
+@pytest.mark.skipif(not PYDANTIC2, reason="v2 only")
+def test_config() -> None:
+    strict = TypeAdapter(List[int], config=pydantic.ConfigDict(strict=True))
+    with pytest.raises(pydantic.ValidationError):
+        strict.validate_python(["1"])
+    assert TypeAdapter(List[int]).validate_python(["1"]) == [1]